@@ -1,15 +1,28 @@
 """
 Middleware para redirecionar rotas sensíveis para HTTPS.
 """
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from django.http import HttpResponsePermanentRedirect
+from django.utils.cache import patch_cache_control
+
+from core.rotas import origem_https
 
 
 class ForceHTTPSSelective:
     """
-    Middleware que redireciona apenas rotas sensíveis para HTTPS:8443
-    se forem acessadas via HTTP.
+    Middleware que redireciona apenas rotas sensíveis para HTTPS
+    (HOST_SEGURO:HTTPS_PORTA) se forem acessadas via HTTP.
+
+    Funciona em modo síncrono e assíncrono, então sob ASGI a cadeia de
+    middlewares não precisa ser adaptada a cada requisição.
     """
-    
+
+    sync_capable = True
+    async_capable = True
+
     # Rotas sensíveis que devem ser acessadas apenas via HTTPS
     SENSITIVE_PATHS = [
         '/login',
@@ -17,20 +30,31 @@ class ForceHTTPSSelective:
         '/cadastroImovel',
         '/admin',
     ]
-    
+
     def __init__(self, get_response):
         self.get_response = get_response
-    
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Um único padrão com todos os prefixos, compilado uma vez
+        self.sensiveis = re.compile(
+            '|'.join(re.escape(caminho) for caminho in self.SENSITIVE_PATHS)
+        )
+        self.cache_redirect = getattr(settings, 'REDIRECT_HTTPS_CACHE', 86400)
+
     def __call__(self, request):
-        # Verifica se a rota é sensível e se não está usando HTTPS
-        if not request.is_secure():
-            for sensitive_path in self.SENSITIVE_PATHS:
-                if request.path.startswith(sensitive_path):
-                    # Redireciona para HTTPS na porta 8443
-                    host = request.get_host().split(':')[0]  # Remove porta atual
-                    redirect_url = f"https://{host}:8443{request.get_full_path()}"
-                    return HttpResponsePermanentRedirect(redirect_url)
-        
-        response = self.get_response(request)
-        return response
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._redirecionamento(request) or self.get_response(request)
 
+    async def __acall__(self, request):
+        return self._redirecionamento(request) or await self.get_response(request)
+
+    def _redirecionamento(self, request):
+        """Redirect para HTTPS se a rota for sensível e a conexão não for segura."""
+        if request.is_secure() or not self.sensiveis.match(request.path):
+            return None
+        response = HttpResponsePermanentRedirect(origem_https(request) + request.get_full_path())
+        # Cacheável: o navegador repete o redirect sem voltar ao servidor HTTP
+        patch_cache_control(response, public=True, max_age=self.cache_redirect)
+        return response
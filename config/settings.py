@@ -2,6 +2,7 @@
 Django settings for config project.
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -62,10 +63,68 @@ ASGI_APPLICATION = 'config.asgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # BANCO_ARQUIVO: outro arquivo (relativo a BASE_DIR), ex.: para testes de carga
+        'NAME': BASE_DIR / os.environ.get('BANCO_ARQUIVO', 'db.sqlite3'),
     }
 }
 
+# Perfil de produção do SQLite (SQLITE_PRODUCAO=0 volta ao padrão).
+# WAL deixa leitores e o escritor trabalharem ao mesmo tempo; com WAL,
+# synchronous=NORMAL só perde as últimas transações numa queda de energia,
+# sem corromper o arquivo. As transações começam com BEGIN IMMEDIATE: o
+# escritor espera o lock (busy_timeout) em vez de falhar com "database is
+# locked" ao tentar promover uma leitura a escrita.
+SQLITE_PRODUCAO = os.environ.get('SQLITE_PRODUCAO', '1') != '0'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,          # ms
+    'cache_size': -64000,          # KiB (64 MB por conexão)
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+if SQLITE_PRODUCAO:
+    DATABASES['default']['OPTIONS'] = {
+        'init_command': ''.join(f'PRAGMA {nome}={valor};' for nome, valor in SQLITE_PRAGMAS.items()),
+        'transaction_mode': 'IMMEDIATE',
+    }
+    # Conexões reaproveitadas entre requisições só num servidor WSGI de
+    # produção (gunicorn, waitress etc.). Nesta instalação nenhum servidor
+    # reaproveita: o runserver (HTTP) fecha as conexões ao fim de cada
+    # requisição, seja qual for CONN_MAX_AGE, e sob ASGI (uvicorn, HTTPS)
+    # cada requisição roda o ORM numa thread nova, e o Django recomenda
+    # desligar as conexões persistentes (config/asgi.py define SERVIDOR_ASGI).
+    # Os 600 s valem para o WSGI de produção e para comandos de gestão.
+    DATABASES['default']['CONN_MAX_AGE'] = 0 if os.environ.get('SERVIDOR_ASGI') else 600
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Réplica somente leitura para as páginas públicas (core/replica.py). Ligada
+# com BANCO_REPLICA=1; `manage.py atualizar_replica` precisa rodar ao lado
+# dos servidores para copiar o banco a cada REPLICA_INTERVALO segundos. Até
+# a primeira cópia, as leituras públicas vão ao banco principal.
+# Custo: cada intervalo com escritas no principal copia o arquivo inteiro
+# (centenas de MB com 1M de imóveis), em passos de REPLICA_PAGINAS_POR_PASSO
+# páginas com REPLICA_PAUSA_MS entre eles. Intervalos curtos deixam as
+# páginas públicas mais atuais à custa de I/O contínuo.
+BANCO_REPLICA = os.environ.get('BANCO_REPLICA', '0') == '1'
+REPLICA_INTERVALO = float(os.environ.get('REPLICA_INTERVALO', 30))
+REPLICA_PAGINAS_POR_PASSO = 4096
+REPLICA_PAUSA_MS = 10
+
+if BANCO_REPLICA:
+    opcoes_replica = dict(DATABASES['default'].get('OPTIONS', {}))
+    opcoes_replica.pop('transaction_mode', None)
+    opcoes_replica['init_command'] = opcoes_replica.get('init_command', '') + 'PRAGMA query_only=ON;'
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'OPTIONS': opcoes_replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.replica.RoteadorReplica']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -96,14 +155,115 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Security settings for HTTPS routes
+# Servidores HTTP (público) e HTTPS (rotas sensíveis). Os hosts vazios usam o
+# host da requisição; os links absolutos e os redirects são montados a partir
+# daqui (ver core/rotas.py e ForceHTTPSSelective).
+HTTP_PORTA = int(os.environ.get('HTTP_PORTA', 8080))
+HTTPS_PORTA = int(os.environ.get('HTTPS_PORTA', 8443))
+HOST_PUBLICO = os.environ.get('HOST_PUBLICO', '')
+HOST_SEGURO = os.environ.get('HOST_SEGURO', '')
+
+if HOST_PUBLICO:
+    ALLOWED_HOSTS.append(HOST_PUBLICO)
+if HOST_SEGURO:
+    ALLOWED_HOSTS.append(HOST_SEGURO)
+
+# HSTS, enviado pelo SecurityMiddleware apenas nas respostas HTTPS. O HSTS
+# vale para o host inteiro, em qualquer porta: com os dois servidores no
+# mesmo host (localhost) ele quebraria o HTTP público, então só fica ligado
+# por padrão quando HOST_SEGURO é um host separado.
+SECURE_HSTS_SECONDS = int(os.environ.get('HSTS_SEGUNDOS', 31536000 if HOST_SEGURO else 0))
+SECURE_HSTS_INCLUDE_SUBDOMAINS = os.environ.get('HSTS_SUBDOMINIOS', '0') == '1'
+SECURE_HSTS_PRELOAD = os.environ.get('HSTS_PRELOAD', '0') == '1'
+
+# Tempo (s) que o navegador pode guardar o redirect HTTP -> HTTPS
+REDIRECT_HTTPS_CACHE = int(os.environ.get('REDIRECT_HTTPS_CACHE', 86400))
+
 SESSION_COOKIE_SECURE = True  # Cookies only sent over HTTPS
 CSRF_COOKIE_SECURE = True     # CSRF cookies only sent over HTTPS
-CSRF_TRUSTED_ORIGINS = ["https://localhost:8443"]
+CSRF_TRUSTED_ORIGINS = [f"https://localhost:{HTTPS_PORTA}"]
+if HOST_SEGURO:
+    CSRF_TRUSTED_ORIGINS.append(f"https://{HOST_SEGURO}:{HTTPS_PORTA}")
 
 # Session configuration
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
 
+# Sessões lidas do cache (core.sessoes): LRU no processo e o cache
+# 'sessoes', compartilhado entre os workers; o banco só é lido na falta e
+# só é gravado quando os dados mudam.
+SESSION_ENGINE = 'core.sessoes'
+SESSION_CACHE_ALIAS = 'sessoes'
+SESSOES_LRU_TAMANHO = 4096
+SESSOES_LRU_TTL = 5
+
+# Cache
+# CACHE_PAGINAS escolhe o backend do cache de páginas públicas:
+# 'arquivo' (compartilhado entre os servidores HTTP e HTTPS) ou 'locmem'
+# (por processo; invalidações feitas pelo HTTPS só chegam ao HTTP pelo TTL).
+# As versões das facetas e das estatísticas também ficam neste cache.
+CACHE_PAGINAS = 'arquivo'
+CACHE_PAGINAS_TTL = 600
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'sessoes': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'sessoes',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+if CACHE_PAGINAS == 'arquivo':
+    CACHES['paginas'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'paginas',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+else:
+    CACHES['paginas'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'paginas',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+
+# Tempo (s) que os fragmentos renderizados de cada imóvel ficam em cache
+FRAGMENTOS_CACHE_TTL = 3600
+
+# Cache de clientes por id (core.identidade): entradas e validade (s). As
+# alterações de um cliente valem em todos os processos pela versão guardada
+# no cache de páginas; o TTL só limita quanto tempo uma entrada fica na memória.
+IDENTIDADE_CACHE_TAMANHO = 1024
+IDENTIDADE_CACHE_TTL = 300
+
+# Paginação da listagem pública de imóveis
+IMOVEIS_POR_PAGINA = 20
+IMOVEIS_POR_PAGINA_MAX = 100
+
+# Tempo (s) que as estatísticas do dashboard ficam em cache
+ESTATISTICAS_CACHE_TTL = 60
+
+# Tempo (s) que as contagens de facetas da listagem ficam em cache
+FACETAS_CACHE_TTL = 300
+
+# Verificação de senhas no login assíncrono (core.senhas): threads no pool
+# e verificações aguardando antes de recusar novas tentativas (HTTP 503)
+SENHAS_MAX_CONCORRENCIA = 4
+SENHAS_FILA_MAXIMA = 64
+
+# Cadastros de imóvel e cliente gravados em grupo (core.gravacao): as
+# gravações que chegam dentro da janela vão para a mesma transação
+GRAVACAO_EM_GRUPO = os.environ.get('GRAVACAO_EM_GRUPO', '1') != '0'
+GRAVACAO_JANELA_MS = 2
+GRAVACAO_LOTE_MAXIMO = 64
+# Espera máxima (s) de uma requisição pelo seu lote antes de responder 503
+GRAVACAO_PRAZO = 10
+
+# Views assíncronas (home, listagem e dashboard); 0 volta às versões síncronas
+VIEWS_ASSINCRONAS = os.environ.get('VIEWS_ASSINCRONAS', '1') != '0'
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'core.backends.ClienteBackend',
@@ -2,17 +2,90 @@
 Admin configuration for core app.
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from django.utils.text import slugify
+from . import busca, contadores, exportacao
 from .models import Cliente, Imovel
 
 
+class PaginadorContador(Paginator):
+    """
+    Paginator que lê o total da tabela de contadores quando a listagem não
+    tem filtro nem busca, evitando o COUNT(*) na tabela inteira.
+    """
+    chave_contador = None
+    
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if self.chave_contador and query is not None and not query.where:
+            return contadores.ler(self.chave_contador)
+        return super().count
+
+
+class ChangeListContador(ChangeList):
+    """ChangeList que mostra o total sem filtros a partir do contador."""
+    
+    def get_results(self, request):
+        super().get_results(request)
+        self.full_result_count = contadores.ler(self.model_admin.chave_contador)
+        self.show_full_result_count = True
+
+
+class ContagemPorContadorMixin:
+    """
+    Usa core.contadores para os totais do changelist. O COUNT(*) do total
+    sem filtros é desligado (show_full_result_count) e substituído pela
+    leitura do contador em ChangeListContador.
+    """
+    chave_contador = None
+    show_full_result_count = False
+    
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginador = PaginadorContador(queryset, per_page, orphans, allow_empty_first_page)
+        paginador.chave_contador = self.chave_contador
+        return paginador
+    
+    def get_changelist(self, request, **kwargs):
+        return ChangeListContador
+
+
+class ExportacaoMixin:
+    """
+    Ações que exportam os itens selecionados (ou todos os filtrados, com
+    "selecionar todos") em CSV ou JSONL, em streaming.
+    """
+    actions = ['exportar_csv', 'exportar_jsonl']
+    
+    def _exportar(self, request, queryset, formato):
+        nome = f'{slugify(self.model._meta.verbose_name_plural)}.{formato}'
+        return exportacao.resposta_streaming(
+            request,
+            exportacao.gerar(queryset.order_by('pk'), formato),
+            exportacao.FORMATOS[formato],
+            nome_arquivo=nome,
+        )
+    
+    @admin.action(description='Exportar selecionados (CSV)')
+    def exportar_csv(self, request, queryset):
+        return self._exportar(request, queryset, 'csv')
+    
+    @admin.action(description='Exportar selecionados (JSONL)')
+    def exportar_jsonl(self, request, queryset):
+        return self._exportar(request, queryset, 'jsonl')
+
+
 @admin.register(Cliente)
-class ClienteAdmin(admin.ModelAdmin):
+class ClienteAdmin(ContagemPorContadorMixin, ExportacaoMixin, admin.ModelAdmin):
     list_display = ['nome', 'email', 'cpf_formatado', 'telefone', 'data_cadastro_formatada', 'acoes']
     search_fields = ['nome', 'email', 'cpf', 'telefone']
     list_filter = ['data_cadastro']
+    chave_contador = contadores.CLIENTES_TOTAL
     readonly_fields = ['data_cadastro', 'cpf_formatado_display']
     fieldsets = (
         ('Informações Pessoais', {
@@ -53,11 +126,11 @@ class ClienteAdmin(admin.ModelAdmin):
 
 
 @admin.register(Imovel)
-class ImovelAdmin(admin.ModelAdmin):
+class ImovelAdmin(ContagemPorContadorMixin, ExportacaoMixin, admin.ModelAdmin):
     list_display = ['titulo', 'tipo_badge', 'preco_formatado', 'endereco', 'status_badge', 'data_cadastro_formatada', 'acoes']
     search_fields = ['titulo', 'endereco', 'descricao']
     list_filter = ['tipo', 'ativo', 'data_cadastro']
-    readonly_fields = ['data_cadastro', 'preco_formatado_display']
+    readonly_fields = ['data_cadastro', 'data_atualizacao', 'preco_formatado_display']
     fieldsets = (
         ('Informações Básicas', {
             'fields': ('titulo', 'tipo', 'preco')
@@ -69,11 +142,18 @@ class ImovelAdmin(admin.ModelAdmin):
             'fields': ('descricao',)
         }),
         ('Status', {
-            'fields': ('ativo', 'data_cadastro')
+            'fields': ('ativo', 'data_cadastro', 'data_atualizacao')
         }),
     )
     list_per_page = 25
     ordering = ['-data_cadastro']
+    chave_contador = contadores.IMOVEIS_TOTAL
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Usa o índice FTS5 em vez de LIKE '%termo%' nos campos de texto."""
+        if not search_term.strip():
+            return queryset, False
+        return busca.filtrar(queryset, search_term), False
     
     def tipo_badge(self, obj):
         """Retorna tipo com badge colorido."""
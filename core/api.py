@@ -0,0 +1,63 @@
+"""
+API JSON somente leitura do catálogo de imóveis.
+
+As linhas saem de um cursor `.values_list().iterator()` direto para a
+resposta em streaming, em blocos de tamanho limitado, então o uso de
+memória não depende do tamanho do catálogo. O ETag/Last-Modified vem da
+versão do catálogo (core.catalogo), lida antes de qualquer serialização,
+e pedidos sem alteração recebem 304.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from . import catalogo, exportacao
+
+# Campos expostos, na ordem padrão da resposta
+CAMPOS = ('id', 'titulo', 'descricao', 'tipo', 'preco', 'endereco', 'data_cadastro', 'data_atualizacao')
+
+
+class CamposInvalidos(ValueError):
+    """Parâmetro `campos` com nomes fora de CAMPOS."""
+
+
+def campos_pedidos(valor):
+    """Lista de campos a partir do parâmetro `campos` (vazio = todos)."""
+    if not valor:
+        return list(CAMPOS)
+    campos = list(dict.fromkeys(nome.strip() for nome in valor.split(',') if nome.strip()))
+    invalidos = [nome for nome in campos if nome not in CAMPOS]
+    if invalidos or not campos:
+        raise CamposInvalidos(
+            f'Campos inválidos: {", ".join(invalidos)}. Disponíveis: {", ".join(CAMPOS)}.'
+        )
+    return campos
+
+
+def estado(*partes):
+    """
+    (etag, ultima_modificacao) a partir da versão do catálogo, sem consultar
+    a tabela de imóveis. `partes` (campos, filtros) entram no ETag porque
+    mudam a representação.
+    """
+    versao, alterado_em = catalogo.estado()
+    return catalogo.etag(versao, *partes), alterado_em or None
+
+
+def linhas_json(queryset, campos):
+    """Gera o array JSON em blocos, lendo o cursor em lotes."""
+    codificador = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def textos():
+        yield '['
+        separador = '\n'
+        for linha in exportacao.linhas(queryset, campos):
+            yield separador + codificador.encode(dict(zip(campos, linha)))
+            separador = ',\n'
+        yield '\n]\n'
+
+    return exportacao.em_blocos(textos())
+
+
+def erro_json(mensagem):
+    return json.dumps({'erro': mensagem}, ensure_ascii=False)
@@ -0,0 +1,12 @@
+"""
+Configuração do app core.
+"""
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        # Registra os receivers de sinais (invalidação de caches etc.)
+        from . import signals  # noqa: F401
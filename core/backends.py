@@ -2,6 +2,8 @@
 Backend de autenticação customizado para Cliente usando CPF.
 """
 from django.contrib.auth.backends import BaseBackend
+from . import senhas
+from .identidade import obter_cliente
 from .models import Cliente
 
 
@@ -17,6 +19,8 @@ class ClienteBackend(BaseBackend):
             # CPF já deve estar limpo quando chega aqui
             cliente = Cliente.objects.get(cpf=cpf)
         except Cliente.DoesNotExist:
+            # Mesmo custo de uma senha errada (não revela se o CPF existe)
+            senhas.verificar_ficticia(password)
             return None
         
         # Verifica a senha
@@ -24,10 +28,25 @@ class ClienteBackend(BaseBackend):
             return cliente
         return None
     
+    async def aauthenticate(self, request, cpf=None, password=None, **kwargs):
+        """Versão assíncrona: o hash da senha roda no pool de core.senhas."""
+        if cpf is None or password is None:
+            return None
+        
+        try:
+            cliente = await Cliente.objects.aget(cpf=cpf)
+        except Cliente.DoesNotExist:
+            await senhas.averificar_ficticia(password)
+            return None
+        
+        if await senhas.averificar(password, cliente.senha):
+            return cliente
+        return None
+    
     def get_user(self, user_id):
-        """Retorna o cliente pelo ID."""
+        """Retorna o cliente pelo ID (com cache, ver core.identidade)."""
         try:
-            return Cliente.objects.get(pk=user_id)
+            return obter_cliente(user_id)
         except Cliente.DoesNotExist:
             return None
 
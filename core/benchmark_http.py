@@ -0,0 +1,383 @@
+"""
+Gerador de carga HTTP para os benchmarks.
+
+Cliente HTTP/1.1 mínimo sobre asyncio, com conexões keep-alive, um
+navegador simulado (cookies, CSRF, um par de conexões por origem) e
+utilitários que sobem os servidores do projeto (uvicorn e runserver) em
+subprocessos. Sem dependências além da biblioteca padrão.
+"""
+import asyncio
+import os
+import re
+import socket
+import ssl as ssl_lib
+import subprocess
+import sys
+import time
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+
+ERROS_CONEXAO = (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError)
+
+_TOKEN_CSRF = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) de uma lista, por vizinho mais próximo."""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+class Servidor:
+    """
+    Sobe um servidor do projeto em um subprocesso e espera a porta aceitar
+    conexões. Use como context manager.
+    """
+
+    nome = 'servidor'
+    # Descarta também o stderr (log de cada requisição do runserver)
+    silencioso = False
+
+    def __init__(self, porta, ambiente=None, host='127.0.0.1'):
+        self.host = host
+        self.porta = porta
+        self.ambiente = ambiente or {}
+        self._processo = None
+
+    def comando(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        ambiente = {**os.environ, **self.ambiente}
+        self._processo = subprocess.Popen(
+            self.comando(), cwd=settings.BASE_DIR, env=ambiente,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL if self.silencioso else None,
+        )
+        try:
+            self._aguardar_porta()
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self._processo.terminate()
+        try:
+            self._processo.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._processo.kill()
+            self._processo.wait()
+
+    def _aguardar_porta(self, timeout=30):
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            if self._processo.poll() is not None:
+                raise RuntimeError(f'{self.nome} encerrou com código {self._processo.returncode}.')
+            try:
+                with socket.create_connection((self.host, self.porta), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError(f'{self.nome} não respondeu na porta {self.porta}.')
+
+
+class ServidorUvicorn(Servidor):
+    """`uvicorn config.asgi:application`, com TLS se `ssl` (certificados em `certs`)."""
+
+    nome = 'uvicorn'
+
+    def __init__(self, porta, workers=1, ambiente=None, ssl=False, host='127.0.0.1', certs=None):
+        super().__init__(porta, ambiente, host)
+        self.workers = workers
+        self.ssl = ssl
+        self.certs = Path(certs or Path(settings.BASE_DIR) / 'certs')
+
+    def comando(self):
+        comando = [
+            sys.executable, '-m', 'uvicorn', 'config.asgi:application',
+            '--host', self.host, '--port', str(self.porta),
+            '--workers', str(self.workers), '--log-level', 'warning',
+            '--no-access-log',
+        ]
+        if self.ssl:
+            comando += [
+                '--ssl-keyfile', str(self.certs / 'server.key'),
+                '--ssl-certfile', str(self.certs / 'server.crt'),
+            ]
+        return comando
+
+
+class ServidorRunserver(Servidor):
+    """`manage.py runserver` (o servidor HTTP público), sem o autoreload."""
+
+    nome = 'runserver'
+    silencioso = True
+
+    def comando(self):
+        return [
+            sys.executable, 'manage.py', 'runserver', f'{self.host}:{self.porta}',
+            '--noreload', '--skip-checks',
+        ]
+
+
+async def _ler_corpo(reader, cabecalhos):
+    if cabecalhos.get('transfer-encoding', '').lower() == 'chunked':
+        partes = []
+        while True:
+            tamanho = int((await reader.readline()).split(b';')[0], 16)
+            if tamanho == 0:
+                await reader.readline()
+                return b''.join(partes)
+            partes.append(await reader.readexactly(tamanho))
+            await reader.readline()
+    if 'content-length' in cabecalhos:
+        return await reader.readexactly(int(cabecalhos['content-length']))
+    return await reader.read()
+
+
+async def requisitar(reader, writer, host, caminho, cabecalhos=None, metodo='GET', corpo=None):
+    """
+    Envia uma requisição em uma conexão aberta e lê a resposta inteira.
+    Retorna (status, cabeçalhos em minúsculas, corpo); 'set-cookie' vem
+    como lista, pois pode se repetir.
+    """
+    linhas = [f'{metodo} {caminho} HTTP/1.1', f'Host: {host}', 'Connection: keep-alive']
+    linhas += [f'{nome}: {valor}' for nome, valor in (cabecalhos or {}).items()]
+    if corpo is not None:
+        linhas.append(f'Content-Length: {len(corpo)}')
+    writer.write(('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1') + (corpo or b''))
+    await writer.drain()
+
+    status_linha = await reader.readline()
+    if not status_linha:
+        raise ConnectionError('Conexão encerrada pelo servidor.')
+    status = int(status_linha.split()[1])
+    resposta = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b'\r\n', b''):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(':')
+        nome = nome.strip().lower()
+        if nome == 'set-cookie':
+            resposta.setdefault(nome, []).append(valor.strip())
+        else:
+            resposta[nome] = valor.strip()
+    corpo = b'' if metodo == 'HEAD' or status in (204, 304) else await _ler_corpo(reader, resposta)
+    return status, resposta, corpo
+
+
+async def carga(host, porta, caminhos, conexoes=50, duracao=10.0, cabecalhos=None, ssl=False,
+                aquecimento=1.0):
+    """
+    Mantém `conexoes` conexões keep-alive fazendo requisições em sequência,
+    alternando entre os caminhos, por `duracao` segundos.
+
+    Retorna requisições, erros, rps e latências p50/p99 (ms), no total e por
+    caminho. As requisições do aquecimento não entram nas medidas.
+    """
+    contexto_ssl = contexto_ssl_sem_verificacao() if ssl else None
+    cabecalho_host = f'{host}:{porta}'
+    latencias = {caminho: [] for caminho in caminhos}
+    status = {}
+    erros = 0
+    inicio_medicao = time.perf_counter() + aquecimento
+    fim = inicio_medicao + duracao
+
+    async def cliente(indice):
+        nonlocal erros
+        reader = writer = None
+        n = indice
+        while time.perf_counter() < fim:
+            caminho = caminhos[n % len(caminhos)]
+            n += 1
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, porta, ssl=contexto_ssl)
+                t0 = time.perf_counter()
+                codigo, resposta, _ = await requisitar(reader, writer, cabecalho_host, caminho, cabecalhos)
+                t1 = time.perf_counter()
+            except ERROS_CONEXAO:
+                if time.perf_counter() >= inicio_medicao:
+                    erros += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            if t0 >= inicio_medicao:
+                latencias[caminho].append((t1 - t0) * 1000)
+                status[codigo] = status.get(codigo, 0) + 1
+            if resposta.get('connection', '').lower() == 'close':
+                writer.close()
+                reader = writer = None
+        if writer is not None:
+            writer.close()
+
+    await asyncio.gather(*(cliente(i) for i in range(conexoes)))
+
+    todas = [valor for valores in latencias.values() for valor in valores]
+    return {
+        'conexoes': conexoes,
+        'duracao': duracao,
+        'requisicoes': len(todas),
+        'erros': erros,
+        'status': {str(codigo): total for codigo, total in sorted(status.items())},
+        'rps': len(todas) / duracao,
+        'p50_ms': percentil(todas, 50),
+        'p99_ms': percentil(todas, 99),
+        'por_caminho': {
+            caminho: {
+                'requisicoes': len(valores),
+                'p50_ms': percentil(valores, 50),
+                'p99_ms': percentil(valores, 99),
+            }
+            for caminho, valores in latencias.items()
+        },
+    }
+
+
+def contexto_ssl_sem_verificacao():
+    """Aceita o certificado autoassinado de certs/."""
+    contexto = ssl_lib.create_default_context()
+    contexto.check_hostname = False
+    contexto.verify_mode = ssl_lib.CERT_NONE
+    return contexto
+
+
+class Medidas:
+    """Latências e status por rota, contando só depois do aquecimento."""
+
+    def __init__(self, inicio):
+        self.inicio = inicio
+        self.latencias = {}
+        self.status = {}
+        self.erros = {}
+
+    def ativa(self):
+        return time.perf_counter() >= self.inicio
+
+    def registrar(self, rota, status, ms):
+        if self.ativa():
+            self.latencias.setdefault(rota, []).append(ms)
+            contagem = self.status.setdefault(rota, {})
+            contagem[str(status)] = contagem.get(str(status), 0) + 1
+
+    def erro(self, rota):
+        if self.ativa():
+            self.erros[rota] = self.erros.get(rota, 0) + 1
+
+    def resumo(self, duracao):
+        """Totais e, por rota, requisições/s e p50/p95/p99 (ms)."""
+        rotas = sorted(set(self.latencias) | set(self.erros))
+        todas = [valor for valores in self.latencias.values() for valor in valores]
+        return {
+            'requisicoes': len(todas),
+            'erros': sum(self.erros.values()),
+            'rps': len(todas) / duracao,
+            **_percentis(todas),
+            'por_rota': {
+                rota: {
+                    'requisicoes': len(self.latencias.get(rota, [])),
+                    'erros': self.erros.get(rota, 0),
+                    'rps': len(self.latencias.get(rota, [])) / duracao,
+                    **_percentis(self.latencias.get(rota, [])),
+                    'status': self.status.get(rota, {}),
+                }
+                for rota in rotas
+            },
+        }
+
+
+def _percentis(valores):
+    return {f'p{p}_ms': percentil(valores, p) for p in (50, 95, 99)}
+
+
+class Navegador:
+    """
+    Usuário virtual: uma conexão keep-alive por origem ('http'/'https'),
+    cookies (os Secure só vão para o HTTPS) e o token CSRF dos formulários.
+    `origens` mapeia o nome da origem para (host, porta, contexto_ssl).
+    """
+
+    def __init__(self, origens, medidas):
+        self.origens = origens
+        self.medidas = medidas
+        self.cookies = {}
+        self._conexoes = {}
+
+    def _cabecalho_cookies(self, origem):
+        seguro = self.origens[origem][2] is not None
+        pares = [f'{nome}={valor}' for nome, (valor, so_https) in self.cookies.items()
+                 if seguro or not so_https]
+        return '; '.join(pares)
+
+    def _guardar_cookies(self, linhas):
+        for linha in linhas:
+            cookie = SimpleCookie()
+            cookie.load(linha)
+            for nome, morsel in cookie.items():
+                if morsel.value == '' or morsel['max-age'] == '0':
+                    self.cookies.pop(nome, None)
+                else:
+                    self.cookies[nome] = (morsel.value, bool(morsel['secure']))
+
+    async def pedir(self, origem, metodo, caminho, dados=None, rota=None):
+        """
+        Faz a requisição e registra a latência em `rota` (padrão:
+        'MÉTODO origem caminho'). Retorna (status, cabeçalhos, corpo), ou
+        None se a conexão falhou.
+        """
+        host, porta, contexto = self.origens[origem]
+        rota = rota or f'{metodo} {origem} {caminho.split("?")[0]}'
+        cabecalhos = {}
+        cookies = self._cabecalho_cookies(origem)
+        if cookies:
+            cabecalhos['Cookie'] = cookies
+        corpo = None
+        if dados is not None:
+            corpo = urlencode(dados).encode()
+            cabecalhos['Content-Type'] = 'application/x-www-form-urlencoded'
+            # O CsrfViewMiddleware confere a origem das requisições HTTPS
+            cabecalhos['Origin'] = f'{origem}://{host}:{porta}'
+        try:
+            if origem not in self._conexoes:
+                self._conexoes[origem] = await asyncio.open_connection(host, porta, ssl=contexto)
+            reader, writer = self._conexoes[origem]
+            inicio = time.perf_counter()
+            status, resposta, conteudo = await requisitar(
+                reader, writer, f'{host}:{porta}', caminho, cabecalhos, metodo, corpo,
+            )
+            ms = (time.perf_counter() - inicio) * 1000
+        except ERROS_CONEXAO:
+            self.medidas.erro(rota)
+            self._fechar(origem)
+            return None
+        self.medidas.registrar(rota, status, ms)
+        self._guardar_cookies(resposta.get('set-cookie', []))
+        if resposta.get('connection', '').lower() == 'close':
+            self._fechar(origem)
+        return status, resposta, conteudo
+
+    async def token_csrf(self, origem, caminho):
+        """GET do formulário; retorna o csrfmiddlewaretoken (ou None)."""
+        resultado = await self.pedir(origem, 'GET', caminho)
+        if resultado is None:
+            return None
+        achado = _TOKEN_CSRF.search(resultado[2])
+        return achado.group(1).decode() if achado else None
+
+    def _fechar(self, origem):
+        conexao = self._conexoes.pop(origem, None)
+        if conexao is not None:
+            conexao[1].close()
+
+    def fechar(self):
+        for origem in list(self._conexoes):
+            self._fechar(origem)
@@ -0,0 +1,127 @@
+"""
+Busca textual em Imovel (título, descrição e endereço) com SQLite FTS5.
+
+O índice core_imovel_fts é uma tabela FTS5 de conteúdo externo sobre
+core_imovel, mantida por triggers criados na migração 0005; por isso fica em
+dia mesmo com bulk_create e QuerySet.update. Em bancos que não são SQLite a
+busca cai para icontains.
+"""
+import re
+from contextlib import contextmanager
+
+from django.db import connection, connections, router, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Imovel
+
+TABELA_FTS = 'core_imovel_fts'
+TRIGGER_INSERCAO = 'core_imovel_fts_ai'
+
+# Pesos do bm25 por coluna: título, descrição, endereço
+PESOS = (10.0, 1.0, 5.0)
+
+_PALAVRA = re.compile(r'\w+', re.UNICODE)
+
+
+def disponivel():
+    """Indica se o banco atual tem o índice FTS5."""
+    return connection.vendor == 'sqlite'
+
+
+def expressao_fts(termo):
+    """
+    Converte o texto digitado em uma expressão MATCH segura: cada palavra
+    vira um prefixo entre aspas e todas precisam aparecer (AND implícito).
+    """
+    palavras = _PALAVRA.findall(termo or '')
+    return ' '.join(f'"{palavra}"*' for palavra in palavras)
+
+
+def filtrar(queryset, termo):
+    """Restringe um queryset de Imovel aos registros que casam com o termo."""
+    expressao = expressao_fts(termo)
+    if not expressao:
+        return queryset.none()
+    if not disponivel():
+        filtro = Q()
+        for palavra in _PALAVRA.findall(termo):
+            filtro &= (
+                Q(titulo__icontains=palavra)
+                | Q(descricao__icontains=palavra)
+                | Q(endereco__icontains=palavra)
+            )
+        return queryset.filter(filtro)
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s',
+        [expressao],
+    ))
+
+
+def buscar(termo, limite=20, deslocamento=0, apenas_ativos=True):
+    """
+    Retorna os imóveis que casam com o termo, do mais para o menos
+    relevante (bm25), como lista.
+    """
+    expressao = expressao_fts(termo)
+    if not expressao:
+        return []
+    if not disponivel():
+        qs = filtrar(Imovel.objects.all(), termo)
+        if apenas_ativos:
+            qs = qs.filter(ativo=True)
+        return list(qs.order_by('-data_cadastro')[deslocamento:deslocamento + limite])
+
+    tabela = connection.ops.quote_name(Imovel._meta.db_table)
+    filtro_ativo = f'AND {tabela}."ativo"' if apenas_ativos else ''
+    sql = (
+        f'SELECT {TABELA_FTS}.rowid FROM {TABELA_FTS} '
+        f'JOIN {tabela} ON {tabela}."id" = {TABELA_FTS}.rowid '
+        f'WHERE {TABELA_FTS} MATCH %s {filtro_ativo} '
+        f'ORDER BY bm25({TABELA_FTS}, %s, %s, %s) '
+        f'LIMIT %s OFFSET %s'
+    )
+    # Mesmo banco que o in_bulk abaixo (a réplica, nas views públicas)
+    with connections[router.db_for_read(Imovel)].cursor() as cursor:
+        cursor.execute(sql, [expressao, *PESOS, limite, deslocamento])
+        ids = [linha[0] for linha in cursor.fetchall()]
+
+    por_id = Imovel.objects.in_bulk(ids)
+    return [por_id[pk] for pk in ids if pk in por_id]
+
+
+def reconstruir_indice():
+    """Reconstrói o índice FTS a partir de core_imovel."""
+    if not disponivel():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')")
+
+
+@contextmanager
+def indice_suspenso():
+    """
+    Desliga a indexação a cada INSERT durante uma carga em massa e
+    reconstrói o índice ao final: uma passada só custa bem menos que
+    manter o FTS linha a linha. Updates e deletes continuam indexados.
+
+    A remoção do trigger, a carga e a recriação ficam numa transação só
+    (as transações de dentro viram savepoints): se a carga for
+    interrompida, mesmo com o processo morto, o rollback devolve o trigger.
+    """
+    if not disponivel():
+        yield
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = %s", [TRIGGER_INSERCAO]
+            )
+            linha = cursor.fetchone()
+            if linha is not None:
+                cursor.execute(f'DROP TRIGGER {TRIGGER_INSERCAO}')
+        yield
+        if linha is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(linha[0])
+            reconstruir_indice()
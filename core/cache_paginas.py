@@ -0,0 +1,126 @@
+"""
+Cache de respostas completas para as rotas públicas (HTTP:8080).
+
+As chaves carregam uma versão que é trocada a cada gravação de Imovel, de
+modo que uma alteração invalida todas as páginas de uma vez sem precisar
+apagá-las. Visitantes anônimos em cache hit não passam pela view: nem ORM
+nem engine de templates. Se a página guardada traz ETag/Last-Modified (ver
+core.catalogo.condicional), o hit também responde 304 a partir deles.
+
+O backend é o alias 'paginas' de CACHES (ver CACHE_PAGINAS em settings).
+Com 'arquivo', os servidores HTTP e HTTPS compartilham a versão, e uma
+gravação feita no HTTPS invalida as páginas servidas pelo HTTP. Outros
+caches por processo (facetas, estatísticas) usam versões guardadas aqui
+pelo mesmo motivo.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+ALIAS = 'paginas'
+CHAVE_VERSAO = 'paginas:versao'
+
+
+def _cache():
+    return caches[ALIAS]
+
+
+def versao(chave_versao=CHAVE_VERSAO):
+    """Versão atual das páginas em cache (ou de outra chave de versão)."""
+    cache = _cache()
+    atual = cache.get(chave_versao)
+    if atual is None:
+        # Começa de um valor baseado no relógio para não reaproveitar
+        # páginas antigas se a chave de versão tiver sido descartada.
+        cache.add(chave_versao, time.time_ns(), None)
+        atual = cache.get(chave_versao)
+    return atual
+
+
+def invalidar(chave_versao=CHAVE_VERSAO):
+    """Troca a versão (por padrão, a das páginas), tornando obsoleto o que a usa."""
+    cache = _cache()
+    try:
+        cache.incr(chave_versao)
+    except ValueError:
+        cache.set(chave_versao, time.time_ns(), None)
+
+
+def anonimo(request):
+    """Sem cookie de sessão nem de mensagens: a página não depende do visitante."""
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and 'messages' not in request.COOKIES
+    )
+
+
+def chave(request):
+    """Chave de cache da requisição na versão atual."""
+    bruto = f'{request.method}:{request.get_host()}:{request.get_full_path()}'
+    resumo = hashlib.md5(bruto.encode(), usedforsecurity=False).hexdigest()
+    return f'paginas:{versao()}:{resumo}'
+
+
+def _cacheavel(request):
+    return request.method in ('GET', 'HEAD') and anonimo(request)
+
+
+def _consultar(request):
+    """(chave, resposta em cache ou None) para a requisição."""
+    chave_pagina = chave(request)
+    response = _cache().get(chave_pagina)
+    if response is not None:
+        if response.has_header('ETag') or response.has_header('Last-Modified'):
+            # Validadores gravados junto com a página: o 304 não lê o banco
+            response = get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+                response=response,
+            )
+        response['X-Cache'] = 'HIT'
+    return chave_pagina, response
+
+
+def _guardar(chave_pagina, response):
+    if (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+    ):
+        _cache().set(chave_pagina, response, getattr(settings, 'CACHE_PAGINAS_TTL', 600))
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def cache_publico(view):
+    """
+    Decorator que guarda a resposta completa de uma view pública.
+    Aceita views síncronas e assíncronas.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def _aview(request, *args, **kwargs):
+            if not _cacheavel(request):
+                return await view(request, *args, **kwargs)
+            chave_pagina, response = _consultar(request)
+            if response is not None:
+                return response
+            return _guardar(chave_pagina, await view(request, *args, **kwargs))
+        return markcoroutinefunction(_aview)
+
+    @wraps(view)
+    def _view(request, *args, **kwargs):
+        if not _cacheavel(request):
+            return view(request, *args, **kwargs)
+        chave_pagina, response = _consultar(request)
+        if response is not None:
+            return response
+        return _guardar(chave_pagina, view(request, *args, **kwargs))
+    return _view
@@ -0,0 +1,100 @@
+"""
+Versão do catálogo de imóveis e GET condicional das páginas públicas.
+
+Toda gravação de Imovel (sinais, importação) incrementa a versão e grava o
+instante da alteração, na mesma transação, em duas linhas de Contador.
+Ler o estado é uma consulta pela chave única, compartilhada entre os
+servidores HTTP e HTTPS; ele serve de ETag/Last-Modified para as páginas
+que dependem só do catálogo.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from . import contadores
+from .cache_paginas import anonimo
+
+VERSAO = 'catalogo_versao'
+ALTERADO_EM = 'catalogo_alterado_em'
+
+
+def registrar_alteracao():
+    """Nova versão do catálogo; chamar dentro da transação da gravação."""
+    with transaction.atomic():
+        contadores.ajustar({VERSAO: 1})
+        contadores.definir(ALTERADO_EM, int(time.time()))
+
+
+def estado():
+    """(versao, alterado_em em segundos desde a época)."""
+    valores = contadores.ler_varios([VERSAO, ALTERADO_EM])
+    return valores[VERSAO], valores[ALTERADO_EM]
+
+
+async def aestado():
+    valores = await contadores.aler_varios([VERSAO, ALTERADO_EM])
+    return valores[VERSAO], valores[ALTERADO_EM]
+
+
+def etag(versao, *partes):
+    """ETag da versão do catálogo, opcionalmente qualificada (campos, filtros)."""
+    if not partes:
+        return f'"catalogo-{versao}"'
+    resumo = hashlib.md5(repr(partes).encode(), usedforsecurity=False).hexdigest()[:16]
+    return f'"catalogo-{versao}-{resumo}"'
+
+
+def _condicional(request, versao, alterado_em):
+    """304 se o cliente já tem esta versão; None para seguir com a view."""
+    return get_conditional_response(request, etag(versao), alterado_em or None)
+
+
+def _validadores(response, versao, alterado_em):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag(versao)
+        if alterado_em:
+            response['Last-Modified'] = http_date(alterado_em)
+    # Revalida sempre: o 304 sai do cache de páginas ou, na falta, de uma
+    # leitura de contador, sem renderização
+    patch_cache_control(response, public=True, no_cache=True)
+    patch_vary_headers(response, ['Cookie'])
+    return response
+
+
+def condicional(view):
+    """
+    GET condicional por versão do catálogo para visitantes anônimos (os
+    mesmos que recebem páginas do cache_publico). Aceita views síncronas e
+    assíncronas. Deve ficar por dentro de cache_publico, que grava os
+    validadores junto com a página e responde o 304 dos hits sem o ORM.
+    """
+    def _aplica(request):
+        return request.method in ('GET', 'HEAD') and anonimo(request)
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def _aview(request, *args, **kwargs):
+            if not _aplica(request):
+                return await view(request, *args, **kwargs)
+            versao, alterado_em = await aestado()
+            response = _condicional(request, versao, alterado_em)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            return _validadores(response, versao, alterado_em)
+        return markcoroutinefunction(_aview)
+
+    @wraps(view)
+    def _view(request, *args, **kwargs):
+        if not _aplica(request):
+            return view(request, *args, **kwargs)
+        versao, alterado_em = estado()
+        response = _condicional(request, versao, alterado_em)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        return _validadores(response, versao, alterado_em)
+    return _view
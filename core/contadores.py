@@ -0,0 +1,134 @@
+"""
+Contadores desnormalizados de Imovel e Cliente.
+
+Cada contagem é uma linha de Contador, ajustada com UPDATE ... SET valor =
+valor + delta pelos sinais de save/delete. Ler uma contagem é uma busca pela
+chave única, independente do tamanho das tabelas. Como bulk_create e
+QuerySet.update/delete não disparam sinais, quem usar essas operações deve
+rodar `manage.py reconciliar_contadores` em seguida.
+"""
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Cliente, Contador, Imovel
+
+IMOVEIS_TOTAL = 'imoveis_total'
+IMOVEIS_ATIVOS = 'imoveis_ativos'
+CLIENTES_TOTAL = 'clientes_total'
+
+
+def chave_tipo(tipo):
+    """Chave do contador de imóveis de um tipo (venda/aluguel)."""
+    return f'imoveis_tipo_{tipo}'
+
+
+def todas_as_chaves():
+    return [IMOVEIS_TOTAL, IMOVEIS_ATIVOS, CLIENTES_TOTAL] + [
+        chave_tipo(tipo) for tipo, _ in Imovel.TIPO_CHOICES
+    ]
+
+
+def chaves_imovel(tipo, ativo):
+    """Contadores em que um imóvel com esse tipo/ativo é contado."""
+    chaves = [IMOVEIS_TOTAL, chave_tipo(tipo)]
+    if ativo:
+        chaves.append(IMOVEIS_ATIVOS)
+    return chaves
+
+
+def ajustar(deltas):
+    """Soma cada delta ao contador correspondente (cria o que faltar)."""
+    with transaction.atomic():
+        for chave, delta in deltas.items():
+            if not delta:
+                continue
+            atualizados = Contador.objects.filter(chave=chave).update(valor=F('valor') + delta)
+            if not atualizados:
+                Contador.objects.get_or_create(chave=chave)
+                Contador.objects.filter(chave=chave).update(valor=F('valor') + delta)
+
+
+def definir(chave, valor):
+    """Grava um valor absoluto no contador (cria se faltar)."""
+    if not Contador.objects.filter(chave=chave).update(valor=valor):
+        Contador.objects.update_or_create(chave=chave, defaults={'valor': valor})
+
+
+def ler(chave):
+    """Valor atual de um contador (0 se ainda não existir)."""
+    valor = Contador.objects.filter(chave=chave).values_list('valor', flat=True).first()
+    return valor or 0
+
+
+def ler_varios(chaves):
+    """Valores de vários contadores em uma consulta."""
+    valores = dict(Contador.objects.filter(chave__in=chaves).values_list('chave', 'valor'))
+    return {chave: valores.get(chave, 0) for chave in chaves}
+
+
+async def aler_varios(chaves):
+    """Versão assíncrona de ler_varios."""
+    valores = {
+        chave: valor
+        async for chave, valor in Contador.objects.filter(chave__in=chaves).values_list('chave', 'valor')
+    }
+    return {chave: valores.get(chave, 0) for chave in chaves}
+
+
+def contar_no_banco():
+    """
+    Contagens reais, calculadas em uma única consulta com agregações
+    condicionais (usada na reconciliação).
+    """
+    qn = connection.ops.quote_name
+    imovel = qn(Imovel._meta.db_table)
+    cliente = qn(Cliente._meta.db_table)
+    ativo = qn(Imovel._meta.get_field('ativo').column)
+    tipo = qn(Imovel._meta.get_field('tipo').column)
+
+    tipos = [valor for valor, _ in Imovel.TIPO_CHOICES]
+    colunas = [
+        'COUNT(*)',
+        f'COALESCE(SUM(CASE WHEN {ativo} THEN 1 ELSE 0 END), 0)',
+        f'(SELECT COUNT(*) FROM {cliente})',
+    ] + [
+        f'COALESCE(SUM(CASE WHEN {tipo} = %s THEN 1 ELSE 0 END), 0)' for _ in tipos
+    ]
+    sql = f'SELECT {", ".join(colunas)} FROM {imovel}'
+    with connection.cursor() as cursor:
+        cursor.execute(sql, tipos)
+        linha = cursor.fetchone()
+
+    contagens = {
+        IMOVEIS_TOTAL: linha[0],
+        IMOVEIS_ATIVOS: linha[1],
+        CLIENTES_TOTAL: linha[2],
+    }
+    for tipo_valor, quantidade in zip(tipos, linha[3:]):
+        contagens[chave_tipo(tipo_valor)] = quantidade
+    return contagens
+
+
+def reconciliar():
+    """
+    Recalcula os contadores a partir das tabelas e corrige divergências.
+
+    Retorna {chave: (valor_anterior, valor_correto)} apenas para os contadores
+    que estavam errados.
+    """
+    with transaction.atomic():
+        reais = contar_no_banco()
+        atuais = {
+            c.chave: c for c in Contador.objects.select_for_update().filter(chave__in=reais)
+        }
+        corrigidos = {}
+        for chave, valor in reais.items():
+            contador = atuais.get(chave)
+            if contador is None:
+                Contador.objects.create(chave=chave, valor=valor)
+                corrigidos[chave] = (None, valor)
+            elif contador.valor != valor:
+                corrigidos[chave] = (contador.valor, valor)
+                contador.valor = valor
+                contador.save(update_fields=['valor'])
+        return corrigidos
@@ -0,0 +1,92 @@
+"""
+Estatísticas do dashboard com cache.
+
+As contagens vêm da tabela de contadores (core.contadores) em uma única
+consulta; o resultado, junto com os registros recentes, fica no cache do
+processo por um TTL curto. A chave leva uma versão guardada no cache de
+páginas (core.cache_paginas), compartilhada entre os servidores: os sinais
+de save/delete de Imovel e Cliente trocam essa versão, e a invalidação vale
+para todos os processos, inclusive quando parte de um comando de gestão.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from . import cache_paginas, contadores
+from .models import Cliente, Imovel
+
+CHAVE_CACHE = 'core:estatisticas'
+CHAVE_VERSAO = 'estatisticas:versao'
+CHAVES_CONTADORES = [contadores.IMOVEIS_TOTAL, contadores.IMOVEIS_ATIVOS, contadores.CLIENTES_TOTAL]
+
+
+def _imoveis_recentes():
+    return Imovel.objects.filter(ativo=True).order_by('-data_cadastro')[:5]
+
+
+def _clientes_recentes():
+    return Cliente.objects.all().order_by('-data_cadastro')[:5]
+
+
+async def _alista(queryset):
+    return [item async for item in queryset]
+
+
+def _contagens(valores):
+    return {
+        'total_imoveis': valores[contadores.IMOVEIS_TOTAL],
+        'imoveis_ativos': valores[contadores.IMOVEIS_ATIVOS],
+        'total_clientes': valores[contadores.CLIENTES_TOTAL],
+    }
+
+
+def calcular_contagens():
+    """Lê as contagens da tabela de contadores (uma consulta, O(1))."""
+    return _contagens(contadores.ler_varios(CHAVES_CONTADORES))
+
+
+def calcular_estatisticas():
+    """Monta as estatísticas do dashboard direto do banco (sem cache)."""
+    dados = calcular_contagens()
+    dados['imoveis_recentes'] = list(_imoveis_recentes())
+    dados['clientes_recentes'] = list(_clientes_recentes())
+    return dados
+
+
+async def acalcular_estatisticas():
+    """
+    Versão assíncrona de calcular_estatisticas. As consultas rodam uma
+    após a outra: o ORM assíncrono executa todas na mesma thread.
+    """
+    dados = _contagens(await contadores.aler_varios(CHAVES_CONTADORES))
+    dados['imoveis_recentes'] = await _alista(_imoveis_recentes())
+    dados['clientes_recentes'] = await _alista(_clientes_recentes())
+    return dados
+
+
+def _chave():
+    return f'{CHAVE_CACHE}:{cache_paginas.versao(CHAVE_VERSAO)}'
+
+
+def obter_estatisticas():
+    """Retorna as estatísticas do cache, recalculando se expiradas."""
+    chave = _chave()
+    dados = cache.get(chave)
+    if dados is None:
+        dados = calcular_estatisticas()
+        cache.set(chave, dados, getattr(settings, 'ESTATISTICAS_CACHE_TTL', 60))
+    return dados
+
+
+async def aobter_estatisticas():
+    """Versão assíncrona de obter_estatisticas."""
+    chave = _chave()
+    dados = cache.get(chave)
+    if dados is None:
+        dados = await acalcular_estatisticas()
+        cache.set(chave, dados, getattr(settings, 'ESTATISTICAS_CACHE_TTL', 60))
+    return dados
+
+
+def invalidar_estatisticas():
+    """Troca a versão das estatísticas em cache em todos os processos."""
+    cache_paginas.invalidar(CHAVE_VERSAO)
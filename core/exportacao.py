@@ -0,0 +1,105 @@
+"""
+Exportação em streaming de Imovel e Cliente (CSV/JSONL).
+
+As linhas são lidas de `.values_list().iterator(chunk_size=...)` e escritas
+em blocos de ~64 KB, seja numa StreamingHttpResponse (ações do admin, API)
+ou num arquivo (manage.py exportar). A memória usada não depende do número
+de linhas.
+"""
+import csv
+import io
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import Cliente, Imovel
+
+# Linhas lidas do banco por vez e tamanho aproximado de cada bloco gerado
+TAMANHO_LOTE = 2000
+TAMANHO_BLOCO = 64 * 1024
+
+# Campos exportados por model (a senha do cliente nunca sai)
+CAMPOS = {
+    Imovel: ('id', 'titulo', 'tipo', 'preco', 'endereco', 'descricao', 'ativo', 'data_cadastro',
+             'data_atualizacao'),
+    Cliente: ('id', 'nome', 'email', 'telefone', 'cpf', 'observacoes', 'data_cadastro'),
+}
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def linhas(queryset, campos, chunk_size=TAMANHO_LOTE):
+    """Tuplas dos campos pedidos, lidas do cursor em lotes."""
+    return queryset.values_list(*campos).iterator(chunk_size=chunk_size)
+
+
+def em_blocos(textos, tamanho=TAMANHO_BLOCO):
+    """Junta pedaços de texto em blocos de bytes de ~`tamanho`."""
+    partes = []
+    acumulado = 0
+    for texto in textos:
+        partes.append(texto)
+        acumulado += len(texto)
+        if acumulado >= tamanho:
+            yield ''.join(partes).encode()
+            partes = []
+            acumulado = 0
+    if partes:
+        yield ''.join(partes).encode()
+
+
+def _textos_csv(queryset, campos, chunk_size):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    # BOM para o Excel reconhecer o UTF-8 (importar_* aceitam o BOM)
+    yield '\ufeff'
+    escritor.writerow(campos)
+    for linha in linhas(queryset, campos, chunk_size):
+        escritor.writerow(linha)
+        if buffer.tell() >= TAMANHO_BLOCO:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _textos_jsonl(queryset, campos, chunk_size):
+    codificador = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for linha in linhas(queryset, campos, chunk_size):
+        yield codificador.encode(dict(zip(campos, linha))) + '\n'
+
+
+def gerar(queryset, formato, campos=None, chunk_size=TAMANHO_LOTE):
+    """Blocos de bytes do queryset no formato pedido ('csv' ou 'jsonl')."""
+    campos = campos or CAMPOS[queryset.model]
+    textos = _textos_csv if formato == 'csv' else _textos_jsonl
+    return em_blocos(textos(queryset, campos, chunk_size))
+
+
+async def _assincrono(blocos):
+    """Consome um gerador síncrono bloco a bloco, sem bloquear o event loop."""
+    proximo = sync_to_async(next)
+    try:
+        while (bloco := await proximo(blocos, None)) is not None:
+            yield bloco
+    finally:
+        await sync_to_async(blocos.close)()
+
+
+def resposta_streaming(request, blocos, content_type, nome_arquivo=None):
+    """
+    StreamingHttpResponse que nunca acumula o conteúdo: sob ASGI o Django
+    transformaria um iterador síncrono em lista antes de enviar, então ele
+    é entregue como iterador assíncrono.
+    """
+    if isinstance(request, ASGIRequest):
+        blocos = _assincrono(blocos)
+    response = StreamingHttpResponse(blocos, content_type=content_type)
+    if nome_arquivo:
+        response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    return response
@@ -0,0 +1,136 @@
+"""
+Contagens de facetas da listagem pública (por tipo e por faixa de preço).
+
+Uma única consulta agrupada por tipo, com uma contagem condicional por
+faixa, gera a matriz de contagens (tipo, faixa); as facetas são somas
+dessa matriz. O resultado fica no cache do processo, com a versão do cache de páginas na chave: essa
+versão é compartilhada entre os servidores e trocada a cada gravação de
+Imovel (e a cada atualização da réplica), então as facetas mudam junto com
+as páginas em que aparecem, seja qual for o processo que gravou.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from . import cache_paginas
+from .models import Imovel
+
+CHAVE_CACHE = 'core:facetas'
+
+# Faixas de preço: (rótulo, mínimo, máximo); máximo None = sem limite
+FAIXAS_PRECO = [
+    ('Até R$ 5 mil', Decimal('0'), Decimal('5000')),
+    ('R$ 5 mil a R$ 100 mil', Decimal('5000'), Decimal('100000')),
+    ('R$ 100 mil a R$ 300 mil', Decimal('100000'), Decimal('300000')),
+    ('R$ 300 mil a R$ 600 mil', Decimal('300000'), Decimal('600000')),
+    ('R$ 600 mil a R$ 1 milhão', Decimal('600000'), Decimal('1000000')),
+    ('Acima de R$ 1 milhão', Decimal('1000000'), None),
+]
+
+
+def _filtro_faixa(minimo, maximo):
+    filtro = Q(preco__gte=minimo)
+    if maximo is not None:
+        filtro &= Q(preco__lt=maximo)
+    return filtro
+
+
+def _consulta_matriz():
+    """
+    Uma linha por tipo, com a contagem de cada faixa em colunas: o GROUP BY
+    tipo segue o índice (tipo, preco) dos ativos, sem ordenação temporária.
+    """
+    contagens = {
+        f'faixa_{indice}': Count('id', filter=_filtro_faixa(minimo, maximo))
+        for indice, (_, minimo, maximo) in enumerate(FAIXAS_PRECO)
+    }
+    return (
+        Imovel.objects.filter(ativo=True)
+        .values('tipo')
+        .annotate(total=Count('id'), **contagens)
+        .order_by('tipo')
+    )
+
+
+def _matriz(linha):
+    """Células (tipo, faixa) de uma linha; faixa None para preços fora das faixas."""
+    celulas = {(linha['tipo'], indice): linha[f'faixa_{indice}'] for indice in range(len(FAIXAS_PRECO))}
+    celulas[(linha['tipo'], None)] = linha['total'] - sum(celulas.values())
+    return {celula: quantidade for celula, quantidade in celulas.items() if quantidade}
+
+
+def calcular_matriz():
+    """{(tipo, faixa): quantidade} dos imóveis ativos, em uma consulta."""
+    matriz = {}
+    for linha in _consulta_matriz():
+        matriz.update(_matriz(linha))
+    return matriz
+
+
+async def acalcular_matriz():
+    """Versão assíncrona de calcular_matriz."""
+    matriz = {}
+    async for linha in _consulta_matriz():
+        matriz.update(_matriz(linha))
+    return matriz
+
+
+def _chave():
+    return f'{CHAVE_CACHE}:{cache_paginas.versao()}'
+
+
+def obter_matriz():
+    """Matriz de contagens do cache, recalculada se expirada."""
+    chave = _chave()
+    matriz = cache.get(chave)
+    if matriz is None:
+        matriz = calcular_matriz()
+        cache.set(chave, matriz, getattr(settings, 'FACETAS_CACHE_TTL', 300))
+    return matriz
+
+
+async def aobter_matriz():
+    """Versão assíncrona de obter_matriz."""
+    chave = _chave()
+    matriz = cache.get(chave)
+    if matriz is None:
+        matriz = await acalcular_matriz()
+        cache.set(chave, matriz, getattr(settings, 'FACETAS_CACHE_TTL', 300))
+    return matriz
+
+
+def facetas(tipo=None):
+    """
+    Facetas para exibição. As contagens por tipo consideram todo o
+    catálogo ativo; as faixas de preço respeitam o tipo selecionado.
+    """
+    return montar_facetas(obter_matriz(), tipo)
+
+
+async def afacetas(tipo=None):
+    """Versão assíncrona de facetas."""
+    return montar_facetas(await aobter_matriz(), tipo)
+
+
+def montar_facetas(matriz, tipo=None):
+    """Soma a matriz (tipo, faixa) nas facetas por tipo e por faixa."""
+    por_tipo = []
+    for valor, rotulo in Imovel.TIPO_CHOICES:
+        quantidade = sum(n for (t, _), n in matriz.items() if t == valor)
+        por_tipo.append({'valor': valor, 'rotulo': rotulo, 'quantidade': quantidade})
+
+    por_faixa = []
+    for indice, (rotulo, minimo, maximo) in enumerate(FAIXAS_PRECO):
+        quantidade = sum(
+            n for (t, f), n in matriz.items() if f == indice and (not tipo or t == tipo)
+        )
+        por_faixa.append({
+            'rotulo': rotulo,
+            'preco_min': minimo,
+            # preco_max é inclusivo no filtro; o limite da faixa é exclusivo
+            'preco_max': maximo - Decimal('0.01') if maximo is not None else None,
+            'quantidade': quantidade,
+        })
+    return {'tipos': por_tipo, 'faixas': por_faixa}
@@ -7,6 +7,17 @@ from django.contrib.auth.hashers import make_password
 from .models import Cliente, Imovel
 
 
+def normalizar_cpf(cpf):
+    """Remove a formatação do CPF; levanta ValidationError se não tiver 11 dígitos."""
+    # Remove pontos e hífen
+    cpf_limpo = ''.join(filter(str.isdigit, cpf or ''))
+    
+    if len(cpf_limpo) != 11:
+        raise forms.ValidationError("CPF deve conter exatamente 11 dígitos.")
+    
+    return cpf_limpo
+
+
 class ClienteForm(forms.ModelForm):
     """Formulário para cadastro de cliente."""
     
@@ -76,14 +87,7 @@ class ClienteForm(forms.ModelForm):
     
     def clean_cpf(self):
         """Remove formatação do CPF e valida."""
-        cpf = self.cleaned_data.get('cpf')
-        # Remove pontos e hífen
-        cpf_limpo = ''.join(filter(str.isdigit, cpf))
-        
-        if len(cpf_limpo) != 11:
-            raise forms.ValidationError("CPF deve conter exatamente 11 dígitos.")
-        
-        return cpf_limpo
+        return normalizar_cpf(self.cleaned_data.get('cpf'))
     
     def clean_confirmar_senha(self):
         """Valida se as senhas coincidem."""
@@ -145,3 +149,76 @@ class ImovelForm(forms.ModelForm):
             'descricao': 'Descrição',
         }
 
+
+class FiltroImoveisForm(forms.Form):
+    """Filtros da listagem pública de imóveis (query string)."""
+    
+    # ordem -> (campo, decrescente) usados na paginação por cursor
+    ORDENACOES = {
+        'recentes': ('data_cadastro', True),
+        'menor_preco': ('preco', False),
+        'maior_preco': ('preco', True),
+    }
+    
+    tipo = forms.ChoiceField(
+        choices=[('', 'Todos')] + Imovel.TIPO_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        label='Tipo'
+    )
+    
+    preco_min = forms.DecimalField(
+        min_value=0,
+        max_digits=12,
+        decimal_places=2,
+        required=False,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Mínimo',
+            'step': '0.01',
+            'min': '0'
+        }),
+        label='Preço mínimo (R$)'
+    )
+    
+    preco_max = forms.DecimalField(
+        min_value=0,
+        max_digits=12,
+        decimal_places=2,
+        required=False,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Máximo',
+            'step': '0.01',
+            'min': '0'
+        }),
+        label='Preço máximo (R$)'
+    )
+    
+    ordem = forms.ChoiceField(
+        choices=[
+            ('recentes', 'Mais recentes'),
+            ('menor_preco', 'Menor preço'),
+            ('maior_preco', 'Maior preço'),
+        ],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        label='Ordenar por'
+    )
+    
+    def filtrar(self, queryset):
+        """Aplica os filtros válidos ao queryset (campos inválidos são ignorados)."""
+        self.is_valid()
+        dados = self.cleaned_data
+        if dados.get('tipo'):
+            queryset = queryset.filter(tipo=dados['tipo'])
+        if dados.get('preco_min') is not None:
+            queryset = queryset.filter(preco__gte=dados['preco_min'])
+        if dados.get('preco_max') is not None:
+            queryset = queryset.filter(preco__lte=dados['preco_max'])
+        return queryset
+    
+    def ordenacao(self):
+        """Retorna (campo, decrescente) da ordenação escolhida."""
+        self.is_valid()
+        return self.ORDENACOES[self.cleaned_data.get('ordem') or 'recentes']
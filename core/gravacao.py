@@ -0,0 +1,189 @@
+"""
+Gravações em grupo (group commit) para os cadastros de imóvel e cliente.
+
+O SQLite aceita um escritor por vez: requisições concorrentes que gravam
+cada uma a sua transação disputam o lock e pagam um commit (fsync) cada.
+Aqui, uma única thread escritora recebe as gravações em uma fila e grava
+as que chegarem dentro de uma janela curta (GRAVACAO_JANELA_MS) em uma
+transação só, até GRAVACAO_LOTE_MAXIMO por vez. A janela só é esperada
+quando há concorrência.
+
+Cada gravação roda em um savepoint próprio: um erro (ex.: IntegrityError
+de CPF duplicado numa corrida) volta só para a requisição que a pediu, e
+as demais do lote são confirmadas. A validação do form e o hash de senha
+continuam na thread da requisição. Se a escritora não começar uma
+gravação em GRAVACAO_PRAZO segundos, o pedido é retirado e a requisição
+recebe GravacaoIndisponivel (HTTP 503): nada foi gravado. Uma gravação já
+começada não pode mais ser retirada; a requisição espera o lote por mais
+um prazo e, se ele não terminar, recebe GravacaoIncerta.
+"""
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class GravacaoIndisponivel(RuntimeError):
+    """A thread escritora não começou a gravação dentro do prazo; nada foi gravado."""
+
+
+class GravacaoIncerta(GravacaoIndisponivel):
+    """A gravação começou, mas o lote não terminou no prazo: pode ter sido confirmada."""
+
+
+NA_FILA, EM_EXECUCAO, CANCELADO = 'na_fila', 'em_execucao', 'cancelado'
+
+
+class Pedido:
+    __slots__ = ('funcao', 'resultado', 'erro', 'concluido', 'estado', '_lock')
+
+    def __init__(self, funcao):
+        self.funcao = funcao
+        self.resultado = None
+        self.erro = None
+        self.concluido = threading.Event()
+        self.estado = NA_FILA
+        self._lock = threading.Lock()
+
+    def _trocar(self, novo):
+        """Passa de NA_FILA para `novo`; False se o pedido já saiu da fila."""
+        with self._lock:
+            if self.estado != NA_FILA:
+                return False
+            self.estado = novo
+            return True
+
+    def iniciar(self):
+        """Chamado pela escritora antes de executar a gravação."""
+        return self._trocar(EM_EXECUCAO)
+
+    def cancelar(self):
+        """Chamado pela requisição no fim do prazo."""
+        return self._trocar(CANCELADO)
+
+
+class GrupoGravacao:
+    """Fila de gravações atendida por uma thread que agrupa commits."""
+
+    def __init__(self, janela_ms, lote_maximo, prazo):
+        self.janela = janela_ms / 1000
+        self.lote_maximo = lote_maximo
+        self.prazo = prazo
+        self._fila = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._lotes = 0
+        self._gravacoes = 0
+        self._maior_lote = 0
+
+    def _iniciar(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar, name='gravacao', daemon=True)
+                self._thread.start()
+
+    def gravar(self, funcao):
+        """
+        Executa funcao() no próximo lote e devolve o seu resultado (ou
+        levanta a sua exceção) depois do commit. Levanta
+        GravacaoIndisponivel se a gravação não começar dentro do prazo (o
+        pedido é descartado) e GravacaoIncerta se, já começada, o lote não
+        terminar em mais um prazo.
+        """
+        # Dentro de uma transação da própria thread, a escritora ficaria
+        # esperando o lock que esta thread segura: grava direto
+        if threading.current_thread() is self._thread or connection.in_atomic_block:
+            return funcao()
+        pedido = Pedido(funcao)
+        self._iniciar()
+        self._fila.put(pedido)
+        if not pedido.concluido.wait(self.prazo):
+            if pedido.cancelar():
+                raise GravacaoIndisponivel(f'Gravação não iniciada em {self.prazo:g} s.')
+            # Já está no lote aberto: o resultado é o do commit
+            if not pedido.concluido.wait(self.prazo):
+                raise GravacaoIncerta(f'Lote não concluído em {2 * self.prazo:g} s.')
+        if pedido.erro is not None:
+            raise pedido.erro
+        return pedido.resultado
+
+    def _executar(self):
+        ultimo = 1
+        while True:
+            lote = [self._fila.get()]
+            # Só espera a janela havendo concorrência (lote anterior com mais
+            # de uma gravação ou fila não vazia); um escritor sozinho não
+            # paga a espera
+            espera = self.janela if ultimo > 1 or not self._fila.empty() else 0
+            prazo = time.monotonic() + espera
+            while len(lote) < self.lote_maximo:
+                restante = prazo - time.monotonic()
+                try:
+                    lote.append(self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            self._gravar_lote(lote)
+            ultimo = len(lote)
+
+    def _gravar_lote(self, lote):
+        try:
+            connection.close_if_unusable_or_obsolete()
+            with transaction.atomic():
+                for pedido in lote:
+                    if not pedido.iniciar():
+                        continue
+                    try:
+                        with transaction.atomic():
+                            pedido.resultado = pedido.funcao()
+                    except Exception as exc:
+                        pedido.erro = exc
+        except Exception as exc:
+            # Falha no commit: nenhuma gravação do lote foi confirmada
+            logger.exception('Falha ao gravar um lote de %d registro(s).', len(lote))
+            for pedido in lote:
+                if pedido.erro is None:
+                    pedido.erro = exc
+        finally:
+            # Antes das métricas: nada pode impedir a liberação dos pedidos
+            for pedido in lote:
+                pedido.concluido.set()
+            with self._lock:
+                self._lotes += 1
+                self._gravacoes += len(lote)
+                self._maior_lote = max(self._maior_lote, len(lote))
+
+    def metricas(self):
+        """Lotes gravados, gravações e tamanho médio/máximo dos lotes."""
+        with self._lock:
+            return {
+                'janela_ms': self.janela * 1000,
+                'lote_maximo': self.lote_maximo,
+                'na_fila': self._fila.qsize(),
+                'lotes': self._lotes,
+                'gravacoes': self._gravacoes,
+                'lote_medio': self._gravacoes / self._lotes if self._lotes else 0,
+                'maior_lote': self._maior_lote,
+            }
+
+
+grupo = GrupoGravacao(
+    janela_ms=getattr(settings, 'GRAVACAO_JANELA_MS', 2),
+    lote_maximo=getattr(settings, 'GRAVACAO_LOTE_MAXIMO', 64),
+    prazo=getattr(settings, 'GRAVACAO_PRAZO', 10),
+)
+
+
+def gravar(funcao):
+    """funcao() pelo grupo de gravações, ou direto se GRAVACAO_EM_GRUPO for False."""
+    if not getattr(settings, 'GRAVACAO_EM_GRUPO', True):
+        return funcao()
+    return grupo.gravar(funcao)
+
+
+def metricas():
+    return grupo.metricas()
@@ -0,0 +1,141 @@
+"""
+Resolução de clientes por id com cache.
+
+Dois níveis: memória da requisição (o mesmo cliente não é buscado duas
+vezes na mesma requisição) e um LRU com TTL no processo, compartilhado
+entre requisições. Cada entrada do LRU guarda a versão do cliente lida do
+cache de páginas (core.cache_paginas), compartilhado entre os servidores;
+os sinais de save/delete de Cliente trocam essa versão, e um hit com versão
+antiga vale como falta em qualquer processo.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from . import cache_paginas
+from .models import Cliente
+
+
+class CacheLRU:
+    """Cache LRU limitado, com expiração por TTL e seguro entre threads."""
+
+    def __init__(self, tamanho, ttl):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            valor, expira_em = item
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = (valor, time.monotonic() + self.ttl)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+
+    def delete(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+
+clientes = CacheLRU(
+    tamanho=getattr(settings, 'IDENTIDADE_CACHE_TAMANHO', 1024),
+    ttl=getattr(settings, 'IDENTIDADE_CACHE_TTL', 300),
+)
+
+
+def _normalizar_id(cliente_id):
+    try:
+        return int(cliente_id)
+    except (TypeError, ValueError):
+        raise Cliente.DoesNotExist(f'Id de cliente inválido: {cliente_id!r}')
+
+
+def _memoria(request):
+    """Clientes já resolvidos nesta requisição."""
+    if request is None:
+        return None
+    return request.__dict__.setdefault('_clientes_resolvidos', {})
+
+
+def _chave_versao(cliente_id):
+    return f'cliente:{cliente_id}:versao'
+
+
+def _do_lru(cliente_id):
+    """(versão atual, cliente do LRU ou None se ausente ou de versão antiga)."""
+    versao = cache_paginas.versao(_chave_versao(cliente_id))
+    item = clientes.get(cliente_id)
+    if item is None or item[0] != versao:
+        return versao, None
+    return versao, item[1]
+
+
+def _guardar(cliente_id, versao, cliente, memoria):
+    # Versão lida antes da consulta: uma troca durante ela invalida a entrada
+    clientes.set(cliente_id, (versao, cliente))
+    return _entregar(cliente_id, cliente, memoria)
+
+
+def _entregar(cliente_id, cliente, memoria):
+    # Cópia para que alterações feitas por uma requisição não vazem para outras
+    cliente = copy.copy(cliente)
+    if memoria is not None:
+        memoria[cliente_id] = cliente
+    return cliente
+
+
+def obter_cliente(cliente_id, request=None):
+    """
+    Retorna o Cliente com o id informado, usando os caches quando possível.
+    Levanta Cliente.DoesNotExist se ele não existir.
+    """
+    cliente_id = _normalizar_id(cliente_id)
+    memoria = _memoria(request)
+    if memoria is not None and cliente_id in memoria:
+        return memoria[cliente_id]
+
+    versao, cliente = _do_lru(cliente_id)
+    if cliente is None:
+        return _guardar(cliente_id, versao, Cliente.objects.get(pk=cliente_id), memoria)
+    return _entregar(cliente_id, cliente, memoria)
+
+
+async def aobter_cliente(cliente_id, request=None):
+    """Versão assíncrona de obter_cliente."""
+    cliente_id = _normalizar_id(cliente_id)
+    memoria = _memoria(request)
+    if memoria is not None and cliente_id in memoria:
+        return memoria[cliente_id]
+
+    versao, cliente = _do_lru(cliente_id)
+    if cliente is None:
+        return _guardar(cliente_id, versao, await Cliente.objects.aget(pk=cliente_id), memoria)
+    return _entregar(cliente_id, cliente, memoria)
+
+
+def invalidar_cliente(cliente_id):
+    """Remove o cliente do cache entre requisições, em todos os processos."""
+    clientes.delete(cliente_id)
+    cache_paginas.invalidar(_chave_versao(cliente_id))
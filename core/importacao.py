@@ -0,0 +1,149 @@
+"""
+Apoio às importações em massa (importar_imoveis, importar_clientes).
+
+Leitura em streaming de CSV/JSONL, arquivo de progresso para retomar uma
+importação interrompida, hashing de senhas em processos e o acerto de
+contadores/caches que os sinais fariam, já que bulk_create não dispara
+post_save.
+
+Um comando de gestão roda em outro processo que os servidores: os caches
+são invalidados pelas versões guardadas no cache de páginas, que os
+servidores leem (ver core.cache_paginas). Com CACHE_PAGINAS = 'locmem'
+essas versões são locais ao comando, e páginas, facetas e estatísticas
+dos servidores só se atualizam pelo TTL depois da importação.
+"""
+import csv
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from . import cache_paginas, contadores
+from .estatisticas import invalidar_estatisticas
+
+
+class RegistroInvalido(ValueError):
+    """Linha que não pôde ser lida (JSON malformado, colunas a mais etc.)."""
+
+
+def erro(campo, mensagem, codigo):
+    """Erro no mesmo formato de form.errors.get_json_data()."""
+    return {campo: [{'message': mensagem, 'code': codigo}]}
+
+
+def detectar_formato(caminho, formato=None):
+    if formato:
+        return formato
+    sufixo = Path(caminho).suffix.lower()
+    if sufixo in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if sufixo == '.csv':
+        return 'csv'
+    raise ValueError(f'Formato não reconhecido para {caminho}; use --formato csv|jsonl.')
+
+
+def ler_registros(caminho, formato, delimitador=','):
+    """
+    Gera (numero, dados) para cada registro do arquivo, sem carregá-lo
+    inteiro. `dados` é um dict, ou uma exceção RegistroInvalido quando a
+    linha não pôde ser interpretada.
+    """
+    # utf-8-sig: planilhas exportadas pelo Excel começam com BOM
+    with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+        if formato == 'csv':
+            leitor = csv.DictReader(arquivo, delimiter=delimitador)
+            for numero, linha in enumerate(leitor, start=1):
+                if None in linha:
+                    yield numero, RegistroInvalido('Linha com mais colunas que o cabeçalho.')
+                else:
+                    yield numero, linha
+        else:
+            numero = 0
+            for linha in arquivo:
+                if not linha.strip():
+                    continue
+                numero += 1
+                try:
+                    dados = json.loads(linha)
+                except ValueError as exc:
+                    yield numero, RegistroInvalido(f'JSON inválido: {exc}')
+                    continue
+                if not isinstance(dados, dict):
+                    yield numero, RegistroInvalido('Cada linha deve ser um objeto JSON.')
+                else:
+                    yield numero, dados
+
+
+class Progresso:
+    """
+    Arquivo JSON com a posição da última transação confirmada, usado por
+    --retomar. Guarda o tamanho do arquivo de entrada para recusar a
+    retomada se ele tiver mudado.
+    """
+
+    def __init__(self, caminho_progresso, caminho_entrada):
+        self.caminho = Path(caminho_progresso)
+        self.entrada = Path(caminho_entrada)
+        self.registros = 0
+        self.importados = 0
+        self.rejeitados = 0
+
+    def carregar(self):
+        """Lê o progresso salvo; retorna False se não houver."""
+        if not self.caminho.exists():
+            return False
+        dados = json.loads(self.caminho.read_text())
+        if dados['tamanho'] != self.entrada.stat().st_size:
+            raise ValueError(f'{self.entrada} mudou desde a importação interrompida.')
+        self.registros = dados['registros']
+        self.importados = dados['importados']
+        self.rejeitados = dados['rejeitados']
+        return True
+
+    def salvar(self):
+        temporario = self.caminho.with_name(self.caminho.name + '.tmp')
+        temporario.write_text(json.dumps({
+            'entrada': str(self.entrada.resolve()),
+            'tamanho': self.entrada.stat().st_size,
+            'registros': self.registros,
+            'importados': self.importados,
+            'rejeitados': self.rejeitados,
+        }))
+        os.replace(temporario, self.caminho)
+
+    def concluir(self):
+        self.caminho.unlink(missing_ok=True)
+
+
+def contar_imoveis_inseridos(imoveis):
+    """Ajusta os contadores para imóveis inseridos com bulk_create."""
+    deltas = Counter()
+    for imovel in imoveis:
+        deltas.update(contadores.chaves_imovel(imovel.tipo, imovel.ativo))
+    contadores.ajustar(deltas)
+
+
+def inicializar_processo():
+    """Inicializador dos processos do pool de hashing (necessário com spawn, ex.: Windows)."""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+
+
+def hash_senhas(senhas):
+    """make_password para um lote de senhas (executado nos processos do pool)."""
+    return [make_password(senha) for senha in senhas]
+
+
+def invalidar_caches_imoveis():
+    """Invalida estatísticas e páginas públicas (com as facetas) após o commit."""
+    transaction.on_commit(invalidar_estatisticas)
+    transaction.on_commit(cache_paginas.invalidar)
+
+
+def invalidar_caches_clientes():
+    """Invalida as estatísticas do dashboard após o commit."""
+    transaction.on_commit(invalidar_estatisticas)
@@ -0,0 +1,53 @@
+"""
+Mantém a réplica de leitura (BANCO_REPLICA=1) em dia com o banco principal.
+
+Copia o banco com a API de backup do SQLite a cada --intervalo segundos,
+apenas quando houve gravações desde a última cópia. Deve rodar ao lado dos
+servidores, como um processo à parte.
+
+Uso:
+    python manage.py atualizar_replica               # contínuo
+    python manage.py atualizar_replica --uma-vez     # cria/atualiza e sai
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import replica
+
+
+class Command(BaseCommand):
+    help = 'Copia o banco principal para a réplica de leitura das páginas públicas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float,
+                            default=getattr(settings, 'REPLICA_INTERVALO', 30),
+                            help='Segundos entre as verificações.')
+        parser.add_argument('--uma-vez', action='store_true',
+                            help='Faz uma cópia e termina.')
+
+    def handle(self, *args, **options):
+        if not replica.configurada():
+            raise CommandError('Réplica desligada: defina BANCO_REPLICA=1.')
+
+        atualizador = replica.Atualizador()
+        try:
+            self._copiar(atualizador, forcar=True)
+            while not options['uma_vez']:
+                time.sleep(options['intervalo'])
+                self._copiar(atualizador)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            atualizador.fechar()
+
+    def _copiar(self, atualizador, forcar=False):
+        inicio = time.perf_counter()
+        catalogo_mudou = atualizador.atualizar(forcar)
+        if catalogo_mudou is None:
+            return
+        self.stdout.write(
+            f'Réplica atualizada em {(time.perf_counter() - inicio) * 1000:.0f} ms'
+            + (' (catálogo alterado, cache de páginas invalidado)' if catalogo_mudou else '')
+        )
@@ -0,0 +1,69 @@
+"""
+Compara as views assíncronas com as síncronas sob o mesmo uvicorn.
+
+Sobe o servidor duas vezes, com VIEWS_ASSINCRONAS=0 e =1 e o mesmo número de
+workers, e mede requisições/s e p50/p99 em home, listagem e dashboard. As
+requisições levam um cookie de sessão de cliente, então não são atendidas
+pelo cache de páginas.
+
+Uso:
+    python manage.py benchmark_async --workers 2 --conexoes 50 --duracao 10
+"""
+import asyncio
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark_http import ServidorUvicorn, carga
+from core.models import Cliente
+
+CAMINHOS = ['/', '/imoveis/', '/dashboard/']
+
+
+class Command(BaseCommand):
+    help = 'Mede rps e p99 das views síncronas e assíncronas com o mesmo uvicorn.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--conexoes', type=int, default=50)
+        parser.add_argument('--duracao', type=float, default=10.0, help='Segundos por variante.')
+        parser.add_argument('--porta', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        cliente = Cliente.objects.order_by('pk').first()
+        if cliente is None:
+            raise CommandError('Cadastre ao menos um cliente antes de rodar o benchmark.')
+
+        sessao = import_module(settings.SESSION_ENGINE).SessionStore()
+        sessao['cliente_id'] = cliente.pk
+        sessao['cliente_nome'] = cliente.nome
+        sessao.create()
+        cookie = {'Cookie': f'sessionid={sessao.session_key}'}
+
+        try:
+            for nome, valor in (('síncronas', '0'), ('assíncronas', '1')):
+                with ServidorUvicorn(options['porta'], options['workers'],
+                                     ambiente={'VIEWS_ASSINCRONAS': valor}):
+                    resultado = asyncio.run(carga(
+                        '127.0.0.1', options['porta'], CAMINHOS,
+                        conexoes=options['conexoes'], duracao=options['duracao'],
+                        cabecalhos=cookie,
+                    ))
+                self._relatar(nome, resultado)
+        finally:
+            sessao.delete()
+
+    def _relatar(self, nome, resultado):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Views {nome}: {resultado["rps"]:.1f} req/s, '
+            f'p50 {resultado["p50_ms"]:.1f} ms, p99 {resultado["p99_ms"]:.1f} ms, '
+            f'{resultado["erros"]} erros, status {resultado["status"]}'
+        ))
+        for caminho, medidas in resultado['por_caminho'].items():
+            if not medidas['requisicoes']:
+                continue
+            self.stdout.write(
+                f'  {caminho:<14} {medidas["requisicoes"]:>7} req  '
+                f'p50 {medidas["p50_ms"]:7.1f} ms  p99 {medidas["p99_ms"]:7.1f} ms'
+            )
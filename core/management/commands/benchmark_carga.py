@@ -0,0 +1,317 @@
+"""
+Teste de carga da implantação dupla: runserver no HTTP público e uvicorn
+com TLS (certs/server.crt) no HTTPS, como em produção.
+
+Sobe os dois servidores em subprocessos, garante um banco semeado (imóveis
+e um cliente de carga) e simula usuários virtuais que alternam entre os
+cenários da mistura (--mix), por --duracao segundos:
+
+    listagem         páginas públicas no HTTP (home, listagem, filtros, busca)
+    redirecionamento rota sensível no HTTP, redirecionada pelo ForceHTTPSSelective
+    login            GET do formulário e POST com CPF/senha no HTTPS
+    dashboard        dashboard no HTTPS com sessão (faz login antes, se preciso)
+    cadastro         cadastro de imóvel ou de cliente no HTTPS
+
+Reporta requisições/s e p50/p95/p99 por rota e grava o resultado em JSON
+(--saida); --comparar mostra a diferença para um resultado anterior. Os
+registros criados pelos cadastros são apagados ao final.
+
+Use um banco próprio para não misturar os dados de carga com os seus:
+    BANCO_ARQUIVO=carga.sqlite3 python manage.py migrate
+    BANCO_ARQUIVO=carga.sqlite3 python manage.py benchmark_carga --usuarios 32 --duracao 30 \
+        --saida carga.json
+"""
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from core import sinteticos
+from core.benchmark_http import (
+    Medidas, Navegador, ServidorRunserver, ServidorUvicorn, contexto_ssl_sem_verificacao,
+)
+from core.models import Cliente, Imovel
+
+MIX_PADRAO = 'listagem=60,redirecionamento=10,login=5,dashboard=15,cadastro=10'
+
+PAGINAS_PUBLICAS = [
+    '/',
+    '/imoveis/',
+    '/imoveis/?tipo=venda',
+    '/imoveis/?tipo=aluguel&preco_max=300000',
+    '/imoveis/busca/?q=casa',
+]
+ROTAS_SENSIVEIS = ['/login/', '/cadastroImovel/', '/cadastroCliente/']
+
+# Cliente usado nos logins e marcadores dos registros criados pela carga
+CPF_CARGA = '80000000000'
+SENHA_CARGA = 'carga-senha-2024'
+DOMINIO_CARGA = '@carga.invalid'
+PREFIXO_CADASTRO = '[benchmark_carga]'
+
+
+class Contexto:
+    """Estado compartilhado pelos usuários virtuais."""
+
+    def __init__(self):
+        self.sequencia = int(time.time() * 1000) % 10**9
+
+    def proximo(self):
+        self.sequencia += 1
+        return self.sequencia
+
+
+async def listagem(navegador, contexto, sorteio):
+    await navegador.pedir('http', 'GET', sorteio.choice(PAGINAS_PUBLICAS))
+
+
+async def redirecionamento(navegador, contexto, sorteio):
+    await navegador.pedir('http', 'GET', sorteio.choice(ROTAS_SENSIVEIS))
+
+
+async def login(navegador, contexto, sorteio):
+    token = await navegador.token_csrf('https', '/login/')
+    if token is None:
+        return
+    resultado = await navegador.pedir('https', 'POST', '/login/', {
+        'csrfmiddlewaretoken': token, 'cpf': CPF_CARGA, 'password': SENHA_CARGA,
+    })
+    navegador.logado = resultado is not None and resultado[0] == 302
+
+
+async def dashboard(navegador, contexto, sorteio):
+    if not getattr(navegador, 'logado', False):
+        await login(navegador, contexto, sorteio)
+    resultado = await navegador.pedir('https', 'GET', '/dashboard/')
+    if resultado is not None and resultado[0] == 302:
+        navegador.logado = False
+
+
+async def cadastro(navegador, contexto, sorteio):
+    numero = contexto.proximo()
+    if sorteio.random() < 0.75:
+        caminho = '/cadastroImovel/'
+        dados = {
+            'titulo': f'{PREFIXO_CADASTRO} Casa {numero}',
+            'tipo': sorteio.choice(['venda', 'aluguel']),
+            'preco': str(sorteio.randint(1_000, 2_000_000)),
+            'endereco': f'Rua da Carga, {numero}',
+            'descricao': 'Cadastrado pelo teste de carga.',
+        }
+    else:
+        caminho = '/cadastroCliente/'
+        dados = {
+            'nome': f'Cliente de Carga {numero}',
+            'email': f'cliente{numero}{DOMINIO_CARGA}',
+            'telefone': '31999990000',
+            'cpf': f'9{numero:010d}',
+            'senha': SENHA_CARGA,
+            'confirmar_senha': SENHA_CARGA,
+            'observacoes': '',
+        }
+    token = await navegador.token_csrf('https', caminho)
+    if token is not None:
+        await navegador.pedir('https', 'POST', caminho, {'csrfmiddlewaretoken': token, **dados})
+
+
+CENARIOS = {
+    'listagem': listagem,
+    'redirecionamento': redirecionamento,
+    'login': login,
+    'dashboard': dashboard,
+    'cadastro': cadastro,
+}
+
+
+def ler_mix(texto):
+    """'listagem=60,login=5' -> {'listagem': 60, 'login': 5}"""
+    mix = {}
+    for parte in filter(None, texto.split(',')):
+        nome, _, peso = parte.partition('=')
+        nome = nome.strip()
+        if nome not in CENARIOS:
+            raise CommandError(f'Cenário desconhecido: {nome}. Opções: {", ".join(CENARIOS)}.')
+        try:
+            mix[nome] = float(peso or 1)
+        except ValueError:
+            raise CommandError(f'Peso inválido para {nome}: {peso!r}.')
+    if not mix or sum(mix.values()) <= 0:
+        raise CommandError('A mistura precisa de ao menos um cenário com peso positivo.')
+    return mix
+
+
+class Command(BaseCommand):
+    help = 'Carga mista contra runserver (HTTP) + uvicorn com TLS (HTTPS), com resultado em JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=32, help='Usuários virtuais simultâneos.')
+        parser.add_argument('--duracao', type=float, default=20.0, help='Segundos medidos.')
+        parser.add_argument('--aquecimento', type=float, default=3.0,
+                            help='Segundos iniciais fora das medidas.')
+        parser.add_argument('--mix', default=MIX_PADRAO, help=f'Pesos dos cenários (padrão: {MIX_PADRAO}).')
+        parser.add_argument('--imoveis', type=int, default=2_000,
+                            help='Mínimo de imóveis no banco; completa se faltar.')
+        parser.add_argument('--workers', type=int, default=1, help='Workers do uvicorn.')
+        parser.add_argument('--porta-http', type=int, default=18080)
+        parser.add_argument('--porta-https', type=int, default=18443)
+        parser.add_argument('--certificados', default=None,
+                            help='Pasta com server.crt e server.key (padrão: certs/).')
+        parser.add_argument('--semente', type=int, default=1, help='Semente dos sorteios.')
+        parser.add_argument('--saida', help='Arquivo JSON com o resultado.')
+        parser.add_argument('--comparar', help='Resultado JSON anterior para comparação.')
+
+    def handle(self, *args, **options):
+        mix = ler_mix(options['mix'])
+        certs = Path(options['certificados'] or Path(settings.BASE_DIR) / 'certs')
+        if not (certs / 'server.crt').exists() or not (certs / 'server.key').exists():
+            raise CommandError(f'Certificados não encontrados em {certs}; rode gerar_certificados.py.')
+
+        self._semear(options['imoveis'])
+        ambiente = {
+            'HTTP_PORTA': str(options['porta_http']),
+            'HTTPS_PORTA': str(options['porta_https']),
+        }
+        self.stdout.write(
+            f'Subindo runserver :{options["porta_http"]} e uvicorn :{options["porta_https"]} '
+            f'({options["workers"]} worker(s))...'
+        )
+        try:
+            with ServidorRunserver(options['porta_http'], ambiente), \
+                    ServidorUvicorn(options['porta_https'], options['workers'], ambiente,
+                                    ssl=True, certs=certs):
+                resumo = asyncio.run(self._carga(mix, options))
+        finally:
+            self._limpar()
+
+        resultado = self._resultado(mix, options, resumo)
+        self._relatar(resultado)
+        if options['comparar']:
+            self._comparar(resultado, json.loads(Path(options['comparar']).read_text()))
+        if options['saida']:
+            Path(options['saida']).write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+            self.stdout.write(self.style.SUCCESS(f'Resultado gravado em {options["saida"]}.'))
+
+    def _semear(self, minimo):
+        """Completa o catálogo até `minimo` imóveis e cria o cliente de carga."""
+        faltam = minimo - Imovel.objects.count()
+        if faltam > 0:
+            self.stdout.write(f'Semeando {faltam} imóveis...')
+            sinteticos.popular_imoveis(faltam)
+
+        if not Cliente.objects.filter(cpf=CPF_CARGA).exists():
+            cliente = Cliente(nome='Cliente de Carga', email=f'carga{DOMINIO_CARGA}',
+                              telefone='31999990000', cpf=CPF_CARGA)
+            cliente.senha = make_password(SENHA_CARGA)
+            cliente.save()
+
+    def _limpar(self):
+        imoveis = Imovel.objects.filter(titulo__startswith=PREFIXO_CADASTRO).delete()[0]
+        clientes = (
+            Cliente.objects.filter(email__endswith=DOMINIO_CARGA).exclude(cpf=CPF_CARGA).delete()[0]
+        )
+        self.stdout.write(f'Cadastros da carga apagados: {imoveis} imóveis, {clientes} clientes.')
+
+    async def _carga(self, mix, options):
+        contexto_ssl = contexto_ssl_sem_verificacao()
+        origens = {
+            'http': ('127.0.0.1', options['porta_http'], None),
+            'https': ('127.0.0.1', options['porta_https'], contexto_ssl),
+        }
+        medidas = Medidas(time.perf_counter() + options['aquecimento'])
+        fim = medidas.inicio + options['duracao']
+        contexto = Contexto()
+        nomes, pesos = list(mix), list(mix.values())
+
+        async def usuario(indice):
+            sorteio = random.Random(options['semente'] * 100_003 + indice)
+            navegador = Navegador(origens, medidas)
+            try:
+                while time.perf_counter() < fim:
+                    cenario = CENARIOS[sorteio.choices(nomes, pesos)[0]]
+                    await cenario(navegador, contexto, sorteio)
+            finally:
+                navegador.fechar()
+
+        await asyncio.gather(*(usuario(i) for i in range(options['usuarios'])))
+        return medidas.resumo(options['duracao'])
+
+    @staticmethod
+    def _resultado(mix, options, resumo):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'parametros': {
+                'usuarios': options['usuarios'],
+                'duracao': options['duracao'],
+                'aquecimento': options['aquecimento'],
+                'mix': mix,
+                'workers': options['workers'],
+                'imoveis': Imovel.objects.count(),
+                'views_assincronas': settings.VIEWS_ASSINCRONAS,
+            },
+            'ambiente': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'plataforma': platform.platform(),
+                'cpus': os.cpu_count(),
+            },
+            'resultado': resumo,
+        }
+
+    def _relatar(self, resultado):
+        total = resultado['resultado']
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{total["requisicoes"]} requisições, {total["rps"]:.1f} req/s, '
+            f'p50 {_ms(total["p50_ms"])} p95 {_ms(total["p95_ms"])} p99 {_ms(total["p99_ms"])}, '
+            f'{total["erros"]} erros'
+        ))
+        self.stdout.write(f'  {"rota":<32} {"req/s":>8} {"p50":>9} {"p95":>9} {"p99":>9}  status')
+        for rota, dados in total['por_rota'].items():
+            status = ' '.join(f'{codigo}:{n}' for codigo, n in sorted(dados['status'].items()))
+            if dados['erros']:
+                status += f' erros:{dados["erros"]}'
+            self.stdout.write(
+                f'  {rota:<32} {dados["rps"]:8.1f} {_ms(dados["p50_ms"])} '
+                f'{_ms(dados["p95_ms"])} {_ms(dados["p99_ms"])}  {status}'
+            )
+
+    def _comparar(self, atual, anterior):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Comparação com {anterior.get("commit") or "?"} ({anterior.get("data", "?")})'
+        ))
+        rotas_anteriores = anterior['resultado']['por_rota']
+        for rota, dados in atual['resultado']['por_rota'].items():
+            antes = rotas_anteriores.get(rota)
+            if antes is None:
+                continue
+            self.stdout.write(
+                f'  {rota:<32} req/s {_variacao(antes["rps"], dados["rps"])}  '
+                f'p99 {_variacao(antes["p99_ms"], dados["p99_ms"])}'
+            )
+
+
+def _ms(valor):
+    return f'{valor:7.1f}ms' if valor is not None else f'{"-":>9}'
+
+
+def _variacao(antes, depois):
+    if not antes or depois is None:
+        return f'{"-":>8}'
+    return f'{(depois - antes) / antes * 100:+7.1f}%'
@@ -0,0 +1,106 @@
+"""
+Mede inserções de Imovel por segundo com 1, 16 e 64 escritores
+concorrentes, cada um gravando a sua transação (como o CreateView padrão)
+e pelo grupo de gravações (core.gravacao).
+
+Cada escritor é uma thread com a sua conexão, gravando Imovel.save() com
+os sinais (contadores, versão do catálogo) como no cadastro. Roda no banco
+configurado; os imóveis criados são apagados ao final.
+
+Uso:
+    python manage.py benchmark_gravacao --escritores 1 16 64 --duracao 5
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from core.benchmark_http import percentil
+from core.gravacao import GrupoGravacao
+from core.models import Imovel
+
+PREFIXO = '[benchmark_gravacao]'
+
+
+class Command(BaseCommand):
+    help = 'Inserções/s sob contenção: uma transação por cadastro x gravação em grupo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escritores', type=int, nargs='+', default=[1, 16, 64])
+        parser.add_argument('--duracao', type=float, default=5.0, help='Segundos por medição.')
+        parser.add_argument('--janela-ms', type=float,
+                            default=getattr(settings, 'GRAVACAO_JANELA_MS', 2))
+
+    def handle(self, *args, **options):
+        try:
+            for escritores in options['escritores']:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{escritores} escritor(es)'))
+                self._relatar('uma transação cada', self._rodar(escritores, options['duracao'], None))
+                grupo = GrupoGravacao(
+                    options['janela_ms'],
+                    getattr(settings, 'GRAVACAO_LOTE_MAXIMO', 64),
+                    getattr(settings, 'GRAVACAO_PRAZO', 10),
+                )
+                resultado = self._rodar(escritores, options['duracao'], grupo)
+                self._relatar('em grupo', resultado, grupo.metricas())
+        finally:
+            apagados = Imovel.objects.filter(titulo__startswith=PREFIXO).delete()[0]
+            self.stdout.write(f'{apagados} imóveis de teste apagados.')
+
+    @staticmethod
+    def _rodar(escritores, duracao, grupo):
+        fim = time.perf_counter() + duracao
+        tempos = []
+        erros = [0]
+        lock = threading.Lock()
+
+        def escritor(numero):
+            locais, falhas, i = [], 0, 0
+            try:
+                while time.perf_counter() < fim:
+                    imovel = Imovel(
+                        titulo=f'{PREFIXO} {numero}-{i}', tipo='venda', preco=100_000 + i,
+                        endereco='Rua do Teste, 1', descricao='Gravado pelo benchmark.',
+                    )
+                    i += 1
+                    inicio = time.perf_counter()
+                    try:
+                        if grupo is None:
+                            imovel.save()
+                        else:
+                            grupo.gravar(imovel.save)
+                    except OperationalError:
+                        # database is locked
+                        falhas += 1
+                        continue
+                    locais.append((time.perf_counter() - inicio) * 1000)
+            finally:
+                connection.close()
+            with lock:
+                tempos.extend(locais)
+                erros[0] += falhas
+
+        threads = [threading.Thread(target=escritor, args=(n,)) for n in range(escritores)]
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {
+            'por_segundo': len(tempos) / (time.perf_counter() - inicio),
+            'p50_ms': percentil(tempos, 50) or 0,
+            'p99_ms': percentil(tempos, 99) or 0,
+            'erros': erros[0],
+        }
+
+    def _relatar(self, nome, resultado, metricas=None):
+        linha = (
+            f'  {nome:<20} {resultado["por_segundo"]:8.1f} inserções/s  '
+            f'p50 {resultado["p50_ms"]:7.2f} ms  p99 {resultado["p99_ms"]:8.2f} ms  '
+            f'{resultado["erros"]} erros'
+        )
+        if metricas:
+            linha += f'  (lote médio {metricas["lote_medio"]:.1f}, maior {metricas["maior_lote"]})'
+        self.stdout.write(linha)
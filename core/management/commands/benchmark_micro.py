@@ -0,0 +1,119 @@
+"""
+Micro-benchmarks do ORM e das views (core.microbench) com verificação de
+regressão contra a base versionada em core/microbench_base.json.
+
+Roda num banco de teste temporário, criado com as migrações e populado com
+1k, 100k e 1M imóveis (em ordem, completando o anterior). Falha (código de
+saída 1) se algum caminho fizer mais consultas que a base, ou se tempo ou
+pico de alocação passarem dos limites.
+
+Uso:
+    python manage.py benchmark_micro
+    python manage.py benchmark_micro --tamanhos 1000 100000 --apenas listagem auth
+    python manage.py benchmark_micro --gravar-base
+"""
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from core import microbench
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmarks de listagem, dashboard, autenticação e middleware, com base de regressão.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanhos', type=int, nargs='+', default=microbench.TAMANHOS,
+                            help='Imóveis no catálogo de teste.')
+        parser.add_argument('--apenas', nargs='+', default=[],
+                            help='Prefixos dos benchmarks a rodar (ex.: listagem auth.get_user).')
+        parser.add_argument('--tempo-minimo', type=float, default=0.5,
+                            help='Segundos medidos por benchmark, no mínimo.')
+        parser.add_argument('--repeticoes', type=int, default=5,
+                            help='Repetições medidas por benchmark, no mínimo.')
+        parser.add_argument('--limite-tempo', type=float, default=0.25,
+                            help='Aumento de tempo tolerado (0.25 = +25%%).')
+        parser.add_argument('--limite-alocacao', type=float, default=0.10,
+                            help='Aumento do pico de alocação tolerado (0.10 = +10%%).')
+        parser.add_argument('--base', default=str(microbench.BASE))
+        parser.add_argument('--gravar-base', action='store_true',
+                            help='Grava os resultados como nova base em vez de comparar.')
+
+    def handle(self, *args, **options):
+        benchmarks = [
+            benchmark for benchmark in microbench.REGISTRO
+            if not options['apenas'] or benchmark.nome.startswith(tuple(options['apenas']))
+        ]
+        if not benchmarks:
+            raise CommandError('Nenhum benchmark corresponde a --apenas.')
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            # Banco de teste em arquivo, como em produção (WAL, mmap)
+            connection.settings_dict['TEST']['NAME'] = str(Path(diretorio) / 'microbench.sqlite3')
+            nome_original = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                # DEBUG guardaria cada consulta em connection.queries
+                with override_settings(DEBUG=False):
+                    resultados = self._rodar(benchmarks, sorted(options['tamanhos']), options)
+            finally:
+                connection.creation.destroy_test_db(nome_original, verbosity=0)
+
+        if options['gravar_base']:
+            # Mantém na base os benchmarks que não rodaram desta vez
+            base = microbench.carregar_base(options['base'])
+            base.update(resultados)
+            microbench.gravar_base(base, options['base'])
+            self.stdout.write(self.style.SUCCESS(f'Base gravada em {options["base"]}.'))
+            return
+
+        base = microbench.carregar_base(options['base'])
+        if not base:
+            self.stdout.write(self.style.WARNING('Sem base para comparar; use --gravar-base.'))
+            return
+        regressoes = microbench.comparar(
+            resultados, base, options['limite_tempo'], options['limite_alocacao']
+        )
+        if regressoes:
+            for regressao in regressoes:
+                self.stderr.write(self.style.ERROR(f'  {regressao}'))
+            raise CommandError(f'{len(regressoes)} regressão(ões) em relação à base.')
+        self.stdout.write(self.style.SUCCESS('Nenhuma regressão em relação à base.'))
+
+    def _rodar(self, benchmarks, tamanhos, options):
+        base = microbench.carregar_base(options['base'])
+        resultados = {}
+        fixos = [benchmark for benchmark in benchmarks if not benchmark.por_tamanho]
+        for tamanho in tamanhos:
+            self.stdout.write(f'Populando o banco de teste até {tamanho} imóveis...')
+            microbench.popular(tamanho)
+            contexto = microbench.Contexto()
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{tamanho} imóveis'))
+            for benchmark in benchmarks:
+                if benchmark.por_tamanho:
+                    chave = microbench.chave(benchmark.nome, tamanho)
+                    resultados[chave] = self._medir(benchmark, contexto, chave, base, options)
+            if fixos:
+                # Os que não dependem do catálogo rodam uma vez, no menor tamanho
+                self.stdout.write(self.style.MIGRATE_HEADING('Independentes do catálogo'))
+                for benchmark in fixos:
+                    resultados[benchmark.nome] = self._medir(benchmark, contexto, benchmark.nome, base, options)
+                fixos = []
+        return resultados
+
+    def _medir(self, benchmark, contexto, chave, base, options):
+        resultado = microbench.medir(
+            benchmark.preparar(contexto), benchmark.operacoes,
+            options['tempo_minimo'], options['repeticoes'],
+        )
+        linha = (
+            f'  {benchmark.nome:<34} {resultado["tempo_us"]:12.2f} µs  '
+            f'{resultado["consultas"]:6g} consultas  pico {resultado["pico_kb"]:9.1f} KB'
+        )
+        anterior = base.get(chave)
+        if anterior and anterior['tempo_us']:
+            linha += f'  ({(resultado["tempo_us"] / anterior["tempo_us"] - 1) * 100:+.0f}% tempo)'
+        self.stdout.write(linha)
+        return resultado
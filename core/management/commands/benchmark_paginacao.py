@@ -0,0 +1,86 @@
+"""
+Compara a paginação por cursor com a paginação por OFFSET na listagem pública.
+
+Uso:
+    python manage.py benchmark_paginacao --linhas 200020 --pagina 10000
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Imovel
+from core.paginacao import PaginadorCursor, codificar_cursor
+
+
+class Command(BaseCommand):
+    help = 'Mede a latência da página 1 e da página N com cursor e com OFFSET.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=200_020,
+                            help='Imóveis temporários inseridos para o teste.')
+        parser.add_argument('--por-pagina', type=int, default=20)
+        parser.add_argument('--pagina', type=int, default=10_000,
+                            help='Página profunda a ser comparada com a primeira.')
+        parser.add_argument('--repeticoes', type=int, default=20)
+
+    def handle(self, *args, **options):
+        por_pagina = options['por_pagina']
+        pagina = options['pagina']
+        repeticoes = options['repeticoes']
+
+        # Os dados de teste são descartados ao final (rollback).
+        with transaction.atomic():
+            self._popular(options['linhas'])
+            base = Imovel.objects.filter(ativo=True)
+            paginador = PaginadorCursor(base, por_pagina=por_pagina)
+
+            deslocamento = (pagina - 1) * por_pagina
+            ancora = base.order_by('-data_cadastro', '-id')[deslocamento - 1:deslocamento].first()
+            if ancora is None:
+                self.stderr.write(self.style.ERROR('Linhas insuficientes para a página pedida.'))
+                transaction.set_rollback(True)
+                return
+            cursor = codificar_cursor(ancora.data_cadastro, ancora.pk, 'proxima')
+
+            def offset(n):
+                inicio = (n - 1) * por_pagina
+                return list(base.order_by('-data_cadastro', '-id')[inicio:inicio + por_pagina])
+
+            resultados = [
+                ('cursor  página 1', lambda: list(paginador.pagina())),
+                (f'cursor  página {pagina}', lambda: list(paginador.pagina(cursor))),
+                ('offset  página 1', lambda: offset(1)),
+                (f'offset  página {pagina}', lambda: offset(pagina)),
+            ]
+            for nome, funcao in resultados:
+                mediana = self._medir(funcao, repeticoes)
+                self.stdout.write(f'{nome:<24} {mediana:8.3f} ms (mediana de {repeticoes})')
+
+            transaction.set_rollback(True)
+
+    def _popular(self, linhas):
+        self.stdout.write(f'Inserindo {linhas} imóveis temporários...')
+        lote = [
+            Imovel(
+                titulo=f'Imóvel {i}',
+                tipo='venda' if i % 2 else 'aluguel',
+                preco=100_000 + i,
+                endereco=f'Rua {i}, Centro',
+                descricao='Imóvel gerado para benchmark.',
+                ativo=True,
+            )
+            for i in range(linhas)
+        ]
+        Imovel.objects.bulk_create(lote, batch_size=5_000)
+
+    @staticmethod
+    def _medir(funcao, repeticoes):
+        funcao()  # aquecimento
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tempos)
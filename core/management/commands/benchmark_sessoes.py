@@ -0,0 +1,111 @@
+"""
+Mede o custo da sessão por requisição com a engine do banco e com a
+configurada em SESSION_ENGINE (core.sessoes).
+
+Cada requisição passa pelo SessionMiddleware com o cookie de uma das
+sessões de teste, como em home/dashboard (leitura de cliente_id), no
+login (três chaves + set_expiry) e num login repetido com os mesmos dados.
+Reporta a mediana em µs e as consultas SQL por requisição.
+
+Uso:
+    python manage.py benchmark_sessoes --sessoes 500 --requisicoes 5000
+"""
+import statistics
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+ENGINE_BANCO = 'django.contrib.sessions.backends.db'
+
+
+def _leitura(request):
+    request.session.get('cliente_id')
+    return HttpResponse()
+
+
+def _login(request, sufixo=''):
+    request.session['cliente_id'] = 1
+    request.session['cliente_nome'] = f'Cliente{sufixo}'
+    request.session['cliente_cpf'] = '00000000000'
+    request.session.set_expiry(86400)
+    return HttpResponse()
+
+
+class Command(BaseCommand):
+    help = 'Compara o custo da sessão por requisição: engine do banco x SESSION_ENGINE.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessoes', type=int, default=500,
+                            help='Sessões distintas usadas em rodízio.')
+        parser.add_argument('--requisicoes', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        engines = [ENGINE_BANCO]
+        if settings.SESSION_ENGINE != ENGINE_BANCO:
+            engines.append(settings.SESSION_ENGINE)
+
+        cenarios = [
+            ('leitura', _leitura),
+            ('login (dados novos)', lambda request: _login(request, sufixo=time.perf_counter_ns())),
+            ('login (mesmos dados)', _login),
+        ]
+        for engine in engines:
+            self.stdout.write(self.style.MIGRATE_HEADING(engine))
+            with override_settings(SESSION_ENGINE=engine):
+                chaves = self._criar_sessoes(options['sessoes'])
+                try:
+                    for nome, view in cenarios:
+                        mediana, consultas = self._medir(view, chaves, options['requisicoes'])
+                        self.stdout.write(
+                            f'  {nome:<22} {mediana:8.1f} µs/req  {consultas:5.2f} consultas/req'
+                        )
+                finally:
+                    self._apagar_sessoes(chaves)
+
+    @staticmethod
+    def _criar_sessoes(quantidade):
+        SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+        chaves = []
+        for _ in range(quantidade):
+            sessao = SessionStore()
+            sessao['cliente_id'] = 1
+            sessao['cliente_nome'] = 'Cliente'
+            sessao['cliente_cpf'] = '00000000000'
+            sessao.set_expiry(86400)
+            sessao.create()
+            chaves.append(sessao.session_key)
+        return chaves
+
+    @staticmethod
+    def _apagar_sessoes(chaves):
+        SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+        for chave in chaves:
+            SessionStore(chave).delete()
+
+    @staticmethod
+    def _medir(view, chaves, requisicoes):
+        middleware = SessionMiddleware(view)
+        fabrica = RequestFactory()
+        tempos = []
+        consultas = 0
+
+        def contar(execute, sql, params, many, context):
+            nonlocal consultas
+            consultas += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(contar):
+            for i in range(requisicoes):
+                request = fabrica.get('/')
+                request.COOKIES[settings.SESSION_COOKIE_NAME] = chaves[i % len(chaves)]
+                inicio = time.perf_counter()
+                middleware(request)
+                tempos.append((time.perf_counter() - inicio) * 1_000_000)
+        return statistics.median(tempos), consultas / requisicoes
@@ -0,0 +1,163 @@
+"""
+Mede quantas leituras e escritas por segundo um arquivo SQLite aguenta com
+leitores e escritores concorrentes, no perfil padrão e no de produção
+(SQLITE_PRAGMAS, BEGIN IMMEDIATE e conexões reaproveitadas).
+
+Roda num arquivo temporário com uma tabela no formato de core_imovel, sem
+tocar no banco do projeto. As leituras são a consulta da listagem (20
+imóveis de um tipo) e as escritas, uma transação com um INSERT e um
+UPDATE, como num cadastro seguido do ajuste de contador.
+
+No perfil padrão cada operação abre uma conexão, como uma requisição sem
+CONN_MAX_AGE; no de produção cada thread mantém a sua, como os workers de
+um servidor WSGI de produção. O runserver e o uvicorn desta instalação
+abrem uma conexão por requisição: para eles vale o ganho dos PRAGMAs e do
+BEGIN IMMEDIATE, não o do reaproveitamento.
+
+Uso:
+    python manage.py benchmark_sqlite --leitores 8 --escritores 2 --duracao 10
+"""
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.benchmark_http import percentil
+
+# Mesmo timeout padrão do backend sqlite3 do Django (s)
+TIMEOUT = 5
+
+LEITURA = (
+    'SELECT id, titulo, tipo, preco, data_cadastro FROM imovel '
+    'WHERE ativo = 1 AND tipo = ? ORDER BY data_cadastro DESC, id DESC LIMIT 20'
+)
+INSERCAO = 'INSERT INTO imovel (titulo, tipo, preco, ativo, data_cadastro) VALUES (?, ?, ?, 1, ?)'
+CONTADOR = 'UPDATE contador SET valor = valor + 1 WHERE chave = ?'
+
+
+class Perfil:
+    def __init__(self, nome, pragmas, inicio_escrita, persistente):
+        self.nome = nome
+        self.pragmas = pragmas
+        self.inicio_escrita = inicio_escrita
+        self.persistente = persistente
+
+    def conectar(self, caminho):
+        conexao = sqlite3.connect(caminho, timeout=TIMEOUT, isolation_level=None,
+                                  check_same_thread=False)
+        for nome, valor in self.pragmas.items():
+            conexao.execute(f'PRAGMA {nome}={valor}')
+        return conexao
+
+
+PERFIS = [
+    Perfil('padrão', {'journal_mode': 'DELETE'}, 'BEGIN', persistente=False),
+    Perfil('produção', getattr(settings, 'SQLITE_PRAGMAS', {}), 'BEGIN IMMEDIATE', persistente=True),
+]
+
+
+class Command(BaseCommand):
+    help = 'Leituras/escritas por segundo do SQLite sob concorrência: perfil padrão x produção.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--leitores', type=int, default=8)
+        parser.add_argument('--escritores', type=int, default=2)
+        parser.add_argument('--duracao', type=float, default=10.0, help='Segundos por perfil.')
+        parser.add_argument('--linhas', type=int, default=50_000,
+                            help='Imóveis no arquivo de teste.')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as diretorio:
+            for perfil in PERFIS:
+                caminho = str(Path(diretorio) / f'{perfil.nome}.sqlite3')
+                self._preparar(perfil, caminho, options['linhas'])
+                resultado = self._rodar(perfil, caminho, options)
+                self._relatar(perfil, resultado, options['duracao'])
+
+    @staticmethod
+    def _preparar(perfil, caminho, linhas):
+        conexao = perfil.conectar(caminho)
+        conexao.executescript('''
+            CREATE TABLE imovel (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                titulo TEXT NOT NULL, tipo TEXT NOT NULL, preco DECIMAL NOT NULL,
+                ativo BOOL NOT NULL, data_cadastro TEXT NOT NULL
+            );
+            CREATE INDEX imovel_listagem ON imovel (ativo, tipo, data_cadastro, id);
+            CREATE TABLE contador (chave TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+            INSERT INTO contador VALUES ('imoveis_total', 0);
+        ''')
+        conexao.execute('BEGIN')
+        conexao.executemany(INSERCAO, (
+            (f'Imóvel {i}', 'venda' if i % 2 else 'aluguel', 100_000 + i, f'2025-01-01T00:00:{i:09d}')
+            for i in range(linhas)
+        ))
+        conexao.execute('COMMIT')
+        conexao.close()
+
+    def _rodar(self, perfil, caminho, options):
+        fim = time.perf_counter() + options['duracao']
+        resultados = {'leitura': ([], [0]), 'escrita': ([], [0])}
+        lock = threading.Lock()
+
+        def trabalhador(tipo, operacao):
+            tempos, erros = [], 0
+            conexao = perfil.conectar(caminho) if perfil.persistente else None
+            sorteio = random.Random()
+            while time.perf_counter() < fim:
+                inicio = time.perf_counter()
+                atual = conexao or perfil.conectar(caminho)
+                try:
+                    operacao(atual, sorteio)
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+                except sqlite3.OperationalError:
+                    # "database is locked": o escritor não conseguiu o lock a tempo
+                    erros += 1
+                    if atual.in_transaction:
+                        atual.execute('ROLLBACK')
+                finally:
+                    if conexao is None:
+                        atual.close()
+            if conexao is not None:
+                conexao.close()
+            with lock:
+                resultados[tipo][0].extend(tempos)
+                resultados[tipo][1][0] += erros
+
+        def ler(conexao, sorteio):
+            conexao.execute(LEITURA, (sorteio.choice(('venda', 'aluguel')),)).fetchall()
+
+        def escrever(conexao, sorteio):
+            conexao.execute(perfil.inicio_escrita)
+            # Leitura antes da escrita, como o ORM faz ao validar e salvar
+            conexao.execute('SELECT valor FROM contador WHERE chave = ?', ('imoveis_total',)).fetchone()
+            conexao.execute(INSERCAO, ('Novo imóvel', 'venda', sorteio.randint(1, 10**6), '2026-01-01T00:00:00'))
+            conexao.execute(CONTADOR, ('imoveis_total',))
+            conexao.execute('COMMIT')
+
+        threads = [
+            threading.Thread(target=trabalhador, args=('leitura', ler))
+            for _ in range(options['leitores'])
+        ] + [
+            threading.Thread(target=trabalhador, args=('escrita', escrever))
+            for _ in range(options['escritores'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return resultados
+
+    def _relatar(self, perfil, resultados, duracao):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Perfil {perfil.nome}'))
+        for tipo, (tempos, erros) in resultados.items():
+            self.stdout.write(
+                f'  {tipo:<8} {len(tempos) / duracao:9.1f} op/s  '
+                f'p50 {percentil(tempos, 50) or 0:7.2f} ms  p99 {percentil(tempos, 99) or 0:7.2f} ms  '
+                f'{erros[0]} erros (database is locked)'
+            )
@@ -0,0 +1,56 @@
+"""
+Exporta imóveis ou clientes em CSV ou JSONL, em streaming.
+
+As linhas são lidas do banco em lotes (--lote) e gravadas em blocos, com
+memória constante independentemente do número de linhas.
+
+Uso:
+    python manage.py exportar imoveis --formato csv --saida imoveis.csv
+    python manage.py exportar clientes --formato jsonl > clientes.jsonl
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import exportacao
+from core.models import Cliente, Imovel
+
+MODELOS = {'imoveis': Imovel, 'clientes': Cliente}
+
+
+class Command(BaseCommand):
+    help = 'Exporta imóveis ou clientes em CSV/JSONL com cursor em lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modelo', choices=sorted(MODELOS))
+        parser.add_argument('--formato', choices=sorted(exportacao.FORMATOS), default='csv')
+        parser.add_argument('--saida', help='Arquivo de destino (padrão: saída padrão).')
+        parser.add_argument('--lote', type=int, default=exportacao.TAMANHO_LOTE,
+                            help='Linhas lidas do banco por vez.')
+        parser.add_argument('--apenas-ativos', action='store_true',
+                            help='Só imóveis ativos (ignorado para clientes).')
+
+    def handle(self, *args, **options):
+        modelo = MODELOS[options['modelo']]
+        queryset = modelo.objects.order_by('pk')
+        if options['apenas_ativos'] and modelo is Imovel:
+            queryset = queryset.filter(ativo=True)
+
+        blocos = exportacao.gerar(queryset, options['formato'], chunk_size=options['lote'])
+        inicio = time.perf_counter()
+        total = 0
+        destino = open(options['saida'], 'wb') if options['saida'] else sys.stdout.buffer
+        try:
+            for bloco in blocos:
+                destino.write(bloco)
+                total += len(bloco)
+        finally:
+            if options['saida']:
+                destino.close()
+            else:
+                destino.flush()
+
+        self.stderr.write(self.style.SUCCESS(
+            f'{total / 1e6:.1f} MB exportados em {time.perf_counter() - inicio:.1f}s.'
+        ))
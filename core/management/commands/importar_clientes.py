@@ -0,0 +1,221 @@
+"""
+Importa clientes em massa de um arquivo CSV ou JSONL.
+
+Os registros são validados pelas regras do ClienteForm (CPF normalizado
+como em clean_cpf). A unicidade do CPF é verificada em lote, antes do
+hashing: uma consulta por bloco contra o banco e um conjunto para as
+repetições dentro do bloco. As senhas são passadas por make_password em um
+pool de processos (um por núcleo, por padrão), e os clientes são gravados
+com bulk_create, uma transação por bloco, com retomada como em
+importar_imoveis.
+
+Colunas/chaves: nome, email, telefone, cpf, senha, observacoes.
+
+Uso:
+    python manage.py importar_clientes clientes.csv --processos 8
+    python manage.py importar_clientes clientes.jsonl --rejeitados erros.jsonl --retomar
+"""
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from core import contadores, importacao
+from core.forms import ClienteForm
+from core.importacao import RegistroInvalido
+from core.models import Cliente
+
+# CPFs por consulta de unicidade (abaixo do limite de parâmetros do SQLite)
+LOTE_CPFS = 900
+
+
+class FormImportacao(ClienteForm):
+    """
+    ClienteForm reaproveitado entre registros (ver importar_imoveis). A
+    unicidade do CPF é verificada em lote pelo comando, não por linha.
+    """
+
+    def validar(self, dados):
+        dados = dict(dados)
+        dados.setdefault('confirmar_senha', dados.get('senha'))
+        self.data = dados
+        self.is_bound = True
+        self.instance = Cliente()
+        self._errors = None
+        self._bound_fields_cache = {}
+        return self.is_valid()
+
+    def validate_unique(self):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Importa clientes de CSV/JSONL, com hashing de senhas em vários processos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo')
+        parser.add_argument('--formato', choices=['csv', 'jsonl'],
+                            help='Padrão: pela extensão do arquivo.')
+        parser.add_argument('--delimitador', default=',', help='Separador do CSV.')
+        parser.add_argument('--processos', type=int, default=os.cpu_count() or 1,
+                            help='Processos de hashing (padrão: número de núcleos).')
+        parser.add_argument('--lote', type=int, default=None,
+                            help='Linhas por INSERT (padrão: o máximo do banco).')
+        parser.add_argument('--transacao', type=int, default=5_000,
+                            help='Registros por transação (e por ponto de retomada).')
+        parser.add_argument('--retomar', action='store_true',
+                            help='Continua a partir do arquivo de progresso.')
+        parser.add_argument('--progresso', help='Padrão: <arquivo>.progresso')
+        parser.add_argument('--rejeitados', help='Grava os registros rejeitados (JSONL).')
+
+    def handle(self, *args, **options):
+        arquivo = options['arquivo']
+        processos = max(1, options['processos'])
+        try:
+            formato = importacao.detectar_formato(arquivo, options['formato'])
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        progresso = importacao.Progresso(options['progresso'] or f'{arquivo}.progresso', arquivo)
+        if options['retomar']:
+            try:
+                if progresso.carregar():
+                    self.stdout.write(f'Retomando após o registro {progresso.registros}.')
+            except ValueError as exc:
+                raise CommandError(exc)
+        elif progresso.caminho.exists():
+            raise CommandError(
+                f'Há uma importação interrompida ({progresso.caminho}). '
+                'Use --retomar ou apague o arquivo de progresso.'
+            )
+
+        rejeitados = None
+        if options['rejeitados']:
+            rejeitados = open(options['rejeitados'], 'a' if options['retomar'] else 'w', encoding='utf-8')
+
+        registros = importacao.ler_registros(arquivo, formato, options['delimitador'])
+        registros = itertools.islice(registros, progresso.registros, None)
+
+        # Os processos filhos não usam o banco; não herdam conexões abertas
+        connections.close_all()
+        inicio = time.perf_counter()
+        importados_antes = progresso.importados
+        try:
+            with ProcessPoolExecutor(processos, initializer=importacao.inicializar_processo) as pool:
+                while True:
+                    bloco = list(itertools.islice(registros, options['transacao']))
+                    if not bloco:
+                        break
+                    self._importar_bloco(bloco, progresso, pool, processos, options['lote'], rejeitados)
+                    decorrido = time.perf_counter() - inicio
+                    self.stdout.write(
+                        f'{progresso.registros} registros: {progresso.importados} importados, '
+                        f'{progresso.rejeitados} rejeitados '
+                        f'({(progresso.importados - importados_antes) / decorrido:.0f} clientes/s)'
+                    )
+        finally:
+            if rejeitados:
+                rejeitados.close()
+
+        progresso.concluir()
+        decorrido = time.perf_counter() - inicio
+        novos = progresso.importados - importados_antes
+        self.stdout.write(self.style.SUCCESS(
+            f'{novos} clientes importados em {decorrido:.1f}s com {processos} processo(s) '
+            f'({novos / decorrido if decorrido else 0:.0f}/s); '
+            f'total {progresso.importados} importados, {progresso.rejeitados} rejeitados.'
+        ))
+
+    def _importar_bloco(self, bloco, progresso, pool, processos, lote, rejeitados):
+        validos, erros = self._validar(bloco)
+        validos = self._remover_cpfs_existentes(validos, erros)
+
+        # Lotes de senhas por tarefa: poucas trocas entre processos, carga equilibrada
+        senhas = [dados['senha'] for _, dados in validos]
+        tamanho = max(1, -(-len(senhas) // (processos * 4)))
+        lotes = [senhas[i:i + tamanho] for i in range(0, len(senhas), tamanho)]
+        hashes = itertools.chain.from_iterable(pool.map(importacao.hash_senhas, lotes))
+
+        clientes = []
+        for (_, dados), senha in zip(validos, hashes):
+            cliente = Cliente(
+                nome=dados['nome'],
+                email=dados['email'],
+                telefone=dados['telefone'],
+                cpf=dados['cpf'],
+                observacoes=dados['observacoes'],
+            )
+            cliente.senha = senha
+            clientes.append(cliente)
+
+        with transaction.atomic():
+            Cliente.objects.bulk_create(clientes, batch_size=lote)
+            contadores.ajustar({contadores.CLIENTES_TOTAL: len(clientes)})
+            importacao.invalidar_caches_clientes()
+
+        self._registrar_rejeitados(erros, progresso.rejeitados, rejeitados)
+        progresso.registros = bloco[-1][0]
+        progresso.importados += len(clientes)
+        progresso.rejeitados += len(erros)
+        progresso.salvar()
+
+    def _validar(self, bloco):
+        """Aplica as regras do ClienteForm; CPFs repetidos no bloco são rejeitados."""
+        validos = []
+        erros = []
+        vistos = set()
+        form = FormImportacao()
+        for numero, dados in bloco:
+            if isinstance(dados, RegistroInvalido):
+                erros.append((numero, importacao.erro('__all__', str(dados), 'invalid'), None))
+            elif not form.validar(dados):
+                erros.append((numero, form.errors.get_json_data(), dados))
+            elif form.cleaned_data['cpf'] in vistos:
+                erros.append((numero, importacao.erro('cpf', 'CPF repetido no arquivo.', 'unique'), dados))
+            else:
+                vistos.add(form.cleaned_data['cpf'])
+                validos.append((numero, form.cleaned_data))
+        return validos, erros
+
+    def _remover_cpfs_existentes(self, validos, erros):
+        """Descarta, com poucas consultas, os CPFs que já estão no banco."""
+        cpfs = [dados['cpf'] for _, dados in validos]
+        existentes = set()
+        for i in range(0, len(cpfs), LOTE_CPFS):
+            existentes.update(
+                Cliente.objects.filter(cpf__in=cpfs[i:i + LOTE_CPFS]).values_list('cpf', flat=True)
+            )
+        if not existentes:
+            return validos
+        restantes = []
+        for numero, dados in validos:
+            if dados['cpf'] in existentes:
+                erros.append((numero, importacao.erro('cpf', 'Cliente com este CPF já existe.', 'unique'), dados))
+            else:
+                restantes.append((numero, dados))
+        return restantes
+
+    def _registrar_rejeitados(self, erros, anteriores, rejeitados):
+        for indice, (numero, detalhes, dados) in enumerate(sorted(erros, key=lambda erro: erro[0])):
+            dados = self._sem_senha(dados)
+            if rejeitados:
+                rejeitados.write(json.dumps(
+                    {'registro': numero, 'erros': detalhes, 'dados': dados},
+                    ensure_ascii=False, default=str,
+                ) + '\n')
+            elif anteriores + indice < 20:
+                # Sem arquivo de rejeitados, mostra só os primeiros
+                self.stderr.write(f'Registro {numero} rejeitado: {detalhes}')
+        if rejeitados:
+            rejeitados.flush()
+
+    @staticmethod
+    def _sem_senha(dados):
+        """Os rejeitados são gravados sem as senhas em texto puro."""
+        if dados is None:
+            return None
+        return {chave: valor for chave, valor in dados.items() if chave not in ('senha', 'confirmar_senha')}
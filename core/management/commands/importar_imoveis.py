@@ -0,0 +1,152 @@
+"""
+Importa imóveis em massa de um arquivo CSV ou JSONL.
+
+Cada registro é validado pelo ImovelForm (as mesmas regras do cadastro) e
+os válidos são inseridos com bulk_create, em transações de --transacao
+registros. Após cada transação a posição é gravada em um arquivo de
+progresso; com --retomar a importação continua de onde parou.
+
+Colunas/chaves: titulo, tipo, preco, endereco, descricao.
+
+Uso:
+    python manage.py importar_imoveis imoveis.csv --delimitador ';'
+    python manage.py importar_imoveis imoveis.jsonl --rejeitados erros.jsonl --retomar
+"""
+import itertools
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import catalogo, importacao
+from core.forms import ImovelForm
+from core.importacao import RegistroInvalido
+from core.models import Imovel
+
+
+class FormImportacao(ImovelForm):
+    """
+    ImovelForm reaproveitado entre registros: criar um form por linha copia
+    todos os campos (deepcopy), o que custava mais que a própria validação.
+    """
+
+    def validar(self, dados):
+        """Liga o form a um novo registro e valida; retorna is_valid()."""
+        self.data = dados
+        self.is_bound = True
+        self.instance = Imovel()
+        self._errors = None
+        self._bound_fields_cache = {}
+        return self.is_valid()
+
+
+class Command(BaseCommand):
+    help = 'Importa imóveis de CSV/JSONL com validação do ImovelForm e bulk_create.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo')
+        parser.add_argument('--formato', choices=['csv', 'jsonl'],
+                            help='Padrão: pela extensão do arquivo.')
+        parser.add_argument('--delimitador', default=',', help='Separador do CSV.')
+        parser.add_argument('--lote', type=int, default=None,
+                            help='Linhas por INSERT (padrão: o máximo do banco).')
+        parser.add_argument('--transacao', type=int, default=20_000,
+                            help='Registros por transação (e por ponto de retomada).')
+        parser.add_argument('--retomar', action='store_true',
+                            help='Continua a partir do arquivo de progresso.')
+        parser.add_argument('--progresso', help='Padrão: <arquivo>.progresso')
+        parser.add_argument('--rejeitados', help='Grava os registros rejeitados (JSONL).')
+
+    def handle(self, *args, **options):
+        arquivo = options['arquivo']
+        try:
+            formato = importacao.detectar_formato(arquivo, options['formato'])
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        progresso = importacao.Progresso(options['progresso'] or f'{arquivo}.progresso', arquivo)
+        if options['retomar']:
+            try:
+                if progresso.carregar():
+                    self.stdout.write(f'Retomando após o registro {progresso.registros}.')
+            except ValueError as exc:
+                raise CommandError(exc)
+        elif progresso.caminho.exists():
+            raise CommandError(
+                f'Há uma importação interrompida ({progresso.caminho}). '
+                'Use --retomar ou apague o arquivo de progresso.'
+            )
+
+        rejeitados = None
+        if options['rejeitados']:
+            rejeitados = open(options['rejeitados'], 'a' if options['retomar'] else 'w', encoding='utf-8')
+
+        registros = importacao.ler_registros(arquivo, formato, options['delimitador'])
+        registros = itertools.islice(registros, progresso.registros, None)
+
+        inicio = time.perf_counter()
+        importados_antes = progresso.importados
+        try:
+            while True:
+                bloco = list(itertools.islice(registros, options['transacao']))
+                if not bloco:
+                    break
+                self._importar_bloco(bloco, progresso, options['lote'], rejeitados)
+                decorrido = time.perf_counter() - inicio
+                self.stdout.write(
+                    f'{progresso.registros} registros: {progresso.importados} importados, '
+                    f'{progresso.rejeitados} rejeitados '
+                    f'({(progresso.importados - importados_antes) / decorrido:.0f} imóveis/s)'
+                )
+        finally:
+            if rejeitados:
+                rejeitados.close()
+
+        progresso.concluir()
+        decorrido = time.perf_counter() - inicio
+        novos = progresso.importados - importados_antes
+        self.stdout.write(self.style.SUCCESS(
+            f'{novos} imóveis importados em {decorrido:.1f}s '
+            f'({novos / decorrido if decorrido else 0:.0f}/s); '
+            f'total {progresso.importados} importados, {progresso.rejeitados} rejeitados.'
+        ))
+
+    def _importar_bloco(self, bloco, progresso, lote, rejeitados):
+        """Valida e insere um bloco em uma transação; grava o progresso ao final."""
+        imoveis = []
+        erros = []
+        form = FormImportacao()
+        for numero, dados in bloco:
+            if isinstance(dados, RegistroInvalido):
+                erros.append((numero, importacao.erro('__all__', str(dados), 'invalid'), None))
+                continue
+            if form.validar(dados):
+                imoveis.append(form.save(commit=False))
+            else:
+                erros.append((numero, form.errors.get_json_data(), dados))
+
+        with transaction.atomic():
+            Imovel.objects.bulk_create(imoveis, batch_size=lote)
+            importacao.contar_imoveis_inseridos(imoveis)
+            catalogo.registrar_alteracao()
+            importacao.invalidar_caches_imoveis()
+
+        self._registrar_rejeitados(erros, progresso.rejeitados, rejeitados)
+        progresso.registros = bloco[-1][0]
+        progresso.importados += len(imoveis)
+        progresso.rejeitados += len(erros)
+        progresso.salvar()
+
+    def _registrar_rejeitados(self, erros, anteriores, rejeitados):
+        for indice, (numero, detalhes, dados) in enumerate(erros):
+            if rejeitados:
+                rejeitados.write(json.dumps(
+                    {'registro': numero, 'erros': detalhes, 'dados': dados},
+                    ensure_ascii=False, default=str,
+                ) + '\n')
+            elif anteriores + indice < 20:
+                # Sem arquivo de rejeitados, mostra só os primeiros
+                self.stderr.write(f'Registro {numero} rejeitado: {detalhes}')
+        if rejeitados:
+            rejeitados.flush()
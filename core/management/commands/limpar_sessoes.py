@@ -0,0 +1,29 @@
+"""
+Apaga as sessões expiradas em lotes (o mesmo que `clearsessions`, com
+controle do tamanho do lote e de uma pausa entre eles).
+
+Uso:
+    python manage.py limpar_sessoes --lote 5000 --pausa 0.05
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import sessoes
+
+
+class Command(BaseCommand):
+    help = 'Apaga as sessões expiradas em lotes, sem bloquear o banco por muito tempo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=sessoes.LOTE_LIMPEZA,
+                            help='Sessões apagadas por DELETE.')
+        parser.add_argument('--pausa', type=float, default=0.0,
+                            help='Segundos entre os lotes.')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        total = sessoes.limpar_expiradas(max(1, options['lote']), options['pausa'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} sessões expiradas apagadas em {time.perf_counter() - inicio:.2f}s.'
+        ))
@@ -0,0 +1,23 @@
+"""
+Recalcula os contadores desnormalizados e corrige divergências.
+
+Uso:
+    python manage.py reconciliar_contadores
+"""
+from django.core.management.base import BaseCommand
+
+from core import contadores
+
+
+class Command(BaseCommand):
+    help = 'Compara os contadores com as tabelas e corrige os que divergirem.'
+
+    def handle(self, *args, **options):
+        corrigidos = contadores.reconciliar()
+        if not corrigidos:
+            self.stdout.write(self.style.SUCCESS('Contadores em dia.'))
+            return
+        for chave, (anterior, correto) in sorted(corrigidos.items()):
+            anterior = '-' if anterior is None else anterior
+            self.stdout.write(f'{chave}: {anterior} -> {correto}')
+        self.stdout.write(self.style.WARNING(f'{len(corrigidos)} contador(es) corrigido(s).'))
@@ -0,0 +1,20 @@
+"""
+Reconstrói o índice de busca textual (FTS5) de imóveis.
+
+Uso:
+    python manage.py reindexar_busca
+"""
+from django.core.management.base import BaseCommand
+
+from core import busca
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice FTS5 de imóveis a partir da tabela core_imovel.'
+
+    def handle(self, *args, **options):
+        if not busca.disponivel():
+            self.stdout.write(self.style.WARNING('Banco sem suporte a FTS5; nada a fazer.'))
+            return
+        busca.reconstruir_indice()
+        self.stdout.write(self.style.SUCCESS('Índice de busca reconstruído.'))
@@ -0,0 +1,41 @@
+"""
+Verifica os planos de execução das consultas quentes (core.planos).
+
+Falha (código de saída diferente de zero) se alguma consulta fizer
+varredura completa da tabela ou ordenação em B-tree temporária.
+
+Uso:
+    python manage.py verificar_planos [--mostrar-plano]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core import planos
+
+
+class Command(BaseCommand):
+    help = 'Roda EXPLAIN QUERY PLAN nas consultas quentes e falha se alguma não usar índice.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mostrar-plano', action='store_true',
+                            help='Exibe o plano completo de cada consulta.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('A verificação de planos só está disponível para SQLite.')
+
+        falhas = 0
+        for nome, linhas, problemas in planos.verificar():
+            if problemas:
+                falhas += 1
+                self.stdout.write(self.style.ERROR(f'FALHOU  {nome}'))
+                for problema in problemas:
+                    self.stdout.write(f'        {problema}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'OK      {nome}'))
+            if options['mostrar_plano']:
+                for linha in linhas:
+                    self.stdout.write(f'        | {linha}')
+
+        if falhas:
+            raise CommandError(f'{falhas} consulta(s) sem índice adequado.')
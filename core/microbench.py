@@ -0,0 +1,298 @@
+"""
+Micro-benchmarks dos caminhos quentes do ORM e das views, com base de
+referência versionada (core/microbench_base.json).
+
+Cada benchmark mede a mediana do tempo e o número de consultas SQL por
+operação e o pico de memória alocada (tracemalloc) por chamada. Os que
+dependem do tamanho do catálogo rodam com 1k, 100k e 1M imóveis.
+
+A comparação com a base falha quando um caminho passa a fazer mais
+consultas, ou quando tempo ou alocação crescem além do limite. Tempos só
+são comparáveis na mesma máquina: a base deve ser regravada
+(`benchmark_micro --gravar-base`) na máquina que roda a verificação.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config.middleware import ForceHTTPSSelective
+
+from . import estatisticas, facetas, sinteticos, views
+from .backends import ClienteBackend
+from .identidade import clientes as cache_clientes
+from .models import Cliente, Imovel
+
+BASE = Path(__file__).with_name('microbench_base.json')
+
+TAMANHOS = [1_000, 100_000, 1_000_000]
+
+# Diferença de pico abaixo disto é ruído do alocador, não regressão
+FOLGA_KB = 1
+
+CPF = '70000000000'
+SENHA = 'Microbench#2025'
+
+
+class Benchmark:
+    def __init__(self, nome, preparar, por_tamanho=False, operacoes=1):
+        self.nome = nome
+        # preparar(contexto) devolve a função medida
+        self.preparar = preparar
+        self.por_tamanho = por_tamanho
+        # Operações feitas por chamada da função (para caminhos de microssegundos)
+        self.operacoes = operacoes
+
+
+REGISTRO = []
+
+
+def benchmark(nome, por_tamanho=False, operacoes=1):
+    def registrar(preparar):
+        REGISTRO.append(Benchmark(nome, preparar, por_tamanho, operacoes))
+        return preparar
+    return registrar
+
+
+class Contexto:
+    """Objetos compartilhados pelos benchmarks (fábrica de requisições, cliente)."""
+
+    def __init__(self):
+        self.fabrica = RequestFactory(HTTP_HOST='localhost')
+        self.cliente = Cliente.objects.get(cpf=CPF)
+
+
+# --- Listagem pública ---
+
+@benchmark('listagem.consulta', por_tamanho=True)
+def _listagem_consulta(contexto):
+    request = contexto.fabrica.get('/imoveis/')
+
+    def executar():
+        _, paginador = views._paginador_listagem(request)
+        list(paginador.pagina())
+    return executar
+
+
+@benchmark('listagem.consulta_filtrada', por_tamanho=True)
+def _listagem_consulta_filtrada(contexto):
+    request = contexto.fabrica.get(
+        '/imoveis/', {'tipo': 'venda', 'preco_min': '100000', 'ordem': 'menor_preco'}
+    )
+
+    def executar():
+        _, paginador = views._paginador_listagem(request)
+        list(paginador.pagina())
+    return executar
+
+
+@benchmark('listagem.facetas', por_tamanho=True)
+def _listagem_facetas(contexto):
+    return facetas.calcular_matriz
+
+
+@benchmark('listagem.view', por_tamanho=True)
+def _listagem_view(contexto):
+    # Facetas e fragmentos em cache, como em regime: consulta + renderização
+    def executar():
+        views.lista_imoveis(contexto.fabrica.get('/imoveis/'))
+    return executar
+
+
+# --- Dashboard ---
+
+@benchmark('dashboard.estatisticas', por_tamanho=True)
+def _dashboard_estatisticas(contexto):
+    return estatisticas.calcular_estatisticas
+
+
+@benchmark('dashboard.view', por_tamanho=True)
+def _dashboard_view(contexto):
+    def executar():
+        request = contexto.fabrica.get('/dashboard/')
+        request.session = {'cliente_id': contexto.cliente.pk}
+        views.dashboard(request)
+    return executar
+
+
+# --- Autenticação ---
+
+@benchmark('auth.authenticate')
+def _auth_authenticate(contexto):
+    backend = ClienteBackend()
+
+    def executar():
+        backend.authenticate(None, cpf=CPF, password=SENHA)
+    return executar
+
+
+@benchmark('auth.authenticate_cpf_inexistente')
+def _auth_authenticate_inexistente(contexto):
+    backend = ClienteBackend()
+
+    def executar():
+        backend.authenticate(None, cpf='00000000000', password=SENHA)
+    return executar
+
+
+@benchmark('auth.get_user', operacoes=100)
+def _auth_get_user(contexto):
+    backend = ClienteBackend()
+    pk = contexto.cliente.pk
+
+    def executar():
+        for _ in range(100):
+            backend.get_user(pk)
+    return executar
+
+
+@benchmark('auth.get_user_sem_cache', operacoes=100)
+def _auth_get_user_sem_cache(contexto):
+    backend = ClienteBackend()
+    pk = contexto.cliente.pk
+
+    def executar():
+        for _ in range(100):
+            cache_clientes.delete(pk)
+            backend.get_user(pk)
+    return executar
+
+
+# --- Middleware HTTPS seletivo ---
+
+def _middleware(contexto, caminhos, seguro=False):
+    middleware = ForceHTTPSSelective(lambda request: HttpResponse())
+    requests = [contexto.fabrica.get(caminho, secure=seguro) for caminho in caminhos]
+
+    def executar():
+        for request in requests:
+            middleware(request)
+    return executar
+
+
+CAMINHOS_PUBLICOS = ['/', '/imoveis/', '/imoveis/busca/', '/api/imoveis/', '/dashboard/'] * 200
+CAMINHOS_SENSIVEIS = ['/login/', '/cadastroCliente/', '/cadastroImovel/', '/admin/'] * 250
+
+
+@benchmark('middleware.http_publico', operacoes=len(CAMINHOS_PUBLICOS))
+def _middleware_publico(contexto):
+    return _middleware(contexto, CAMINHOS_PUBLICOS)
+
+
+@benchmark('middleware.http_sensivel', operacoes=len(CAMINHOS_SENSIVEIS))
+def _middleware_sensivel(contexto):
+    return _middleware(contexto, CAMINHOS_SENSIVEIS)
+
+
+@benchmark('middleware.https', operacoes=len(CAMINHOS_SENSIVEIS))
+def _middleware_https(contexto):
+    return _middleware(contexto, CAMINHOS_SENSIVEIS, seguro=True)
+
+
+# --- Medição ---
+
+def medir(funcao, operacoes=1, tempo_minimo=0.5, repeticoes=5):
+    """
+    Mediana do tempo (µs) e consultas por operação; pico de alocação (KB)
+    de uma chamada.
+    Repete até `repeticoes` vezes e `tempo_minimo` segundos, o que vier depois.
+    """
+    funcao()  # aquecimento (caches, compilação de templates)
+
+    consultas = []
+
+    def contar(execute, sql, params, many, context):
+        consultas.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(contar):
+        funcao()
+
+    tempos = []
+    fim = time.perf_counter() + tempo_minimo
+    while len(tempos) < repeticoes or time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    # Fora da medição de tempo: o tracemalloc deixa tudo mais lento
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1] - antes
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'tempo_us': round(statistics.median(tempos) / operacoes * 1_000_000, 3),
+        'consultas': len(consultas) / operacoes,
+        'pico_kb': round(pico / 1024, 1),
+        'repeticoes': len(tempos),
+    }
+
+
+def chave(nome, tamanho=None):
+    return f'{nome}@{tamanho}' if tamanho else nome
+
+
+def popular(total, semente=0):
+    """Completa o catálogo até `total` imóveis e cria o cliente dos benchmarks."""
+    faltam = total - Imovel.objects.count()
+    if faltam > 0:
+        sinteticos.popular_imoveis(faltam, semente)
+
+    if not Cliente.objects.filter(cpf=CPF).exists():
+        cliente = Cliente(nome='Cliente Microbench', email='microbench@example.com',
+                          telefone='31999990000', cpf=CPF)
+        cliente.senha = make_password(SENHA)
+        cliente.save()
+
+
+def comparar(resultados, base, limite_tempo, limite_alocacao):
+    """Lista das regressões de `resultados` em relação à `base`."""
+    regressoes = []
+    for nome, atual in resultados.items():
+        anterior = base.get(nome)
+        if anterior is None:
+            continue
+        if atual['consultas'] > anterior['consultas']:
+            regressoes.append(
+                f'{nome}: {atual["consultas"]:g} consultas (base {anterior["consultas"]:g})'
+            )
+        for campo, limite, unidade, folga in (
+            ('tempo_us', limite_tempo, 'µs', 0),
+            ('pico_kb', limite_alocacao, 'KB', FOLGA_KB),
+        ):
+            if (
+                anterior[campo] > 0
+                and atual[campo] > anterior[campo] * (1 + limite)
+                and atual[campo] - anterior[campo] > folga
+            ):
+                regressoes.append(
+                    f'{nome}: {atual[campo]:.1f} {unidade} (base {anterior[campo]:.1f}, '
+                    f'+{(atual[campo] / anterior[campo] - 1) * 100:.0f}%, limite +{limite * 100:.0f}%)'
+                )
+    return regressoes
+
+
+def carregar_base(caminho=BASE):
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return {}
+    return json.loads(caminho.read_text())['resultados']
+
+
+def gravar_base(resultados, caminho=BASE):
+    dados = {
+        'gerado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'resultados': dict(sorted(resultados.items())),
+    }
+    Path(caminho).write_text(json.dumps(dados, indent=2, ensure_ascii=False) + '\n')
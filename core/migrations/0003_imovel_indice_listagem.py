@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_cliente_senha'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['-data_cadastro', '-id'], name='imovel_ativo_data_idx'),
+        ),
+    ]
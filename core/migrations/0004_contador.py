@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+def popular_contadores(apps, schema_editor):
+    """Inicializa os contadores com as contagens atuais."""
+    Cliente = apps.get_model('core', 'Cliente')
+    Contador = apps.get_model('core', 'Contador')
+    Imovel = apps.get_model('core', 'Imovel')
+    valores = {
+        'imoveis_total': Imovel.objects.count(),
+        'imoveis_ativos': Imovel.objects.filter(ativo=True).count(),
+        'clientes_total': Cliente.objects.count(),
+    }
+    for tipo in ('venda', 'aluguel'):
+        valores[f'imoveis_tipo_{tipo}'] = Imovel.objects.filter(tipo=tipo).count()
+    Contador.objects.bulk_create(
+        [Contador(chave=chave, valor=valor) for chave, valor in valores.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_imovel_indice_listagem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contador',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=50, unique=True, verbose_name='Chave')),
+                ('valor', models.BigIntegerField(default=0, verbose_name='Valor')),
+            ],
+            options={
+                'verbose_name': 'Contador',
+                'verbose_name_plural': 'Contadores',
+            },
+        ),
+        migrations.RunPython(popular_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+from django.db import migrations
+
+# Índice FTS5 de conteúdo externo sobre core_imovel, sincronizado por triggers.
+CRIAR_TABELA_FTS = """
+    CREATE VIRTUAL TABLE core_imovel_fts USING fts5(
+        titulo, descricao, endereco,
+        content='core_imovel', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+# O SQLite descarta os triggers quando o Django recria core_imovel (ex.:
+# AddField com default): as migrações que fazem isso chamam recriar_triggers.
+TRIGGERS_FTS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS core_imovel_fts_ai AFTER INSERT ON core_imovel BEGIN
+        INSERT INTO core_imovel_fts(rowid, titulo, descricao, endereco)
+        VALUES (new.id, new.titulo, new.descricao, new.endereco);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_imovel_fts_ad AFTER DELETE ON core_imovel BEGIN
+        INSERT INTO core_imovel_fts(core_imovel_fts, rowid, titulo, descricao, endereco)
+        VALUES ('delete', old.id, old.titulo, old.descricao, old.endereco);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_imovel_fts_au AFTER UPDATE OF titulo, descricao, endereco ON core_imovel BEGIN
+        INSERT INTO core_imovel_fts(core_imovel_fts, rowid, titulo, descricao, endereco)
+        VALUES ('delete', old.id, old.titulo, old.descricao, old.endereco);
+        INSERT INTO core_imovel_fts(rowid, titulo, descricao, endereco)
+        VALUES (new.id, new.titulo, new.descricao, new.endereco);
+    END
+    """,
+]
+
+RECONSTRUIR_FTS = "INSERT INTO core_imovel_fts(core_imovel_fts) VALUES ('rebuild')"
+
+CRIAR_FTS = [CRIAR_TABELA_FTS, *TRIGGERS_FTS, RECONSTRUIR_FTS]
+
+REMOVER_FTS = [
+    'DROP TRIGGER IF EXISTS core_imovel_fts_au',
+    'DROP TRIGGER IF EXISTS core_imovel_fts_ad',
+    'DROP TRIGGER IF EXISTS core_imovel_fts_ai',
+    'DROP TABLE IF EXISTS core_imovel_fts',
+]
+
+
+def criar_indice(apps, schema_editor):
+    """Cria o índice FTS5 (apenas SQLite)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CRIAR_FTS:
+        schema_editor.execute(sql)
+
+
+def recriar_triggers(apps, schema_editor):
+    """Recria os triggers do índice FTS e o reconstrói (apenas SQLite)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in TRIGGERS_FTS:
+        schema_editor.execute(sql)
+    schema_editor.execute(RECONSTRUIR_FTS)
+
+
+def remover_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in REMOVER_FTS:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_contador'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
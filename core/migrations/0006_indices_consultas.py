@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_imovel_busca_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['-data_cadastro', '-id'], name='cliente_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(condition=models.Q(('ativo', False)), fields=['-data_cadastro', '-id'], name='imovel_inativo_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(fields=['-data_cadastro', '-id'], name='imovel_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(fields=['tipo', '-data_cadastro', '-id'], name='imovel_tipo_data_idx'),
+        ),
+    ]
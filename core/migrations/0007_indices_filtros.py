@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['tipo', '-data_cadastro', '-id'], name='imovel_ativo_tipo_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['preco', 'id'], name='imovel_ativo_preco_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imovel',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['tipo', 'preco', 'id'], name='imovel_ativo_tipo_preco_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:02
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# Recriar core_imovel (ADD COLUMN com default) descarta os triggers do FTS
+fts = import_module('core.migrations.0005_imovel_busca_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_indices_filtros'),
+    ]
+
+    operations = [
+        # Na reversão, o RemoveField também recria a tabela
+        migrations.RunPython(migrations.RunPython.noop, fts.recriar_triggers),
+        migrations.AddField(
+            model_name='imovel',
+            name='versao',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Versão'),
+        ),
+        migrations.RunPython(fts.recriar_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:23
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+# Recriar core_imovel (ADD COLUMN com default) descarta os triggers do FTS
+fts = import_module('core.migrations.0005_imovel_busca_fts')
+
+
+def inicializar_atualizacao(apps, schema_editor):
+    """Imóveis existentes: última atualização = cadastro; inicia o catálogo."""
+    Contador = apps.get_model('core', 'Contador')
+    Imovel = apps.get_model('core', 'Imovel')
+    Imovel.objects.update(data_atualizacao=F('data_cadastro'))
+    ultima = Imovel.objects.aggregate(ultima=Max('data_atualizacao'))['ultima']
+    Contador.objects.bulk_create([
+        Contador(chave='catalogo_versao', valor=1),
+        Contador(chave='catalogo_alterado_em', valor=int(ultima.timestamp()) if ultima else 0),
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_imovel_versao'),
+    ]
+
+    operations = [
+        # Na reversão, o RemoveField também recria a tabela
+        migrations.RunPython(migrations.RunPython.noop, fts.recriar_triggers),
+        migrations.AddField(
+            model_name='imovel',
+            name='data_atualizacao',
+            field=models.DateTimeField(auto_now=True, verbose_name='Última Atualização'),
+        ),
+        migrations.RunPython(fts.recriar_triggers, migrations.RunPython.noop),
+        migrations.RunPython(inicializar_atualizacao, migrations.RunPython.noop),
+    ]
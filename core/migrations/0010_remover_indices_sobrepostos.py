@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_imovel_data_atualizacao'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='imovel',
+            name='imovel_ativo_data_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='imovel',
+            name='imovel_inativo_data_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='imovel',
+            name='imovel_ativo_tipo_data_idx',
+        ),
+    ]
@@ -86,6 +86,9 @@ class Cliente(models.Model):
         verbose_name = 'Cliente'
         verbose_name_plural = 'Clientes'
         ordering = ['-data_cadastro']
+        indexes = [
+            models.Index(fields=['-data_cadastro', '-id'], name='cliente_data_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nome} ({self.cpf})"
@@ -113,13 +116,88 @@ class Imovel(models.Model):
     endereco = models.CharField(max_length=300, verbose_name='Endereço')
     descricao = models.TextField(verbose_name='Descrição')
     data_cadastro = models.DateTimeField(auto_now_add=True, verbose_name='Data de Cadastro')
+    data_atualizacao = models.DateTimeField(auto_now=True, verbose_name='Última Atualização')
     ativo = models.BooleanField(default=True, verbose_name='Ativo')
+    versao = models.PositiveIntegerField(default=1, editable=False, verbose_name='Versão')
     
     class Meta:
         verbose_name = 'Imóvel'
         verbose_name_plural = 'Imóveis'
         ordering = ['-data_cadastro']
+        indexes = [
+            # Ordem por data (listagem pública, dashboard e admin, com ou sem
+            # filtro de ativo): o filtro de ativo é aplicado na varredura do
+            # índice, que já sai na ordem pedida.
+            models.Index(fields=['-data_cadastro', '-id'], name='imovel_data_idx'),
+            models.Index(fields=['tipo', '-data_cadastro', '-id'], name='imovel_tipo_data_idx'),
+            # Faixa/ordem de preço e facetas (GROUP BY tipo) da listagem
+            # pública. Índices parciais: o SQLite só os usa para "WHERE ativo"
+            # se a condição for a mesma que o ORM gera para ativo=True.
+            models.Index(
+                fields=['preco', 'id'],
+                condition=models.Q(ativo=True),
+                name='imovel_ativo_preco_idx',
+            ),
+            models.Index(
+                fields=['tipo', 'preco', 'id'],
+                condition=models.Q(ativo=True),
+                name='imovel_ativo_tipo_preco_idx',
+            ),
+        ]
+    
+    def save(self, *args, **kwargs):
+        """
+        Incrementa a versão da linha a cada alteração (chave dos fragmentos
+        em cache). O incremento é feito pelo banco (versao = versao + 1):
+        duas edições concorrentes nunca gravam a mesma versão.
+        """
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        versao = self.__dict__.get('versao')
+        self.versao = models.F('versao') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'versao', 'data_atualizacao'}
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            if versao is None:
+                self.__dict__.pop('versao', None)
+            else:
+                self.versao = versao
+            raise
+    
+    def _save_table(self, *args, **kwargs):
+        atualizado = super()._save_table(*args, **kwargs)
+        # Antes do post_save: a versão gravada pelo banco vira campo adiado,
+        # lido só se alguém acessar instance.versao (nenhuma leitura a cada
+        # gravação, e nunca uma expressão F para os receivers)
+        if isinstance(self.__dict__.get('versao'), models.expressions.Combinable):
+            del self.__dict__['versao']
+        return atualizado
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Guarda o estado carregado para ajustar os contadores em updates
+        instance._estado_contadores = (instance.__dict__.get('tipo'), instance.__dict__.get('ativo'))
+        return instance
     
     def __str__(self):
         return f"{self.titulo} - {self.get_tipo_display()}"
 
+
+class Contador(models.Model):
+    """Contagem desnormalizada mantida pelos sinais de Imovel e Cliente."""
+    
+    chave = models.CharField(max_length=50, unique=True, verbose_name='Chave')
+    valor = models.BigIntegerField(default=0, verbose_name='Valor')
+    
+    class Meta:
+        verbose_name = 'Contador'
+        verbose_name_plural = 'Contadores'
+    
+    def __str__(self):
+        return f"{self.chave} = {self.valor}"
+
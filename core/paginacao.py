@@ -0,0 +1,186 @@
+"""
+Paginação por cursor (keyset) para listagens.
+
+Diferente da paginação por OFFSET, cada página é obtida a partir da chave
+(campo de ordenação, id) do último item exibido, então o custo de uma
+página não cresce com a profundidade da navegação.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class CursorInvalido(ValueError):
+    """Token de cursor malformado ou adulterado."""
+
+
+def codificar_cursor(valor, pk, direcao, campo='data_cadastro'):
+    """Gera o token opaco que identifica uma posição na listagem."""
+    bruto = json.dumps(
+        {
+            'c': campo,
+            'v': valor.isoformat() if hasattr(valor, 'isoformat') else str(valor),
+            'i': pk,
+            'r': direcao,
+        },
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(token, model, campo='data_cadastro'):
+    """
+    Retorna (valor, id, direcao) a partir de um token. O valor é convertido
+    pelo campo do model; tokens gerados para outra ordenação são rejeitados.
+    """
+    try:
+        preenchido = token + '=' * (-len(token) % 4)
+        dados = json.loads(base64.urlsafe_b64decode(preenchido.encode()))
+        if dados['c'] != campo:
+            raise ValueError(campo)
+        valor = model._meta.get_field(campo).to_python(dados['v'])
+        pk = int(dados['i'])
+        direcao = dados['r']
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError,
+            ValidationError) as exc:
+        raise CursorInvalido('Cursor inválido.') from exc
+    if valor is None or direcao not in ('proxima', 'anterior'):
+        raise CursorInvalido('Cursor inválido.')
+    return valor, pk, direcao
+
+
+def _filtrar_chave(queryset, campo, valor, pk, menor):
+    """
+    Itens cuja chave (campo, id) é menor (ou maior) que (valor, pk).
+
+    A comparação de tupla é escrita como campo <= v AND (campo < v OR id < i)
+    para que o termo isolado sirva de limite de busca no índice, sem varrer
+    as páginas anteriores.
+    """
+    op = 'lt' if menor else 'gt'
+    return queryset.filter(
+        Q(**{f'{campo}__{op}e': valor}),
+        Q(**{f'{campo}__{op}': valor}) | Q(**{f'id__{op}': pk}),
+    )
+
+
+def filtrar_apos(queryset, valor, pk, campo='data_cadastro', decrescente=True):
+    """Itens depois de (valor, pk) na ordem da listagem."""
+    return _filtrar_chave(queryset, campo, valor, pk, menor=decrescente)
+
+
+def filtrar_antes(queryset, valor, pk, campo='data_cadastro', decrescente=True):
+    """Itens antes de (valor, pk) na ordem da listagem."""
+    return _filtrar_chave(queryset, campo, valor, pk, menor=not decrescente)
+
+
+def ordenacao(campo='data_cadastro', decrescente=True):
+    """Argumentos de order_by para a ordem da listagem."""
+    sinal = '-' if decrescente else ''
+    return (f'{sinal}{campo}', f'{sinal}id')
+
+
+class PaginaCursor:
+    """Uma página de resultados com os tokens de navegação."""
+
+    def __init__(self, itens, proximo_cursor=None, cursor_anterior=None):
+        self.itens = itens
+        self.proximo_cursor = proximo_cursor
+        self.cursor_anterior = cursor_anterior
+
+    @property
+    def tem_proxima(self):
+        return self.proximo_cursor is not None
+
+    @property
+    def tem_anterior(self):
+        return self.cursor_anterior is not None
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+
+class PaginadorCursor:
+    """
+    Pagina um queryset pela chave (campo, id), por padrão em ordem
+    decrescente de data de cadastro.
+
+    Cada página executa uma única consulta com LIMIT por_pagina + 1,
+    atendida por um índice em (campo, id) — para a listagem pública, os
+    índices parciais WHERE ativo de Imovel.
+    """
+
+    def __init__(self, queryset, por_pagina=20, campo='data_cadastro', decrescente=True):
+        self.queryset = queryset
+        self.por_pagina = por_pagina
+        self.campo = campo
+        self.decrescente = decrescente
+
+    def pagina(self, token=None):
+        """Retorna a página indicada pelo token (ou a primeira, se vazio)."""
+        chave, direcao = self._chave(token)
+        if direcao == 'anterior':
+            pagina = self._montar_anterior(list(self._consulta_anterior(chave)))
+            if pagina is not None:
+                return pagina
+            chave = None
+        return self._montar_seguinte(list(self._consulta_seguinte(chave)), chave)
+
+    async def apagina(self, token=None):
+        """Versão assíncrona de pagina (ORM assíncrono)."""
+        chave, direcao = self._chave(token)
+        if direcao == 'anterior':
+            pagina = self._montar_anterior([item async for item in self._consulta_anterior(chave)])
+            if pagina is not None:
+                return pagina
+            chave = None
+        itens = [item async for item in self._consulta_seguinte(chave)]
+        return self._montar_seguinte(itens, chave)
+
+    def _chave(self, token):
+        if not token:
+            return None, 'proxima'
+        valor, pk, direcao = decodificar_cursor(token, self.queryset.model, self.campo)
+        return (valor, pk), direcao
+
+    def _consulta_seguinte(self, chave):
+        qs = self.queryset
+        if chave is not None:
+            qs = filtrar_apos(qs, *chave, campo=self.campo, decrescente=self.decrescente)
+        return qs.order_by(*ordenacao(self.campo, self.decrescente))[:self.por_pagina + 1]
+
+    def _consulta_anterior(self, chave):
+        qs = filtrar_antes(self.queryset, *chave, campo=self.campo, decrescente=self.decrescente)
+        return qs.order_by(*ordenacao(self.campo, not self.decrescente))[:self.por_pagina + 1]
+
+    def _montar_seguinte(self, itens, chave):
+        tem_mais = len(itens) > self.por_pagina
+        itens = itens[:self.por_pagina]
+        return PaginaCursor(
+            itens,
+            proximo_cursor=self._cursor(itens[-1], 'proxima') if tem_mais else None,
+            cursor_anterior=self._cursor(itens[0], 'anterior') if chave and itens else None,
+        )
+
+    def _montar_anterior(self, itens):
+        """Página anterior, ou None se não houver nada antes do cursor."""
+        tem_mais = len(itens) > self.por_pagina
+        itens = itens[:self.por_pagina]
+        itens.reverse()
+        if not itens:
+            # Nada antes do cursor: o chamador volta para a primeira página.
+            return None
+        return PaginaCursor(
+            itens,
+            proximo_cursor=self._cursor(itens[-1], 'proxima'),
+            cursor_anterior=self._cursor(itens[0], 'anterior') if tem_mais else None,
+        )
+
+    def _cursor(self, item, direcao):
+        return codificar_cursor(getattr(item, self.campo), item.pk, direcao, self.campo)
@@ -0,0 +1,109 @@
+"""
+Consultas quentes do app e verificação dos seus planos de execução.
+
+Cada consulta listada aqui deve ser atendida por um índice: o plano
+(EXPLAIN QUERY PLAN do SQLite) não pode ter varredura completa da tabela
+nem ordenação em B-tree temporária. `manage.py verificar_planos` roda a
+verificação e falha se alguma consulta regredir.
+"""
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.utils import timezone
+
+from . import api, contadores, facetas
+from .models import Cliente, Contador, Imovel
+from .paginacao import filtrar_antes, filtrar_apos
+
+_VARREDURA = re.compile(r'^SCAN (\S+)$')
+
+
+def consultas_quentes():
+    """Lista de (nome, queryset) das consultas que precisam de índice."""
+    agora = timezone.now()
+    return [
+        ('listagem pública - primeira página',
+         Imovel.objects.filter(ativo=True).order_by('-data_cadastro', '-id')[:21]),
+        ('listagem pública - próxima página',
+         filtrar_apos(Imovel.objects.filter(ativo=True), agora, 1)
+         .order_by('-data_cadastro', '-id')[:21]),
+        ('listagem pública - página anterior',
+         filtrar_antes(Imovel.objects.filter(ativo=True), agora, 1)
+         .order_by('data_cadastro', 'id')[:21]),
+        ('listagem pública - filtro por tipo',
+         Imovel.objects.filter(ativo=True, tipo='venda').order_by('-data_cadastro', '-id')[:21]),
+        ('listagem pública - faixa de preço, menor preço',
+         Imovel.objects.filter(ativo=True, preco__gte=1000, preco__lte=500000)
+         .order_by('preco', 'id')[:21]),
+        ('listagem pública - tipo e faixa de preço, maior preço',
+         filtrar_apos(
+             Imovel.objects.filter(ativo=True, tipo='aluguel', preco__gte=1000, preco__lte=5000),
+             Decimal('3000'), 1, campo='preco',
+         ).order_by('-preco', '-id')[:21]),
+        ('listagem pública - facetas (tipo x faixa de preço)',
+         facetas._consulta_matriz()),
+        ('API - catálogo',
+         Imovel.objects.filter(ativo=True).order_by('-data_cadastro', '-id')
+         .values_list(*api.CAMPOS)),
+        # Faixa de preço com ordem por data (API, listagem) fica de fora: o
+        # SQLite busca a faixa pelo índice de preço e ordena só esse trecho
+        ('API - filtro por tipo',
+         Imovel.objects.filter(ativo=True, tipo='venda')
+         .order_by('-data_cadastro', '-id').values_list(*api.CAMPOS)),
+        ('dashboard - imóveis recentes',
+         Imovel.objects.filter(ativo=True).order_by('-data_cadastro')[:5]),
+        ('dashboard - clientes recentes',
+         Cliente.objects.all().order_by('-data_cadastro')[:5]),
+        ('dashboard - contadores',
+         Contador.objects.filter(chave__in=contadores.todas_as_chaves())),
+        ('admin imóveis - ordenação padrão',
+         Imovel.objects.order_by('-data_cadastro', '-pk')[:25]),
+        ('admin imóveis - filtro por tipo',
+         Imovel.objects.filter(tipo='venda').order_by('-data_cadastro', '-pk')[:25]),
+        ('admin imóveis - filtro ativo',
+         Imovel.objects.filter(ativo=True).order_by('-data_cadastro', '-pk')[:25]),
+        ('admin imóveis - filtro inativo',
+         Imovel.objects.filter(ativo=False).order_by('-data_cadastro', '-pk')[:25]),
+        ('admin imóveis - filtro por data',
+         Imovel.objects.filter(
+             data_cadastro__gte=agora - timedelta(days=7), data_cadastro__lt=agora,
+         ).order_by('-data_cadastro', '-pk')[:25]),
+        ('admin imóveis - contagem por tipo',
+         Imovel.objects.filter(tipo='aluguel').values('pk')),
+        ('admin clientes - ordenação padrão',
+         Cliente.objects.order_by('-data_cadastro', '-pk')[:25]),
+        ('admin clientes - filtro por data',
+         Cliente.objects.filter(
+             data_cadastro__gte=agora - timedelta(days=7), data_cadastro__lt=agora,
+         ).order_by('-data_cadastro', '-pk')[:25]),
+    ]
+
+
+def plano(queryset):
+    """Linhas de detalhe do EXPLAIN QUERY PLAN de um queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [linha[-1] for linha in cursor.fetchall()]
+
+
+def problemas(linhas):
+    """Trechos do plano que indicam varredura completa ou ordenação temporária."""
+    encontrados = []
+    for linha in linhas:
+        if _VARREDURA.match(linha):
+            encontrados.append(f'varredura completa: {linha}')
+        elif 'USE TEMP B-TREE' in linha:
+            encontrados.append(f'ordenação temporária: {linha}')
+    return encontrados
+
+
+def verificar():
+    """Retorna [(nome, plano, problemas)] de todas as consultas quentes."""
+    resultado = []
+    for nome, queryset in consultas_quentes():
+        linhas = plano(queryset)
+        resultado.append((nome, linhas, problemas(linhas)))
+    return resultado
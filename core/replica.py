@@ -0,0 +1,213 @@
+"""
+Réplica somente leitura do catálogo para as páginas públicas.
+
+As views marcadas com @usar_replica (home, listagem, busca, API) leem
+Imovel e Contador do alias 'replica'; todo o resto, e qualquer leitura
+depois de uma escrita na mesma requisição, vai ao 'default'. A réplica é
+um arquivo SQLite separado, atualizado por `manage.py atualizar_replica`
+com a API de backup do SQLite: em WAL, os leitores da réplica continuam
+lendo o instantâneo anterior enquanto a cópia é gravada, e uma rajada de
+escritas no banco principal nunca disputa lock com o catálogo público.
+
+As páginas públicas podem ficar atrás do banco principal por até
+REPLICA_INTERVALO segundos. O ETag do catálogo (core.catalogo) também é
+lido da réplica, então ele sempre corresponde ao conteúdo servido.
+Enquanto `atualizar_replica` não tiver feito a primeira cópia (arquivo
+ausente ou sem as tabelas), as leituras continuam no principal.
+"""
+import os
+import sqlite3
+from contextlib import closing
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from . import cache_paginas, catalogo
+from .models import Contador, Imovel
+
+ALIAS = 'replica'
+
+# Models servidos pela réplica; sessões, clientes e auth ficam no principal
+MODELOS = {'core.imovel', 'core.contador'}
+
+# None fora das views públicas; {'escreveu': bool} durante elas
+_requisicao = ContextVar('core_replica', default=None)
+
+# Depois da primeira cópia a réplica sempre tem o esquema: não verifica mais
+_pronta = False
+
+
+def _tem_esquema(caminho):
+    """Indica se o arquivo existe e já recebeu as tabelas do principal."""
+    if not os.path.exists(caminho):
+        return False
+    try:
+        with closing(sqlite3.connect(f'file:{caminho}?mode=ro', uri=True)) as conexao:
+            linha = conexao.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (Imovel._meta.db_table,),
+            ).fetchone()
+    except sqlite3.Error:
+        return False
+    return linha is not None
+
+
+def configurada():
+    return ALIAS in settings.DATABASES
+
+
+def ativa():
+    """Réplica configurada e já copiada ao menos uma vez."""
+    global _pronta
+    if not configurada():
+        return False
+    if not _pronta:
+        _pronta = _tem_esquema(str(settings.DATABASES[ALIAS]['NAME']))
+    return _pronta
+
+
+def usar_replica(view):
+    """Leituras do catálogo feitas pela view vão para a réplica (sync ou async)."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def _aview(request, *args, **kwargs):
+            token = _requisicao.set({'escreveu': False})
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _requisicao.reset(token)
+        return markcoroutinefunction(_aview)
+
+    @wraps(view)
+    def _view(request, *args, **kwargs):
+        token = _requisicao.set({'escreveu': False})
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _requisicao.reset(token)
+    return _view
+
+
+class RoteadorReplica:
+    """DATABASE_ROUTERS: leituras públicas na réplica, escritas no principal."""
+
+    def db_for_read(self, model, **hints):
+        estado = _requisicao.get()
+        if (
+            estado is not None
+            and not estado['escreveu']
+            and model._meta.label_lower in MODELOS
+            and ativa()
+        ):
+            return ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        estado = _requisicao.get()
+        if estado is not None:
+            # Leitura depois de escrita: o resto da requisição usa o principal
+            estado['escreveu'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A réplica é uma cópia do principal, já migrado
+        return db != ALIAS
+
+
+class _CopiaReiniciada(Exception):
+    """A cópia em passos recomeçou vezes demais por causa de escritas no principal."""
+
+
+class Atualizador:
+    """
+    Copia o banco principal para a réplica com a API de backup do SQLite.
+    Mantém uma conexão com o principal para consultar PRAGMA data_version
+    e só copia quando outra conexão gravou algo desde a última cópia.
+
+    Cada cópia lê o arquivo inteiro. Ela é feita em passos de
+    REPLICA_PAGINAS_POR_PASSO páginas com REPLICA_PAUSA_MS entre eles, para
+    não segurar o principal numa leitura longa. Se o principal for alterado
+    no meio, o SQLite recomeça a cópia; depois de MAX_REINICIOS recomeços
+    ela é feita de uma vez.
+    """
+
+    MAX_REINICIOS = 3
+
+    def __init__(self, origem=DEFAULT_DB_ALIAS, destino=ALIAS):
+        self.origem = str(settings.DATABASES[origem]['NAME'])
+        self.destino = str(settings.DATABASES[destino]['NAME'])
+        self.paginas = getattr(settings, 'REPLICA_PAGINAS_POR_PASSO', 4096)
+        self.pausa = getattr(settings, 'REPLICA_PAUSA_MS', 10) / 1000
+        self._conexao = None
+        self._versao_dados = None
+
+    def _origem(self):
+        if self._conexao is None:
+            self._conexao = sqlite3.connect(self.origem, isolation_level=None, check_same_thread=False)
+        return self._conexao
+
+    def atualizar(self, forcar=False):
+        """
+        Copia se o principal mudou (ou se `forcar`). Retorna None quando não
+        houve cópia; senão, se a versão do catálogo mudou com ela.
+        """
+        origem = self._origem()
+        versao_dados = origem.execute('PRAGMA data_version').fetchone()[0]
+        if versao_dados == self._versao_dados and not forcar:
+            return None
+
+        destino = sqlite3.connect(self.destino, isolation_level=None, timeout=30)
+        try:
+            destino.execute('PRAGMA journal_mode=WAL')
+            antes = self._versao_catalogo(destino)
+            self._copiar(origem, destino)
+            depois = self._versao_catalogo(destino)
+        finally:
+            destino.close()
+        self._versao_dados = versao_dados
+
+        if antes != depois:
+            # Páginas renderizadas a partir da réplica antiga: o principal
+            # invalidou o cache no commit, antes de a réplica ter os dados
+            cache_paginas.invalidar()
+        return antes != depois
+
+    def _copiar(self, origem, destino):
+        restantes_antes = None
+        reinicios = 0
+
+        def progresso(status, restantes, total):
+            nonlocal restantes_antes, reinicios
+            # Restando mais páginas que no passo anterior: a cópia recomeçou
+            if restantes_antes is not None and restantes > restantes_antes:
+                reinicios += 1
+                if reinicios > self.MAX_REINICIOS:
+                    raise _CopiaReiniciada
+            restantes_antes = restantes
+
+        try:
+            origem.backup(destino, pages=self.paginas, progress=progresso, sleep=self.pausa)
+        except _CopiaReiniciada:
+            origem.backup(destino)
+
+    @staticmethod
+    def _versao_catalogo(conexao):
+        try:
+            linha = conexao.execute(
+                f'SELECT valor FROM {Contador._meta.db_table} WHERE chave = ?', (catalogo.VERSAO,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Réplica ainda vazia
+            return None
+        return linha[0] if linha else None
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
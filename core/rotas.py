@@ -0,0 +1,51 @@
+"""
+Endereços absolutos das rotas, separados por servidor.
+
+As rotas de `urlpatterns_seguras` (e o admin) apontam direto para o
+servidor HTTPS e as de `urlpatterns_publicas` para o HTTP, de modo que os
+links das páginas nunca passam pelo redirect de ForceHTTPSSelective.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.urls import reverse
+
+
+@lru_cache(maxsize=None)
+def nomes_seguros():
+    """Nomes das rotas servidas pelo HTTPS, lidos de core/urls.py."""
+    from .urls import urlpatterns_seguras
+    return frozenset(padrao.name for padrao in urlpatterns_seguras if padrao.name)
+
+
+def rota_segura(nome):
+    return nome.startswith('admin:') or nome in nomes_seguros()
+
+
+def _host(request):
+    if request is None:
+        return 'localhost'
+    return request.get_host().rsplit(':', 1)[0]
+
+
+def _origem(esquema, host, porta, porta_padrao):
+    return f'{esquema}://{host}' if porta == porta_padrao else f'{esquema}://{host}:{porta}'
+
+
+def origem_https(request=None):
+    """Esquema, host e porta do servidor HTTPS."""
+    host = getattr(settings, 'HOST_SEGURO', '') or _host(request)
+    return _origem('https', host, getattr(settings, 'HTTPS_PORTA', 8443), 443)
+
+
+def origem_http(request=None):
+    """Esquema, host e porta do servidor HTTP público."""
+    host = getattr(settings, 'HOST_PUBLICO', '') or _host(request)
+    return _origem('http', host, getattr(settings, 'HTTP_PORTA', 8080), 80)
+
+
+def url_absoluta(request, nome, *args, **kwargs):
+    """URL absoluta da rota `nome`, no servidor que a atende."""
+    caminho = reverse(nome, args=args, kwargs=kwargs)
+    origem = origem_https(request) if rota_segura(nome) else origem_http(request)
+    return origem + caminho
@@ -0,0 +1,122 @@
+"""
+Verificação de senhas fora do event loop.
+
+O PBKDF2 de check_password custa dezenas de milissegundos de CPU. No login
+assíncrono ele roda em um pool de threads limitado (o hashlib libera o GIL
+durante o PBKDF2), então rajadas de login não travam as outras requisições
+do servidor HTTPS. O pool tem limite de concorrência e de fila, e expõe
+métricas de profundidade da fila.
+
+Quando o CPF não existe, uma verificação contra um hash fictício com o
+mesmo custo é executada, para que os dois caminhos se comportem igual.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+logger = logging.getLogger(__name__)
+
+
+class FilaSenhasCheia(RuntimeError):
+    """A fila de verificações de senha atingiu o limite configurado."""
+
+
+class PoolSenhas:
+    """Pool limitado de verificações de senha com métricas de fila."""
+
+    def __init__(self, max_concorrencia, fila_maxima):
+        self.max_concorrencia = max_concorrencia
+        self.fila_maxima = fila_maxima
+        self._executor = None
+        self._lock = threading.Lock()
+        self._na_fila = 0
+        self._em_execucao = 0
+        self._maior_fila = 0
+        self._total = 0
+        self._rejeitadas = 0
+
+    def _obter_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concorrencia,
+                    thread_name_prefix='senhas',
+                )
+            return self._executor
+
+    def _executar(self, funcao, args):
+        with self._lock:
+            self._na_fila -= 1
+            self._em_execucao += 1
+        try:
+            return funcao(*args)
+        finally:
+            with self._lock:
+                self._em_execucao -= 1
+
+    async def executar(self, funcao, *args):
+        """Executa funcao(*args) no pool sem bloquear o event loop."""
+        executor = self._obter_executor()
+        with self._lock:
+            if self._na_fila >= self.fila_maxima:
+                self._rejeitadas += 1
+                logger.warning('Fila de senhas cheia (%d); verificação rejeitada.', self._na_fila)
+                raise FilaSenhasCheia('Muitas verificações de senha simultâneas.')
+            self._na_fila += 1
+            self._total += 1
+            self._maior_fila = max(self._maior_fila, self._na_fila)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._executar, funcao, args)
+
+    def metricas(self):
+        """Profundidade atual da fila e contadores acumulados."""
+        with self._lock:
+            return {
+                'max_concorrencia': self.max_concorrencia,
+                'fila_maxima': self.fila_maxima,
+                'na_fila': self._na_fila,
+                'em_execucao': self._em_execucao,
+                'maior_fila': self._maior_fila,
+                'total': self._total,
+                'rejeitadas': self._rejeitadas,
+            }
+
+
+pool = PoolSenhas(
+    max_concorrencia=getattr(settings, 'SENHAS_MAX_CONCORRENCIA', 4),
+    fila_maxima=getattr(settings, 'SENHAS_FILA_MAXIMA', 64),
+)
+
+_hash_ficticio = None
+
+
+def hash_ficticio():
+    """Hash com o hasher e o custo atuais, usado quando o CPF não existe."""
+    global _hash_ficticio
+    if _hash_ficticio is None:
+        _hash_ficticio = make_password('senha-ficticia-para-tempo-constante')
+    return _hash_ficticio
+
+
+def verificar_ficticia(raw_password):
+    """Gasta o mesmo tempo de uma verificação real; sempre retorna False."""
+    check_password(raw_password, hash_ficticio())
+    return False
+
+
+async def averificar(raw_password, encoded):
+    """check_password executado no pool de senhas."""
+    return await pool.executar(check_password, raw_password, encoded)
+
+
+async def averificar_ficticia(raw_password):
+    """verificar_ficticia executado no pool de senhas."""
+    return await pool.executar(verificar_ficticia, raw_password)
+
+
+def metricas():
+    return pool.metricas()
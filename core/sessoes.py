@@ -0,0 +1,136 @@
+"""
+Engine de sessões com cache na frente do banco (SESSION_ENGINE).
+
+Três níveis, como em core.identidade: um LRU com TTL curto no processo, o
+cache compartilhado SESSION_CACHE_ALIAS (o mesmo para todos os workers do
+servidor HTTPS) e, por último, a tabela django_session. As leituras param
+no primeiro nível que tiver a sessão; as gravações vão ao banco e aos
+caches, e só acontecem quando os dados mudaram desde a leitura.
+
+Uma sessão apagada por outro processo (logout em outro worker) ainda pode
+ser lida deste LRU por até SESSOES_LRU_TTL segundos.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+from django.utils import timezone
+
+from .identidade import CacheLRU
+
+# Sessões expiradas apagadas por DELETE na limpeza
+LOTE_LIMPEZA = 1000
+
+locais = CacheLRU(
+    tamanho=getattr(settings, 'SESSOES_LRU_TAMANHO', 4096),
+    ttl=getattr(settings, 'SESSOES_LRU_TTL', 5),
+)
+
+
+class SessionStore(cached_db.SessionStore):
+    cache_key_prefix = 'core.sessoes'
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        # Dados como foram lidos; save() compara com eles para evitar escritas
+        self._carregado = None
+
+    def _lembrar(self, dados):
+        self._carregado = dict(dados)
+        if self.session_key:
+            locais.set(self.session_key, self._carregado)
+
+    def _local(self):
+        if not self.session_key:
+            return None
+        dados = locais.get(self.session_key)
+        if dados is None:
+            return None
+        self._carregado = dados
+        # Cópia: alterações desta requisição não vazam para o LRU
+        return dict(dados)
+
+    def _inalterada(self, must_create):
+        return (
+            not must_create
+            and self.session_key is not None
+            and self._carregado is not None
+            and getattr(self, '_session_cache', None) == self._carregado
+        )
+
+    def load(self):
+        dados = self._local()
+        if dados is None:
+            dados = super().load()
+            self._lembrar(dados)
+        return dados
+
+    async def aload(self):
+        dados = self._local()
+        if dados is None:
+            dados = await super().aload()
+            self._lembrar(dados)
+        return dados
+
+    def save(self, must_create=False):
+        if self._inalterada(must_create):
+            return
+        super().save(must_create)
+        self._lembrar(self._session_cache)
+
+    async def asave(self, must_create=False):
+        if self._inalterada(must_create):
+            return
+        await super().asave(must_create)
+        self._lembrar(self._session_cache)
+
+    def delete(self, session_key=None):
+        session_key = session_key or self.session_key
+        if session_key is None:
+            return
+        # Um DELETE só, em vez de get() + delete()
+        self.model.objects.filter(session_key=session_key).delete()
+        self._cache.delete(self.cache_key_prefix + session_key)
+        locais.delete(session_key)
+        self._carregado = None
+
+    async def adelete(self, session_key=None):
+        session_key = session_key or self.session_key
+        if session_key is None:
+            return
+        await self.model.objects.filter(session_key=session_key).adelete()
+        await self._cache.adelete(self.cache_key_prefix + session_key)
+        locais.delete(session_key)
+        self._carregado = None
+
+    @classmethod
+    def clear_expired(cls):
+        """Usado por `manage.py clearsessions`; apaga em lotes."""
+        limpar_expiradas()
+
+    @classmethod
+    async def aclear_expired(cls):
+        await sync_to_async(limpar_expiradas)()
+
+
+def limpar_expiradas(lote=LOTE_LIMPEZA, pausa=0, agora=None):
+    """
+    Apaga as sessões expiradas em lotes de `lote` chaves, com `pausa`
+    segundos entre eles, para não segurar o lock de escrita do SQLite por
+    muito tempo. Retorna quantas foram apagadas.
+    """
+    Session = SessionStore.get_model_class()
+    agora = agora or timezone.now()
+    total = 0
+    while True:
+        chaves = list(
+            Session.objects.filter(expire_date__lt=agora).values_list('session_key', flat=True)[:lote]
+        )
+        if not chaves:
+            return total
+        total += Session.objects.filter(session_key__in=chaves).delete()[0]
+        if len(chaves) < lote:
+            return total
+        if pausa:
+            time.sleep(pausa)
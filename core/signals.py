@@ -0,0 +1,91 @@
+"""
+Receivers de sinais do app core.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache_paginas, catalogo, contadores
+from .estatisticas import invalidar_estatisticas
+from .identidade import invalidar_cliente
+from .models import Cliente, Imovel
+
+
+@receiver(pre_save, sender=Imovel)
+def carregar_estado_imovel(sender, instance, raw=False, **kwargs):
+    """Busca tipo/ativo anteriores quando o objeto não veio do banco completo."""
+    if raw or instance._state.adding:
+        return
+    estado = getattr(instance, '_estado_contadores', (None, None))
+    if None in estado:
+        instance._estado_contadores = (
+            Imovel.objects.filter(pk=instance.pk).values_list('tipo', 'ativo').first()
+            or (None, None)
+        )
+
+
+@receiver(post_save, sender=Imovel)
+def contar_imovel_salvo(sender, instance, created, raw=False, **kwargs):
+    """Ajusta os contadores de imóveis conforme a mudança de tipo/ativo."""
+    if raw:
+        return
+    deltas = Counter(contadores.chaves_imovel(instance.tipo, instance.ativo))
+    if not created:
+        tipo_anterior, ativo_anterior = getattr(instance, '_estado_contadores', (None, None))
+        if tipo_anterior is not None:
+            deltas.subtract(contadores.chaves_imovel(tipo_anterior, ativo_anterior))
+        else:
+            deltas.clear()
+    contadores.ajustar(deltas)
+    instance._estado_contadores = (instance.tipo, instance.ativo)
+
+
+@receiver(post_delete, sender=Imovel)
+def contar_imovel_removido(sender, instance, **kwargs):
+    deltas = Counter(contadores.chaves_imovel(instance.tipo, instance.ativo))
+    contadores.ajustar({chave: -delta for chave, delta in deltas.items()})
+
+
+@receiver(post_save, sender=Cliente)
+def contar_cliente_salvo(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        contadores.ajustar({contadores.CLIENTES_TOTAL: 1})
+
+
+@receiver(post_delete, sender=Cliente)
+def contar_cliente_removido(sender, instance, **kwargs):
+    contadores.ajustar({contadores.CLIENTES_TOTAL: -1})
+
+
+@receiver(post_save, sender=Imovel)
+@receiver(post_delete, sender=Imovel)
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+def invalidar_estatisticas_dashboard(sender, **kwargs):
+    """Invalida as estatísticas do dashboard após a gravação ser confirmada."""
+    transaction.on_commit(invalidar_estatisticas)
+
+
+@receiver(post_save, sender=Imovel)
+@receiver(post_delete, sender=Imovel)
+def nova_versao_catalogo(sender, raw=False, **kwargs):
+    """Versão do catálogo (ETag das páginas públicas), na mesma transação."""
+    if not raw:
+        catalogo.registrar_alteracao()
+
+
+@receiver(post_save, sender=Imovel)
+@receiver(post_delete, sender=Imovel)
+def invalidar_paginas_publicas(sender, **kwargs):
+    """Troca a versão do cache de páginas públicas (e das facetas)."""
+    transaction.on_commit(cache_paginas.invalidar)
+
+
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+def invalidar_identidade_cliente(sender, instance, **kwargs):
+    """Remove o cliente do cache de identidade (agora e após o commit)."""
+    invalidar_cliente(instance.pk)
+    transaction.on_commit(lambda: invalidar_cliente(instance.pk))
@@ -0,0 +1,272 @@
+"""
+Dados sintéticos de imóveis e clientes para desenvolvimento e benchmarks
+(manage.py popular_dados).
+
+Os registros saem de um gerador pseudoaleatório com semente: a partir do
+mesmo banco, a mesma semente gera os mesmos dados. As linhas são gravadas
+com executemany em lotes, sem montar instâncias de model: o bulk_create
+sobrescreveria data_cadastro (auto_now_add), que aqui é espalhada pelos
+últimos `dias` antes de `ate`. O índice de busca é reconstruído uma vez
+ao final da carga de imóveis (busca.indice_suspenso).
+
+Contadores, versão do catálogo e caches são ajustados como numa
+importação (core.importacao), já que os sinais de save não disparam.
+"""
+import functools
+import itertools
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone as tz
+
+from . import busca, catalogo, contadores, importacao
+from .models import Cliente, Imovel
+
+# Fim padrão do intervalo de data_cadastro (fixo para a semente bastar)
+ATE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DIAS = 3 * 365
+
+LOTE = 50_000
+
+# Índices por semente do gerador: os dados não dependem do tamanho do lote
+BLOCO_SEMENTE = 10_000
+
+LOTE_CPFS = 10_000
+
+SENHA = 'Senha#2025'
+
+CIDADES = [
+    ('Belo Horizonte', 'MG', ['Savassi', 'Funcionários', 'Lourdes', 'Pampulha', 'Buritis', 'Sion', 'Centro']),
+    ('São Paulo', 'SP', ['Pinheiros', 'Moema', 'Vila Mariana', 'Tatuapé', 'Perdizes', 'Itaim Bibi', 'Centro']),
+    ('Rio de Janeiro', 'RJ', ['Copacabana', 'Tijuca', 'Botafogo', 'Barra da Tijuca', 'Méier', 'Centro']),
+    ('Curitiba', 'PR', ['Batel', 'Água Verde', 'Bigorrilho', 'Portão', 'Centro']),
+    ('Porto Alegre', 'RS', ['Moinhos de Vento', 'Menino Deus', 'Petrópolis', 'Centro Histórico']),
+    ('Salvador', 'BA', ['Barra', 'Pituba', 'Rio Vermelho', 'Itapuã', 'Centro']),
+    ('Recife', 'PE', ['Boa Viagem', 'Casa Forte', 'Espinheiro', 'Graças', 'Centro']),
+    ('Fortaleza', 'CE', ['Meireles', 'Aldeota', 'Cocó', 'Centro']),
+    ('Goiânia', 'GO', ['Setor Bueno', 'Setor Marista', 'Setor Oeste', 'Centro']),
+    ('Florianópolis', 'SC', ['Centro', 'Trindade', 'Itacorubi', 'Campeche']),
+]
+LOGRADOUROS = ['Rua', 'Avenida', 'Travessa', 'Alameda', 'Praça']
+NOMES_RUA = [
+    'das Flores', 'Sete de Setembro', 'XV de Novembro', 'Tiradentes', 'Santos Dumont',
+    'Getúlio Vargas', 'dos Andradas', 'Amazonas', 'Paraná', 'da Liberdade', 'Rio Branco',
+    'Afonso Pena', 'Brasil', 'Dom Pedro II', 'São João', 'das Palmeiras', 'dos Ipês',
+]
+TIPOS_IMOVEL = [
+    # (nome, quartos, área mínima e máxima em m², peso)
+    ('Apartamento', (1, 4), (35, 180), 45),
+    ('Casa', (2, 5), (70, 400), 25),
+    ('Sobrado', (3, 5), (120, 350), 8),
+    ('Cobertura', (3, 5), (150, 450), 4),
+    ('Kitnet', (1, 1), (20, 40), 8),
+    ('Loft', (1, 2), (40, 90), 4),
+    ('Sala comercial', (0, 0), (25, 200), 6),
+]
+PESOS_TIPOS = list(itertools.accumulate(tipo[3] for tipo in TIPOS_IMOVEL))
+ATRATIVOS = [
+    'varanda gourmet', 'piscina', 'academia', 'portaria 24h', 'área de lazer completa',
+    'armários planejados', 'vista livre', 'próximo ao metrô', 'quintal', 'churrasqueira',
+    'elevador', 'reformado recentemente', 'aceita pets', 'sol da manhã',
+]
+# Preço por m² (R$) na venda e aluguel mensal por m²
+PRECO_M2_VENDA = (4_000, 14_000)
+ALUGUEL_M2 = (20, 70)
+# Fração dos imóveis ativos e dos anunciados para venda
+ATIVOS = 0.85
+VENDA = 0.6
+
+PRENOMES = [
+    'Ana', 'Maria', 'João', 'José', 'Pedro', 'Paulo', 'Lucas', 'Mariana', 'Juliana', 'Fernanda',
+    'Gabriel', 'Rafael', 'Camila', 'Beatriz', 'Larissa', 'Bruno', 'Carlos', 'Felipe', 'Letícia',
+    'Gustavo', 'Amanda', 'Rodrigo', 'Patrícia', 'Thiago', 'Aline', 'Marcos', 'Vanessa', 'Diego',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima',
+    'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes',
+    'Vieira', 'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Mendes',
+]
+DDDS = ['11', '21', '31', '41', '51', '61', '71', '81', '85', '62', '48']
+TIPOS_CLIENTE = ['comprador', 'vendedor', 'ambos']
+
+# Multiplicador da permutação dos CPFs: primo com 10, então i -> base é bijetiva
+_MULTIPLICADOR_CPF = 738_832_927
+
+
+def digitos_cpf(base):
+    """Os dois dígitos verificadores de uma base de 9 dígitos."""
+    digitos = [int(c) for c in base]
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        resto = soma * 10 % 11
+        digitos.append(0 if resto == 10 else resto)
+    return base + f'{digitos[9]}{digitos[10]}'
+
+
+@functools.lru_cache(maxsize=None)
+def _deslocamento_cpf(semente):
+    return random.Random(f'cpf:{semente}').randrange(10**9)
+
+
+def gerar_cpf(indice, semente=0):
+    """
+    CPF válido do `indice`-ésimo cliente da semente. Índices distintos dão
+    CPFs distintos (a base de 9 dígitos é uma permutação do índice).
+    """
+    base = f'{(indice * _MULTIPLICADOR_CPF + _deslocamento_cpf(semente)) % 10**9:09d}'
+    return digitos_cpf(base)
+
+
+def _datas(sorteio, ate, dias):
+    """
+    data_cadastro e data_atualizacao como o Django grava no SQLite (texto,
+    em UTC sem fuso); `ate` já vem sem fuso, de _fim().
+    """
+    cadastro = ate - timedelta(seconds=sorteio.random() * dias * 86_400)
+    atualizacao = cadastro
+    if sorteio.random() < 0.3:
+        # Parte dos anúncios foi editada depois do cadastro
+        atualizacao = min(cadastro + timedelta(seconds=sorteio.random() * 30 * 86_400), ate)
+    return str(cadastro), str(atualizacao)
+
+
+def _fim(ate):
+    """`ate` no fuso em que o banco guarda as datas, sem tzinfo."""
+    if tz.is_aware(ate):
+        return tz.make_naive(ate, connection.timezone or tz.get_default_timezone())
+    return ate
+
+
+def _imovel(indice, sorteio, ate, dias):
+    nome, quartos, area, _ = sorteio.choices(TIPOS_IMOVEL, cum_weights=PESOS_TIPOS)[0]
+    cidade, uf, bairros = sorteio.choice(CIDADES)
+    bairro = sorteio.choice(bairros)
+    area = sorteio.randint(*area)
+    quartos = sorteio.randint(*quartos)
+    tipo = 'venda' if sorteio.random() < VENDA else 'aluguel'
+    if tipo == 'venda':
+        preco = round(area * sorteio.randint(*PRECO_M2_VENDA), -3)
+    else:
+        preco = round(area * sorteio.randint(*ALUGUEL_M2), -1)
+    detalhe = f'{quartos} quarto{"s" if quartos > 1 else ""}' if quartos else f'{area} m²'
+    atrativos = sorteio.sample(ATRATIVOS, 2)
+    cadastro, atualizacao = _datas(sorteio, ate, dias)
+    return (
+        f'{nome} {detalhe} - {bairro}',
+        tipo,
+        preco,
+        f'{sorteio.choice(LOGRADOUROS)} {sorteio.choice(NOMES_RUA)}, {sorteio.randint(1, 3000)}'
+        f' - {bairro}, {cidade}/{uf}',
+        f'{nome} com {area} m², {atrativos[0]} e {atrativos[1]}. '
+        f'{sorteio.randint(0, 3)} vaga(s) de garagem. Código {indice}.',
+        cadastro,
+        atualizacao,
+        sorteio.random() < ATIVOS,
+        1,
+    )
+
+
+def _sorteados(prefixo, semente, inicio, fim):
+    """(índice, gerador) de inicio a fim, com um gerador novo a cada BLOCO_SEMENTE índices."""
+    sorteio = None
+    for indice in range(inicio, fim):
+        if sorteio is None or indice % BLOCO_SEMENTE == 0:
+            sorteio = random.Random(f'{prefixo}:{semente}:{indice}')
+        yield indice, sorteio
+
+
+def _insercao(model, campos):
+    """INSERT parametrizado de uma linha de `model` com os `campos`."""
+    return (
+        f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({", ".join(campos)}) '
+        f'VALUES ({", ".join(["%s"] * len(campos))})'
+    )
+
+
+def popular_imoveis(quantidade, semente=0, ate=ATE, dias=DIAS, lote=LOTE, progresso=None):
+    """
+    Insere `quantidade` imóveis sintéticos, em lotes. A carga inteira é uma
+    transação (busca.indice_suspenso): interrompida, não deixa nada
+    gravado. `progresso(inseridos)` é chamado depois de cada lote.
+    """
+    sql = _insercao(Imovel, ['titulo', 'tipo', 'preco', 'endereco', 'descricao',
+                             'data_cadastro', 'data_atualizacao', 'ativo', 'versao'])
+    ate = _fim(ate)
+    inicio = Imovel.objects.count()
+    sorteados = _sorteados('imoveis', semente, inicio, inicio + quantidade)
+    inseridos = 0
+    with busca.indice_suspenso():
+        while inseridos < quantidade:
+            linhas = [
+                _imovel(indice, sorteio, ate, dias)
+                for indice, sorteio in itertools.islice(sorteados, lote)
+            ]
+            deltas = Counter()
+            for linha in linhas:
+                deltas.update(contadores.chaves_imovel(linha[1], linha[7]))
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.executemany(sql, linhas)
+                contadores.ajustar(deltas)
+                catalogo.registrar_alteracao()
+                importacao.invalidar_caches_imoveis()
+            inseridos += len(linhas)
+            if progresso:
+                progresso(inseridos)
+    return inseridos
+
+
+def _cliente(indice, semente, sorteio, senha, ate, dias):
+    prenome = sorteio.choice(PRENOMES)
+    sobrenomes = sorteio.sample(SOBRENOMES, 2)
+    usuario = f'{prenome}.{sobrenomes[1]}.{indice}'.lower()
+    return (
+        f'{prenome} {sobrenomes[0]} {sobrenomes[1]}',
+        f'{usuario}@exemplo.com.br',
+        f'{sorteio.choice(DDDS)}9{sorteio.randint(10_000_000, 99_999_999)}',
+        gerar_cpf(indice, semente),
+        senha,
+        f'Perfil: {sorteio.choice(TIPOS_CLIENTE)}.' if sorteio.random() < 0.2 else None,
+        _datas(sorteio, ate, dias)[0],
+    )
+
+
+def popular_clientes(quantidade, semente=0, senha=SENHA, ate=ATE, dias=DIAS, lote=LOTE, progresso=None):
+    """
+    Insere `quantidade` clientes sintéticos com CPFs válidos e únicos. Todos
+    recebem `senha`, com o hash calculado uma só vez. CPFs que já existirem
+    no banco são pulados; retorna quantos foram inseridos.
+    """
+    hash_senha = make_password(senha)
+    sql = _insercao(Cliente, ['nome', 'email', 'telefone', 'cpf', 'senha', 'observacoes', 'data_cadastro'])
+    ate = _fim(ate)
+    inicio = Cliente.objects.count()
+    sorteados = _sorteados('clientes', semente, inicio, inicio + quantidade)
+    gerados = inseridos = 0
+    while gerados < quantidade:
+        linhas = [
+            _cliente(indice, semente, sorteio, hash_senha, ate, dias)
+            for indice, sorteio in itertools.islice(sorteados, lote)
+        ]
+        gerados += len(linhas)
+        # CPFs já cadastrados, em consultas de até LOTE_CPFS (limite de variáveis do SQLite)
+        cpfs = [linha[3] for linha in linhas]
+        existentes = set()
+        for i in range(0, len(cpfs), LOTE_CPFS):
+            existentes.update(
+                Cliente.objects.filter(cpf__in=cpfs[i:i + LOTE_CPFS]).values_list('cpf', flat=True)
+            )
+        if existentes:
+            linhas = [linha for linha in linhas if linha[3] not in existentes]
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, linhas)
+            contadores.ajustar({contadores.CLIENTES_TOTAL: len(linhas)})
+            importacao.invalidar_caches_clientes()
+        inseridos += len(linhas)
+        if progresso:
+            progresso(inseridos)
+    return inseridos
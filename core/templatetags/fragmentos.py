@@ -0,0 +1,45 @@
+"""
+Cache de fragmentos por imóvel.
+
+    {% load fragmentos %}
+    {% fragmentos_imoveis imoveis 'core/partials/imovel_card.html' %}
+
+Cada item é renderizado com o template indicado e guardado no cache com a
+chave (template, pk, versao). Todos os fragmentos da lista são lidos com um
+único get_many; só os imóveis novos ou alterados (versão diferente) são
+renderizados de novo.
+"""
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+def chave_fragmento(nome_template, objeto):
+    return f'fragmento:{nome_template}:{objeto.pk}:{objeto.versao}'
+
+
+@register.simple_tag(takes_context=True)
+def fragmentos_imoveis(context, imoveis, nome_template, variavel='imovel'):
+    """Renderiza cada imóvel com o template, reaproveitando fragmentos em cache."""
+    por_chave = {chave_fragmento(nome_template, imovel): imovel for imovel in imoveis}
+    prontos = cache.get_many(list(por_chave))
+
+    fragmento = None
+    novos = {}
+    partes = []
+    for chave, imovel in por_chave.items():
+        html = prontos.get(chave)
+        if html is None:
+            if fragmento is None:
+                fragmento = context.template.engine.get_template(nome_template)
+            with context.push(**{variavel: imovel}):
+                html = fragmento.render(context)
+            novos[chave] = html
+        partes.append(html)
+
+    if novos:
+        cache.set_many(novos, getattr(settings, 'FRAGMENTOS_CACHE_TTL', 3600))
+    return mark_safe(''.join(partes))
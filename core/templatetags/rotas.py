@@ -0,0 +1,16 @@
+"""
+Links absolutos para as rotas, já no servidor certo (HTTP ou HTTPS).
+
+Uso: {% load rotas %} ... <a href="{% rota 'login' %}">
+"""
+from django import template
+
+from core.rotas import url_absoluta
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def rota(context, nome, *args, **kwargs):
+    """URL absoluta da rota: HTTPS para as sensíveis, HTTP para as públicas."""
+    return url_absoluta(context.get('request'), nome, *args, **kwargs)
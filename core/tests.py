@@ -0,0 +1,38 @@
+"""
+Testes do app core.
+"""
+from unittest import mock
+
+from django.test import TestCase
+
+from . import senhas
+from .models import Cliente
+
+
+class LoginFilaSenhasTest(TestCase):
+    """Login assíncrono com a fila de verificações de senha cheia."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cliente = Cliente(
+            nome='Maria Teste',
+            email='maria@exemplo.com.br',
+            telefone='11999990000',
+            cpf='52998224725',
+        )
+        cliente.set_password('senha-correta-123')
+        cliente.save()
+
+    def test_fila_cheia_responde_503(self):
+        pool = senhas.pool
+        with mock.patch.object(pool, '_na_fila', pool.fila_maxima):
+            rejeitadas = pool.metricas()['rejeitadas']
+            response = self.client.post(
+                '/login/',
+                {'cpf': '529.982.247-25', 'password': 'senha-correta-123'},
+                secure=True,
+                HTTP_HOST='localhost',
+            )
+            self.assertEqual(pool.metricas()['rejeitadas'], rejeitadas + 1)
+        self.assertEqual(response.status_code, 503)
+        self.assertNotIn('cliente_id', self.client.session)
@@ -1,21 +1,36 @@
 """
 URLs para o app core.
 """
+from django.conf import settings
 from django.urls import path
 from . import views
+from .cache_paginas import cache_publico
+from .catalogo import condicional
+from .replica import usar_replica
 
-# URLs públicas (HTTP:8080)
+# Views assíncronas (ORM assíncrono) ou as equivalentes síncronas
+if settings.VIEWS_ASSINCRONAS:
+    home, lista_imoveis, dashboard = views.ahome, views.alista_imoveis, views.adashboard
+else:
+    home, lista_imoveis, dashboard = views.home, views.lista_imoveis, views.dashboard
+
+# URLs públicas (HTTP:8080), com cache de página e GET condicional para visitantes
+# anônimos; o catálogo é lido da réplica quando BANCO_REPLICA está ligado. O
+# cache fica por fora do GET condicional: um hit não consulta a versão do
+# catálogo no banco, usa o ETag guardado com a página.
 urlpatterns_publicas = [
-    path('', views.home, name='home'),
-    path('imoveis/', views.lista_imoveis, name='lista_imoveis'),
-    path('contato/', views.contato, name='contato'),
+    path('', usar_replica(cache_publico(condicional(home))), name='home'),
+    path('imoveis/', usar_replica(cache_publico(condicional(lista_imoveis))), name='lista_imoveis'),
+    path('imoveis/busca/', usar_replica(cache_publico(views.busca_imoveis)), name='busca_imoveis'),
+    path('contato/', cache_publico(views.contato), name='contato'),
+    path('api/imoveis/', usar_replica(views.api_imoveis), name='api_imoveis'),
 ]
 
 # URLs sensíveis (HTTPS:8443)
 urlpatterns_seguras = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', dashboard, name='dashboard'),
     path('cadastroCliente/', views.CadastroClienteView.as_view(), name='cadastro_cliente'),
     path('cadastroImovel/', views.CadastroImovelView.as_view(), name='cadastro_imovel'),
 ]
@@ -1,14 +1,25 @@
 """
 Views para o app core.
 """
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth import aauthenticate, logout
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
 from django.contrib import messages
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import HttpResponseBadRequest, HttpResponseRedirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
 from .models import Imovel, Cliente
-from .forms import ClienteForm, ImovelForm
+from .forms import ClienteForm, ImovelForm, FiltroImoveisForm
+from .paginacao import PaginadorCursor, CursorInvalido
+from .estatisticas import obter_estatisticas, aobter_estatisticas
+from .identidade import obter_cliente, aobter_cliente
+from .senhas import FilaSenhasCheia
+from . import api, busca, exportacao, facetas, gravacao
 
 
 def home(request):
@@ -16,6 +27,13 @@ def home(request):
     return render(request, 'core/home.html')
 
 
+async def ahome(request):
+    """Página inicial pública (versão assíncrona)."""
+    # Carrega a sessão pelo ORM assíncrono; o template só lê o cache dela
+    await request.session.aget('cliente_id')
+    return render(request, 'core/home.html')
+
+
 def dashboard(request):
     """Dashboard do cliente (rota sensível - HTTPS)."""
     if 'cliente_id' not in request.session:
@@ -24,42 +42,147 @@ def dashboard(request):
     
     try:
         cliente_id = request.session.get('cliente_id')
-        cliente = Cliente.objects.get(id=cliente_id)
+        cliente = obter_cliente(cliente_id, request)
     except Cliente.DoesNotExist:
         messages.error(request, 'Cliente não encontrado.')
         request.session.flush()
         return redirect('login')
     
-    # Estatísticas
-    total_imoveis = Imovel.objects.count()
-    imoveis_ativos = Imovel.objects.filter(ativo=True).count()
-    total_clientes = Cliente.objects.count()
-    
-    # Imóveis recentes
-    imoveis_recentes = Imovel.objects.filter(ativo=True).order_by('-data_cadastro')[:5]
+    # Estatísticas (uma consulta agregada, com cache)
+    context = {'cliente': cliente, **obter_estatisticas()}
     
-    # Clientes recentes
-    clientes_recentes = Cliente.objects.all().order_by('-data_cadastro')[:5]
+    return render(request, 'core/dashboard.html', context)
+
+
+async def adashboard(request):
+    """Dashboard do cliente (versão assíncrona, rota sensível - HTTPS)."""
+    cliente_id = await request.session.aget('cliente_id')
+    if cliente_id is None:
+        messages.error(request, 'Você precisa estar logado para acessar o dashboard.')
+        return redirect('login')
     
-    context = {
-        'cliente': cliente,
-        'total_imoveis': total_imoveis,
-        'imoveis_ativos': imoveis_ativos,
-        'total_clientes': total_clientes,
-        'imoveis_recentes': imoveis_recentes,
-        'clientes_recentes': clientes_recentes,
-    }
+    # Consultas em sequência: o ORM assíncrono roda todas na mesma thread
+    try:
+        cliente = await aobter_cliente(cliente_id, request)
+    except Cliente.DoesNotExist:
+        messages.error(request, 'Cliente não encontrado.')
+        await request.session.aflush()
+        return redirect('login')
     
+    context = {'cliente': cliente, **(await aobter_estatisticas())}
     return render(request, 'core/dashboard.html', context)
 
 
+def _por_pagina(request):
+    """Tamanho de página pedido via ?por_pagina=, limitado pelo máximo configurado."""
+    padrao = getattr(settings, 'IMOVEIS_POR_PAGINA', 20)
+    maximo = getattr(settings, 'IMOVEIS_POR_PAGINA_MAX', 100)
+    try:
+        por_pagina = int(request.GET.get('por_pagina', padrao))
+    except ValueError:
+        por_pagina = padrao
+    return max(1, min(por_pagina, maximo))
+
+
+def _url_pagina(request, parametro, valor):
+    """Query string da página indicada, preservando os demais parâmetros."""
+    if valor is None:
+        return None
+    params = request.GET.copy()
+    params[parametro] = valor
+    return '?' + params.urlencode()
+
+
+def _links_facetas(request, dados):
+    """Acrescenta a cada faceta o link que aplica o filtro."""
+    for item in dados['tipos']:
+        params = request.GET.copy()
+        params.pop('cursor', None)
+        params['tipo'] = item['valor']
+        item['url'] = '?' + params.urlencode()
+    for item in dados['faixas']:
+        params = request.GET.copy()
+        params.pop('cursor', None)
+        params['preco_min'] = item['preco_min']
+        if item['preco_max'] is None:
+            params.pop('preco_max', None)
+        else:
+            params['preco_max'] = item['preco_max']
+        item['url'] = '?' + params.urlencode()
+    return dados
+
+
+def _paginador_listagem(request):
+    """Filtros e paginador da listagem pública a partir da query string."""
+    filtro = FiltroImoveisForm(request.GET)
+    campo, decrescente = filtro.ordenacao()
+    paginador = PaginadorCursor(
+        filtro.filtrar(Imovel.objects.filter(ativo=True)),
+        por_pagina=_por_pagina(request),
+        campo=campo,
+        decrescente=decrescente,
+    )
+    return filtro, paginador
+
+
+def _contexto_listagem(request, filtro, pagina, dados_facetas):
+    return {
+        'imoveis': pagina.itens,
+        'pagina': pagina,
+        'filtro': filtro,
+        'facetas': _links_facetas(request, dados_facetas),
+        'url_proxima': _url_pagina(request, 'cursor', pagina.proximo_cursor),
+        'url_anterior': _url_pagina(request, 'cursor', pagina.cursor_anterior),
+    }
+
+
 def lista_imoveis(request):
-    """Listagem pública de imóveis."""
-    imoveis = Imovel.objects.filter(ativo=True).order_by('-data_cadastro')
+    """Listagem pública de imóveis com filtros e paginação por cursor."""
+    filtro, paginador = _paginador_listagem(request)
+    try:
+        pagina = paginador.pagina(request.GET.get('cursor'))
+    except CursorInvalido:
+        pagina = paginador.pagina()
+    dados_facetas = facetas.facetas(filtro.cleaned_data.get('tipo'))
+    context = _contexto_listagem(request, filtro, pagina, dados_facetas)
+    return render(request, 'core/imoveis_list.html', context)
+
+
+async def alista_imoveis(request):
+    """Listagem pública de imóveis (versão assíncrona)."""
+    await request.session.aget('cliente_id')
+    filtro, paginador = _paginador_listagem(request)
+    try:
+        pagina = await paginador.apagina(request.GET.get('cursor'))
+    except CursorInvalido:
+        pagina = await paginador.apagina()
+    dados_facetas = await facetas.afacetas(filtro.cleaned_data.get('tipo'))
+    context = _contexto_listagem(request, filtro, pagina, dados_facetas)
+    return render(request, 'core/imoveis_list.html', context)
+
+
+def busca_imoveis(request):
+    """Busca textual pública de imóveis, ordenada por relevância."""
+    termo = request.GET.get('q', '').strip()
+    por_pagina = _por_pagina(request)
+    try:
+        numero = max(1, int(request.GET.get('pagina', 1)))
+    except ValueError:
+        numero = 1
+    
+    imoveis = []
+    if termo:
+        # Busca um item a mais para saber se existe próxima página
+        imoveis = busca.buscar(termo, limite=por_pagina + 1, deslocamento=(numero - 1) * por_pagina)
+    tem_proxima = len(imoveis) > por_pagina
+    
     context = {
-        'imoveis': imoveis
+        'termo': termo,
+        'imoveis': imoveis[:por_pagina],
+        'url_proxima': _url_pagina(request, 'pagina', numero + 1 if tem_proxima else None),
+        'url_anterior': _url_pagina(request, 'pagina', numero - 1 if numero > 1 else None),
     }
-    return render(request, 'core/imoveis_list.html', context)
+    return render(request, 'core/busca_imoveis.html', context)
 
 
 def contato(request):
@@ -67,7 +190,52 @@ def contato(request):
     return render(request, 'core/contato.html')
 
 
-def login_view(request):
+@require_safe
+def api_imoveis(request):
+    """
+    Catálogo de imóveis ativos em JSON, em streaming.
+
+    Parâmetros: campos (lista separada por vírgulas), tipo, preco_min e
+    preco_max. Responde 304 quando o If-None-Match/If-Modified-Since ainda
+    vale, sem serializar nada.
+    """
+    try:
+        campos = api.campos_pedidos(request.GET.get('campos'))
+    except api.CamposInvalidos as exc:
+        return HttpResponseBadRequest(api.erro_json(str(exc)), content_type='application/json')
+    
+    filtro = FiltroImoveisForm(request.GET)
+    queryset = filtro.filtrar(Imovel.objects.filter(ativo=True))
+    filtros = sorted((k, str(v)) for k, v in filtro.cleaned_data.items() if v not in (None, ''))
+    etag, ultima_ts = api.estado(campos, filtros)
+    
+    response = get_conditional_response(request, etag, ultima_ts)
+    if response is None:
+        # O corpo é lido depois que a view retorna: fixa agora o banco
+        # escolhido pelo roteador (a réplica, se ativa)
+        queryset = queryset.using(queryset.db)
+        response = exportacao.resposta_streaming(
+            request,
+            api.linhas_json(queryset.order_by('-data_cadastro', '-id'), campos),
+            'application/json',
+        )
+    response['ETag'] = etag
+    if ultima_ts is not None:
+        response['Last-Modified'] = http_date(ultima_ts)
+    # Sempre revalidar: o 304 custa uma leitura de contador e nenhum byte de corpo
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def _iniciar_sessao(request, cliente):
+    """Armazena o ID do cliente na sessão."""
+    request.session['cliente_id'] = cliente.id
+    request.session['cliente_nome'] = cliente.nome
+    request.session['cliente_cpf'] = cliente.cpf
+    request.session.set_expiry(86400)  # Sessão expira em 24 horas
+
+
+async def login_view(request):
     """View de login (rota sensível - HTTPS)."""
     if request.method == 'POST':
         cpf = request.POST.get('cpf')
@@ -76,18 +244,20 @@ def login_view(request):
         # Remove formatação do CPF
         cpf_limpo = ''.join(filter(str.isdigit, cpf)) if cpf else ''
         
-        cliente = authenticate(request, cpf=cpf_limpo, password=password)
+        # O hash da senha roda no pool de core.senhas, fora do event loop
+        try:
+            cliente = await aauthenticate(request, cpf=cpf_limpo, password=password)
+        except FilaSenhasCheia:
+            messages.error(request, 'Muitas tentativas de login no momento. Tente novamente em instantes.')
+            return await sync_to_async(render)(request, 'core/login.html', status=503)
         if cliente is not None:
-            # Armazena o ID do cliente na sessão
-            request.session['cliente_id'] = cliente.id
-            request.session['cliente_nome'] = cliente.nome
-            request.session['cliente_cpf'] = cliente.cpf
-            request.session.set_expiry(86400)  # Sessão expira em 24 horas
+            await sync_to_async(_iniciar_sessao)(request, cliente)
             messages.success(request, f'Bem-vindo, {cliente.nome}!')
             return redirect('home')
         else:
             messages.error(request, 'CPF ou senha inválidos.')
-    return render(request, 'core/login.html')
+    # O template lê a sessão (acesso síncrono ao banco)
+    return await sync_to_async(render)(request, 'core/login.html')
 
 
 def logout_view(request):
@@ -101,26 +271,52 @@ def logout_view(request):
     return redirect('home')
 
 
-class CadastroClienteView(CreateView):
+class GravacaoEmGrupoMixin:
+    """
+    CreateView que grava pelo grupo de gravações (core.gravacao). O form é
+    validado e o objeto montado (inclusive o hash de senha) nesta thread;
+    só o INSERT vai para o lote. Se a escritora não responder no prazo, o
+    form volta com status 503, dizendo se o cadastro pode ter sido gravado.
+    """
+    mensagem_sucesso = None
+
+    def form_valid(self, form):
+        self.object = form.save(commit=False)
+        try:
+            gravacao.gravar(self.object.save)
+        except IntegrityError:
+            # Corrida com outro cadastro que passou pela mesma validação
+            form.add_error(None, 'Já existe um registro com estes dados. Verifique e tente novamente.')
+            return self.form_invalid(form)
+        except gravacao.GravacaoIncerta:
+            form.add_error(None, 'Não foi possível confirmar o cadastro agora. Ele pode ter sido '
+                                 'gravado: verifique antes de tentar novamente.')
+            response = self.form_invalid(form)
+            response.status_code = 503
+            return response
+        except gravacao.GravacaoIndisponivel:
+            form.add_error(None, 'Não foi possível concluir o cadastro agora. Tente novamente em instantes.')
+            response = self.form_invalid(form)
+            response.status_code = 503
+            return response
+        if self.mensagem_sucesso:
+            messages.success(self.request, self.mensagem_sucesso)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class CadastroClienteView(GravacaoEmGrupoMixin, CreateView):
     """View para cadastro de cliente (rota sensível - HTTPS)."""
     model = Cliente
     form_class = ClienteForm
     template_name = 'core/cadastro_cliente.html'
     success_url = reverse_lazy('home')
-    
-    def form_valid(self, form):
-        messages.success(self.request, 'Cliente cadastrado com sucesso!')
-        return super().form_valid(form)
+    mensagem_sucesso = 'Cliente cadastrado com sucesso!'
 
 
-class CadastroImovelView(CreateView):
+class CadastroImovelView(GravacaoEmGrupoMixin, CreateView):
     """View para cadastro de imóvel (rota sensível - HTTPS)."""
     model = Imovel
     form_class = ImovelForm
     template_name = 'core/cadastro_imovel.html'
     success_url = reverse_lazy('home')
-    
-    def form_valid(self, form):
-        messages.success(self.request, 'Imóvel cadastrado com sucesso!')
-        return super().form_valid(form)
-
+    mensagem_sucesso = 'Imóvel cadastrado com sucesso!'